@@ -0,0 +1,4 @@
+"""Entry point for ``python -m app``."""
+from app.cli import main
+
+raise SystemExit(main())
@@ -0,0 +1,323 @@
+"""In-process and on-disk caching helpers."""
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def content_hash(*parts: str | bytes) -> str:
+    """
+    Compute a SHA-256 hex digest over one or more text/bytes parts.
+
+    Parts are length-prefixed so ("ab", "c") and ("a", "bc") hash differently.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode('utf-8') if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """Bounded least-recently-used cache with hit/miss counters."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_weight: Optional[int] = None,
+        weigh: Optional[Callable[[Any], int]] = None,
+        name: str = "cache",
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            max_weight: Optional bound on the summed weight of all entries
+            weigh: Function returning the weight of a value (e.g. its size in bytes)
+            name: Name reported in stats
+        """
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_weight = max_weight
+        self._weigh = weigh or (lambda value: 1)
+        self._entries: "OrderedDict[Hashable, tuple[Any, int]]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return cached value (marking it recently used) or ``default``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least-recently-used entries past the bounds."""
+        weight = self._weigh(value)
+        with self._lock:
+            if self.max_weight is not None and weight > self.max_weight:
+                # Never cache a single value larger than the whole budget
+                return
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._weight -= previous[1]
+            self._entries[key] = (value, weight)
+            self._weight += weight
+            while len(self._entries) > self.max_entries or (
+                self.max_weight is not None and self._weight > self.max_weight
+            ):
+                _, (_, evicted_weight) = self._entries.popitem(last=False)
+                self._weight -= evicted_weight
+                self.evictions += 1
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return cached value, computing and storing it with ``factory`` on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = factory()
+            self.set(key, value)
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return a value."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            self._weight -= entry[1]
+            return entry[0]
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self._weight = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'weight': self._weight,
+            'max_weight': self.max_weight,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SQLiteCache:
+    """
+    Persistent text cache stored in a SQLite file.
+    
+    Entries are evicted least-recently-used first once the stored text
+    exceeds ``max_bytes``. The file can be shared by several worker
+    processes on the same host.
+    """
+
+    def __init__(self, path: str, max_bytes: int, name: str = "disk_cache"):
+        """
+        Initialize cache, creating the database file if needed.
+
+        Args:
+            path: Path of the SQLite database file
+            max_bytes: Bound on the summed UTF-8 size of stored values
+            name: Name reported in stats
+        """
+        self.name = name
+        self.path = path
+        self.max_bytes = max_bytes
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        return conn
+
+    def reset_after_fork(self) -> None:
+        """
+        Open a fresh connection in a forked child.
+
+        SQLite connections must not be used across fork; the inherited one is
+        abandoned rather than closed, since closing it could release locks the
+        parent still holds.
+        """
+        self._lock = threading.Lock()
+        self._conn = self._connect()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached text (marking it recently used) or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        """Store text, evicting least-recently-used entries past the size bound."""
+        size = len(value.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, last_used) VALUES (?, ?, ?, ?)",
+                    (key, value, size, time.time())
+                )
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                if total > self.max_bytes:
+                    evicted = 0
+                    for old_key, old_size in self._conn.execute(
+                        "SELECT key, size FROM entries WHERE key != ? ORDER BY last_used", (key,)
+                    ).fetchall():
+                        if total <= self.max_bytes:
+                            break
+                        self._conn.execute("DELETE FROM entries WHERE key = ?", (old_key,))
+                        total -= old_size
+                        evicted += 1
+                    self.evictions += evicted
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self.hits = self.misses = self.evictions = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent async calls that share a key.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it is in flight await the same task instead of starting their
+    own. Results are not kept once the call finishes, so this complements
+    a cache rather than replacing one.
+
+    The shared task is shielded from cancellation of any one caller, so a
+    disconnecting client does not fail the others waiting on it.
+    """
+
+    def __init__(self, name: str = "single_flight"):
+        self.name = name
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.calls = 0
+        self.coalesced = 0
+        self.max_waiters = 0
+        self._waiters: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Return the result of ``factory()``, sharing it with concurrent callers.
+
+        Args:
+            key: Identity of the call; equal keys share one call
+            factory: Starts the call; only invoked when none is in flight
+
+        Returns:
+            The call's result (exceptions are raised to every caller)
+        """
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(factory())
+            self._calls[key] = task
+            self._waiters[key] = 1
+            task.add_done_callback(lambda done: self._finish(key, done))
+        else:
+            self.coalesced += 1
+            self._waiters[key] += 1
+            self.max_waiters = max(self.max_waiters, self._waiters[key])
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller was cancelled
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call and coalescing counters."""
+        requests = self.calls + self.coalesced
+        return {
+            'name': self.name,
+            'in_flight': len(self._calls),
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'max_waiters': self.max_waiters,
+            'coalesce_rate': round(self.coalesced / requests, 4) if requests else 0.0,
+        }
+
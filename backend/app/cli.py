@@ -0,0 +1,42 @@
+"""
+Command-line tools for operating the API.
+
+Usage (from backend/):
+    python -m app importtime [--module app.main] [--top 25] [--modules]
+"""
+import argparse
+from typing import List, Optional
+
+
+def cmd_importtime(args: argparse.Namespace) -> int:
+    """Print where startup import time goes."""
+    from app.utils_importtime import format_report, measure_imports
+
+    try:
+        records = measure_imports(args.module)
+    except ValueError as e:
+        print(str(e))
+        return 1
+    print(format_report(records, args.module, top=args.top, by_package=not args.modules))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app", description="ResumeGenie API tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    importtime = commands.add_parser(
+        "importtime",
+        help="profile module import time (python -X importtime)",
+        description="Import a module in a fresh interpreter and report self import time per package.",
+    )
+    importtime.add_argument("--module", default="app.main", help="module to import (default: app.main)")
+    importtime.add_argument("--top", type=int, default=25, help="rows to show (default: 25)")
+    importtime.add_argument("--modules", action="store_true", help="report individual modules instead of packages")
+    importtime.set_defaults(func=cmd_importtime)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
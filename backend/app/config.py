@@ -34,6 +34,82 @@ class Settings(BaseSettings):
     MONGODB_URI: str = "mongodb://localhost:27017/resumegenie"
     JWT_SECRET: str = "change-me-later"
     
+    # Production server (gunicorn with uvicorn workers, see gunicorn.conf.py)
+    WEB_WORKERS: int = 1  # Worker processes (0 = one per CPU core)
+    WEB_TIMEOUT_SECONDS: int = 120  # Workers unresponsive for longer are restarted
+    WEB_GRACEFUL_TIMEOUT_SECONDS: int = 30  # Time to finish in-flight requests on shutdown
+    WEB_KEEPALIVE_SECONDS: int = 5  # Idle time before a client connection is closed
+    WEB_MAX_REQUESTS: int = 0  # Recycle a worker after this many requests (0 = never)
+    
+    # MongoDB connection (made in the background; startup never waits for it)
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000  # Time a connection attempt or operation waits for a server
+    MONGO_CONNECT_RETRIES: int = 5  # Retries per round of background connection attempts
+    MONGO_CONNECT_BACKOFF_BASE_SECONDS: float = 1.0  # First retry delay cap; doubles each retry
+    MONGO_CONNECT_BACKOFF_MAX_SECONDS: float = 30.0  # Longest delay between connection attempts
+    MONGO_RECONNECT_BASE_SECONDS: float = 5.0  # Pause after a failed round of attempts; doubles per round
+    MONGO_RECONNECT_MAX_SECONDS: float = 300.0  # Longest pause between rounds
+    MONGO_MAX_POOL_SIZE: int = 100  # Connections per server in the driver's pool
+    MONGO_MIN_POOL_SIZE: int = 0  # Connections kept open even when idle
+    MONGO_MAX_IDLE_TIME_MS: int = 300_000  # Idle time before a pooled connection is closed (0 = never)
+    
+    # Gemini HTTP client
+    GEMINI_TIMEOUT_SECONDS: float = 30.0  # Per-request timeout
+    GEMINI_CONNECT_TIMEOUT_SECONDS: float = 10.0  # Connection setup timeout
+    GEMINI_MAX_CONNECTIONS: int = 20  # Concurrent connections in the pool
+    GEMINI_MAX_KEEPALIVE_CONNECTIONS: int = 10  # Idle connections kept open
+    GEMINI_KEEPALIVE_EXPIRY_SECONDS: float = 60.0  # Idle time before a kept-alive connection closes
+    GEMINI_HTTP2: bool = True  # Use HTTP/2 when the h2 package is installed
+    GEMINI_CACHE_BACKEND: str = "memory"  # Response cache: memory, redis or none
+    GEMINI_CACHE_TTL_SECONDS: float = 3600.0  # Lifetime of a cached response
+    GEMINI_CACHE_SIZE: int = 1000  # Responses kept by the memory backend
+    GEMINI_API_KEYS: str = ""  # Extra keys for the routing pool: "key1,key2:2" (optional :weight)
+    GEMINI_MODELS: str = "gemini-pro"  # Models in preference order, later ones are fallbacks (optional :max concurrent per key)
+    GEMINI_ROUTE_MAX_CONCURRENT: int = 8  # Concurrent calls per key and model unless set in GEMINI_MODELS
+    GEMINI_KEY_QUARANTINE_SECONDS: float = 60.0  # Time a key is skipped after a 429 without Retry-After
+    REDIS_URL: str = "redis://localhost:6379/0"  # Redis-compatible server for shared state
+    REDIS_MAX_CONNECTIONS: int = 8  # Connections per worker (commands in flight at once)
+    REDIS_BACKOFF_BASE_SECONDS: float = 1.0  # Redis is skipped this long after a connection failure
+    REDIS_BACKOFF_MAX_SECONDS: float = 30.0  # Cap on the skip window, which doubles per consecutive failure
+
+    # Gemini upstream governor
+    GEMINI_CONCURRENCY_INITIAL: int = 8  # Starting limit on concurrent Gemini calls
+    GEMINI_CONCURRENCY_MIN: int = 1  # Lowest limit after repeated throttling
+    GEMINI_CONCURRENCY_MAX: int = 32  # Highest limit reached while calls succeed
+    GEMINI_MAX_RETRIES: int = 3  # Retries for 429/5xx responses and connection failures
+    GEMINI_BACKOFF_BASE_SECONDS: float = 0.5  # First retry delay cap; doubles each retry
+    GEMINI_BACKOFF_MAX_SECONDS: float = 8.0  # Longest retry delay (longer Retry-After fails the call)
+    GEMINI_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failed calls before failing fast
+    GEMINI_CIRCUIT_RESET_SECONDS: float = 30.0  # Time failing fast before a probe call
+
+    # Rate limiting
+    RATE_LIMIT_REQUESTS: int = 10  # Tokens per client per window (burst size); a suggestion costs 1
+    RATE_LIMIT_WINDOW_SECONDS: int = 60  # Window over which RATE_LIMIT_REQUESTS refill
+    RATE_LIMIT_INTERVIEW_QUESTIONS_PER_TOKEN: int = 4  # Interview questions covered by one rate-limit token
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # Clients tracked at once; least recently seen are dropped beyond this
+    RATE_LIMIT_BACKEND: str = "memory"  # memory (per worker), shared (workers on one host) or redis
+    RATE_LIMIT_SHARED_PATH: str = ""  # Table file for the shared backend (default: /dev/shm or the temp dir)
+    RATE_LIMIT_SHARED_SLOTS: int = 131_072  # Buckets in the shared table (24 bytes each)
+
+    # ATS scoring
+    ATS_JOB_CACHE_SIZE: int = 256  # Job descriptions kept in the keyword index cache
+    ATS_SESSION_CACHE_SIZE: int = 1000  # Incremental scoring sessions kept in memory
+    ATS_SESSION_TTL_SECONDS: int = 1800  # Idle time before a scoring session expires
+    ATS_BATCH_MAX_RESUMES: int = 200  # Resumes accepted by /api/ats/score-batch
+    ATS_BATCH_MAX_FILES: int = 20  # Files accepted by /api/ats/score-batch-file
+    ATS_BATCH_CONCURRENCY: int = 4  # Uploaded files parsed at once within a batch
+
+    # File parsing
+    PARSE_WORKERS: int = 2  # Worker processes for PDF/DOCX parsing (0 = parse in a thread)
+    PARSE_TIMEOUT_SECONDS: float = 15.0  # Per-file parse time limit
+    PARSE_MAX_QUEUE: int = 8  # Uploads allowed to wait for a parser before returning 429
+    PARSE_MAX_PAGES: int = 20  # PDF pages read per upload
+    PARSE_PAGE_TIMEOUT_SECONDS: float = 3.0  # Time budget per PDF page; slower pages are skipped
+    PARSE_MAX_CHARS: int = 100_000  # Characters extracted and cached per upload (callers cut to their own budget)
+    PARSE_CACHE_SIZE: int = 256  # Extracted texts kept in memory
+    PARSE_CACHE_MAX_CHARS: int = 8_000_000  # Total characters kept in memory
+    PARSE_CACHE_PATH: str = ""  # SQLite file for the on-disk tier (empty = memory only)
+    PARSE_CACHE_DISK_MAX_BYTES: int = 256 * 1024 * 1024  # Size bound of the on-disk tier
+    
     model_config = SettingsConfigDict(
         env_file=str(env_file),
         env_file_encoding="utf-8",
@@ -41,6 +117,13 @@ class Settings(BaseSettings):
         extra="ignore",
     )
     
+    @property
+    def web_worker_count(self) -> int:
+        """Number of server worker processes (WEB_WORKERS, or one per CPU core if 0)."""
+        if self.WEB_WORKERS > 0:
+            return self.WEB_WORKERS
+        return len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
@@ -1,59 +1,230 @@
 """MongoDB database connection and helpers."""
-from motor.motor_asyncio import AsyncIOMotorClient
-from motor.motor_asyncio import AsyncIOMotorDatabase
 from app.config import settings
-from typing import Optional
+from app.upstream import backoff_delay
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import asyncio
 import orjson
 import certifi
+import os
+import time
+
+if TYPE_CHECKING:
+    # motor takes ~100ms to import; it is loaded when the first connection is made
+    from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 
 # Module-level cached client
-_client: Optional[AsyncIOMotorClient] = None
-_database: Optional[AsyncIOMotorDatabase] = None
+_client: Optional["AsyncIOMotorClient"] = None
+_database: Optional["AsyncIOMotorDatabase"] = None
 
+# Connection state. While the database is unavailable, requests are answered
+# from this negative cache until _retry_at; then one background attempt
+# (shared by every caller) checks again.
+_available = False
+_connect_task: Optional["asyncio.Task[None]"] = None
+_connect_attempts = 0
+_failed_rounds = 0
+_retry_at = 0.0
+_negative_hits = 0
+_last_error: Optional[str] = None
 
-async def get_db() -> Optional[AsyncIOMotorClient]:
-    """
-    Get MongoDB client instance.
+
+def _forget_client_after_fork() -> None:
+    """Drop an inherited client; its sockets and monitor threads belong to the parent."""
+    global _client, _database, _available, _connect_task
+    _client = None
+    _database = None
+    _available = False
+    _connect_task = None
+
+
+os.register_at_fork(after_in_child=_forget_client_after_fork)
+
+
+def database_configured() -> bool:
+    """Whether MONGODB_URI is set."""
+    return bool(settings.MONGODB_URI and settings.MONGODB_URI.strip())
+
+
+def _redact_uri(message: str) -> str:
+    """Don't expose the connection URI in error messages."""
+    if settings.MONGODB_URI and settings.MONGODB_URI in message:
+        message = message.replace(settings.MONGODB_URI, "[REDACTED]")
+    return message
+
+
+def _create_client() -> "AsyncIOMotorClient":
+    """Create a client (no I/O) with TLS and pool settings."""
+    from motor.motor_asyncio import AsyncIOMotorClient
     
-    Returns cached client if available, otherwise creates a new one.
-    Returns None if MONGODB_URI is not set or invalid.
+    # Create new client with explicit TLS settings to work in minimal containers
+    tls_kwargs = {}
+    # If connecting to MongoDB Atlas or any TLS endpoint, ensure CA bundle is available
+    # Using Debian's default CA bundle path
+    tls_kwargs.update({
+        "tls": True,
+        "tlsAllowInvalidCertificates": False,
+        "tlsCAFile": certifi.where(),
+    })
+    return AsyncIOMotorClient(
+        settings.MONGODB_URI,
+        serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+        minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+        maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS or None,
+        **tls_kwargs,
+    )
+
+
+async def _open_client() -> "AsyncIOMotorClient":
     """
-    global _client
+    Return a verified client, reusing the existing one after an outage.
     
-    # Check if MONGODB_URI is set
-    if not settings.MONGODB_URI or settings.MONGODB_URI == "":
-        return None
-    
-    # Return cached client if available
-    if _client is not None:
-        return _client
+    The driver reconnects an existing client by itself, so only the first
+    connection creates one; later checks just ping.
     
+    Raises:
+        Exception: If the server cannot be reached within MONGO_SERVER_SELECTION_TIMEOUT_MS
+    """
+    client = _client if _client is not None else _create_client()
     try:
-        # Create new client with explicit TLS settings to work in minimal containers
-        tls_kwargs = {}
-        # If connecting to MongoDB Atlas or any TLS endpoint, ensure CA bundle is available
-        # Using Debian's default CA bundle path
-        tls_kwargs.update({
-            "tls": True,
-            "tlsAllowInvalidCertificates": False,
-            "tlsCAFile": certifi.where(),
-        })
-        _client = AsyncIOMotorClient(settings.MONGODB_URI, **tls_kwargs)
         # Test connection
-        await _client.admin.command('ping')
+        await client.admin.command('ping')
+    except BaseException:
+        if client is not _client:
+            client.close()
+        raise
+    return client
+
+
+def _reconnect_delay(failed_rounds: int) -> float:
+    """Seconds before the next round of attempts: doubles per failed round, capped."""
+    delay = settings.MONGO_RECONNECT_BASE_SECONDS * (2 ** (failed_rounds - 1))
+    return min(settings.MONGO_RECONNECT_MAX_SECONDS, delay)
+
+
+async def _connect_with_retries() -> None:
+    """
+    Connect (or re-check a connection) in the background.
+    
+    Retries with jittered exponential backoff up to MONGO_CONNECT_RETRIES
+    times. If every attempt fails, the next round is scheduled after
+    _reconnect_delay, which doubles with each failed round.
+    """
+    global _client, _available, _connect_attempts, _failed_rounds, _retry_at, _last_error
+    retries = max(0, settings.MONGO_CONNECT_RETRIES)
+    for attempt in range(retries + 1):
+        _connect_attempts += 1
+        try:
+            _client = await _open_client()
+            _available = True
+            _failed_rounds = 0
+            _retry_at = 0.0
+            _last_error = None
+            print("Connected to MongoDB successfully")
+            return
+        except Exception as e:
+            _last_error = _redact_uri(str(e)) or e.__class__.__name__
+            print(f"Error connecting to MongoDB (attempt {attempt + 1}/{retries + 1}): {_last_error}")
+        if attempt < retries:
+            await asyncio.sleep(backoff_delay(
+                attempt,
+                settings.MONGO_CONNECT_BACKOFF_BASE_SECONDS,
+                settings.MONGO_CONNECT_BACKOFF_MAX_SECONDS,
+            ))
+    _failed_rounds += 1
+    delay = _reconnect_delay(_failed_rounds)
+    _retry_at = time.monotonic() + delay
+    print(f"Warning: MongoDB unavailable; requests fail fast and the next check is in {delay:.0f}s.")
+
+
+def start_background_connect() -> None:
+    """Start a connection check unless available, not configured, or one is already running."""
+    global _connect_task
+    if _available or not database_configured():
+        return
+    if _connect_task is None or _connect_task.done():
+        _connect_task = asyncio.create_task(_connect_with_retries())
+
+
+def report_db_error(error: BaseException) -> bool:
+    """
+    Mark the database unavailable if an operation failed to reach it.
+    
+    Later requests then fail fast instead of each waiting for the server
+    selection timeout, while one background check waits for recovery.
+    
+    Args:
+        error: Exception raised by a database operation
+    
+    Returns:
+        True if the error was a connection failure
+    """
+    global _available, _last_error
+    from pymongo.errors import ConnectionFailure
+    
+    if not isinstance(error, ConnectionFailure):
+        return False
+    if _available:
+        print(f"Warning: Lost connection to MongoDB: {_redact_uri(str(error))}")
+    _available = False
+    _last_error = _redact_uri(str(error)) or error.__class__.__name__
+    start_background_connect()
+    return True
+
+
+def database_status() -> Dict[str, Any]:
+    """
+    Connection state for health checks.
+    
+    ``state`` is one of disabled (no MONGODB_URI), connected, connecting,
+    or unavailable (waiting ``retry_in_seconds`` before checking again).
+    """
+    if not database_configured():
+        state = "disabled"
+    elif _available:
+        state = "connected"
+    elif _connect_task is not None and not _connect_task.done():
+        state = "connecting"
+    else:
+        state = "unavailable"
+    return {
+        'state': state,
+        'attempts': _connect_attempts,
+        'failed_rounds': _failed_rounds,
+        'retry_in_seconds': round(max(0.0, _retry_at - time.monotonic()), 1) if state == "unavailable" else None,
+        'fast_failures': _negative_hits,
+        'last_error': _last_error,
+    }
+
+
+async def get_db() -> Optional["AsyncIOMotorClient"]:
+    """
+    Get MongoDB client instance without waiting for a connection.
+    
+    The connection is made in the background (see connect_to_mongo), so a
+    slow or unreachable server never blocks a request: while it is not
+    available this returns None at once, and callers should fail fast.
+    Once the scheduled retry time has passed, the first caller starts a
+    single background check that all later callers share.
+    
+    Returns:
+        The connected client, or None if MONGODB_URI is not set or the
+        database is not reachable
+    """
+    global _negative_hits
+    if _available:
         return _client
-    except Exception as e:
-        # Don't expose connection URI in error messages
-        error_msg = str(e)
-        if settings.MONGODB_URI and settings.MONGODB_URI in error_msg:
-            error_msg = error_msg.replace(settings.MONGODB_URI, "[REDACTED]")
-        print(f"Error connecting to MongoDB: {error_msg}")
-        _client = None
+    if not database_configured():
+        return None
+    if time.monotonic() < _retry_at:
+        _negative_hits += 1
         return None
+    start_background_connect()
+    return None
 
 
-async def _get_database() -> Optional[AsyncIOMotorDatabase]:
+async def _get_database() -> Optional["AsyncIOMotorDatabase"]:
     """
     Get database instance from cached client.
     Returns None if client is not available.
@@ -84,7 +255,8 @@ async def get_collection(collection_name: str):
     """
     Get a collection from the database.
     
-    Returns None if database is not available (MONGODB_URI unset).
+    Returns None if database is not available (MONGODB_URI unset, or not
+    connected yet).
     """
     # Get database instance (this also ensures client is initialized)
     database = await _get_database()
@@ -107,30 +279,33 @@ def decode_json(data: bytes | str) -> dict:
 
 
 async def close_db():
-    """Close database connection."""
-    global _client, _database
+    """Stop connecting and close database connection."""
+    global _client, _database, _available, _connect_task
+    if _connect_task is not None and not _connect_task.done():
+        _connect_task.cancel()
+        try:
+            await _connect_task
+        except asyncio.CancelledError:
+            pass
+    _connect_task = None
     if _client:
         _client.close()
         _client = None
         _database = None
+    _available = False
 
 
 # Legacy functions for backward compatibility with lifespan events
 async def connect_to_mongo():
-    """Connect to MongoDB (for lifespan events)."""
-    from app.config import settings
-    
-    client = await get_db()
-    if client is None:
-        if not settings.MONGODB_URI or settings.MONGODB_URI.strip() == "":
-            print("Warning: MONGODB_URI is not set. Database features will be unavailable (endpoints will return 501).")
-            print("  Set MONGODB_URI in your environment variables or backend/.env file.")
-            print("  For local development, start MongoDB with: docker compose up -d")
-        else:
-            print("Warning: Unable to connect to MongoDB. Database features will be unavailable (endpoints will return 503).")
-            print("  Please check that MongoDB is running and MONGODB_URI is correct.")
+    """Start connecting to MongoDB in the background (for lifespan events)."""
+    if not database_configured():
+        print("Warning: MONGODB_URI is not set. Database features will be unavailable (endpoints will return 501).")
+        print("  Set MONGODB_URI in your environment variables or backend/.env file.")
+        print("  For local development, start MongoDB with: docker compose up -d")
         return
-    print("Connected to MongoDB successfully")
+    # Startup does not wait: requests are served while the database connects,
+    # and database routes return 503 until it is ready
+    start_background_connect()
 
 
 async def close_mongo_connection():
@@ -3,28 +3,108 @@
 This module isolates the Gemini API call logic so it can be easily updated
 if the Gemini API or library changes in the future.
 """
+import asyncio
+import copy
 import httpx
+import importlib.util
 import json
 import logging
 import os
-from typing import Optional, Dict, Any, List
+import re
+import time
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, AsyncIterator, Callable, List, NamedTuple, Tuple
 from pathlib import Path
 from app.config import settings
+from app.cache import SingleFlight
+from app.response_cache import response_cache
+from app.upstream import gemini_governor, parse_retry_after
 from app.utils import sanitize_text, MAX_TEXT_LENGTH, MAX_SHORT_TEXT_LENGTH
 
 # Set up logger
 logger = logging.getLogger(__name__)
 
-# Try to import Google Auth for service account support (optional)
+# Google Auth for service account support (optional). Only checked for here;
+# the package is slow to import, so it is loaded when credentials are first needed.
 try:
-    from google.auth import default
-    from google.auth.transport.requests import Request as AuthRequest
-    GOOGLE_AUTH_AVAILABLE = True
+    GOOGLE_AUTH_AVAILABLE = importlib.util.find_spec("google.auth") is not None
 except ImportError:
     GOOGLE_AUTH_AVAILABLE = False
+if not GOOGLE_AUTH_AVAILABLE:
     logger.debug("google-auth not installed. Service account authentication not available.")
 
 
+# Optional HTTP/2 support (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# ============================================================================
+# Shared HTTP Client
+# ============================================================================
+
+# Application-scoped client so Gemini calls reuse pooled keep-alive connections
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def _create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client from settings."""
+    http2 = settings.GEMINI_HTTP2 and HTTP2_AVAILABLE
+    if settings.GEMINI_HTTP2 and not HTTP2_AVAILABLE:
+        logger.debug("h2 not installed. Gemini client falls back to HTTP/1.1.")
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(settings.GEMINI_TIMEOUT_SECONDS, connect=settings.GEMINI_CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=settings.GEMINI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GEMINI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GEMINI_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        http2=http2,
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared HTTP client for Gemini calls.
+    
+    The client is normally opened by the app lifespan; outside of it (scripts,
+    tests) it is created on first use.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _create_http_client()
+    return _http_client
+
+
+def _forget_http_client_after_fork() -> None:
+    """Drop an inherited client; its pooled connections belong to the parent."""
+    global _http_client
+    _http_client = None
+
+
+os.register_at_fork(after_in_child=_forget_http_client_after_fork)
+
+
+async def open_http_client() -> None:
+    """Open the shared HTTP client (for lifespan events)."""
+    get_http_client()
+    logger.info(
+        f"Gemini HTTP client ready (http2={settings.GEMINI_HTTP2 and HTTP2_AVAILABLE}, "
+        f"max_connections={settings.GEMINI_MAX_CONNECTIONS})"
+    )
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections (for lifespan events)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
 def _redact_long_text(text: str, max_length: int = 100) -> str:
     """
     Redact long text for logging purposes.
@@ -43,12 +123,22 @@ def _redact_long_text(text: str, max_length: int = 100) -> str:
     return text[:max_length] + f"... [TRUNCATED {len(text) - max_length} chars]"
 
 
-def _get_auth_token() -> Optional[str]:
+# ============================================================================
+# Service Account Tokens
+# ============================================================================
+
+def service_account_configured() -> bool:
+    """Whether google-auth is installed and GOOGLE_APPLICATION_CREDENTIALS points to a file."""
+    creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    return GOOGLE_AUTH_AVAILABLE and bool(creds_path) and Path(creds_path).exists()
+
+
+def _load_service_account_credentials() -> Optional[Any]:
     """
-    Get authentication token from service account credentials if available.
+    Load service account credentials (blocking; run in a worker thread).
     
     Returns:
-        Access token string or None if not available
+        google.auth credentials, or None if not configured
     """
     if not GOOGLE_AUTH_AVAILABLE:
         return None
@@ -57,74 +147,495 @@ def _get_auth_token() -> Optional[str]:
     creds_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
     if not creds_path:
         return None
+    if not Path(creds_path).exists():
+        logger.warning(f"GOOGLE_APPLICATION_CREDENTIALS path does not exist: {creds_path}")
+        return None
     
-    try:
-        creds_path = Path(creds_path)
-        if not creds_path.exists():
-            logger.warning(f"GOOGLE_APPLICATION_CREDENTIALS path does not exist: {creds_path}")
+    from google.auth import default
+    
+    logger.debug(f"Using service account credentials from: {creds_path}")
+    credentials, project = default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+    return credentials
+
+
+def _refresh_service_account_credentials(credentials: Any) -> None:
+    """Fetch a new access token (blocking network call; run in a worker thread)."""
+    from google.auth.transport.requests import Request as AuthRequest
+    
+    credentials.refresh(AuthRequest())
+
+
+class ServiceAccountTokenProvider:
+    """
+    Cached OAuth access token for service account authentication.
+    
+    Credentials are loaded once and refreshed in a worker thread, since
+    google-auth's refresh is a blocking network call. A background task
+    refreshes the token ``refresh_margin`` seconds before it expires, so
+    requests only read the cached token. Only a request arriving before any
+    token exists waits, on a single refresh shared by all callers.
+    """
+
+    def __init__(
+        self,
+        refresh_margin: float = 300.0,
+        retry_seconds: float = 30.0,
+        load_credentials: Callable[[], Optional[Any]] = _load_service_account_credentials,
+        refresh_credentials: Callable[[Any], None] = _refresh_service_account_credentials,
+    ):
+        """
+        Initialize provider.
+        
+        Args:
+            refresh_margin: Seconds before expiry at which the token is renewed
+            retry_seconds: Delay before retrying a failed background refresh
+            load_credentials: Loads the credentials object (None if not configured)
+            refresh_credentials: Renews the credentials' token in place
+        """
+        self.refresh_margin = refresh_margin
+        self.retry_seconds = retry_seconds
+        self._load_credentials = load_credentials
+        self._refresh_credentials = refresh_credentials
+        self._credentials: Optional[Any] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._background: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def seconds_left(self) -> Optional[float]:
+        """Seconds until the cached token expires (None if there is no token)."""
+        credentials = self._credentials
+        if credentials is None or not getattr(credentials, "token", None):
+            return None
+        expiry = getattr(credentials, "expiry", None)
+        if expiry is None:
+            return float("inf")
+        # google-auth stores expiry as a naive UTC datetime
+        if expiry.tzinfo is None:
+            expiry = expiry.replace(tzinfo=timezone.utc)
+        return (expiry - datetime.now(timezone.utc)).total_seconds()
+
+    def _refresh_blocking(self) -> Optional[str]:
+        if self._credentials is None:
+            self._credentials = self._load_credentials()
+            if self._credentials is None:
+                return None
+        self._refresh_credentials(self._credentials)
+        return self._credentials.token
+
+    async def _refresh(self) -> Optional[str]:
+        try:
+            token = await asyncio.to_thread(self._refresh_blocking)
+        except Exception as e:
+            self.failures += 1
+            self.last_error = e.__class__.__name__
+            logger.warning(f"Failed to get service account token: {str(e)}")
             return None
+        if token:
+            self.refreshes += 1
+        return token
+
+    def _start_refresh(self) -> "asyncio.Task[Optional[str]]":
+        """Start a refresh unless one is already running, and return it."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+        return self._refresh_task
+
+    async def refresh(self) -> Optional[str]:
+        """Refresh now, joining a refresh already in progress."""
+        return await asyncio.shield(self._start_refresh())
+
+    async def get_token(self) -> Optional[str]:
+        """
+        Return a valid access token.
         
-        logger.debug(f"Using service account credentials from: {creds_path}")
-        credentials, project = default(scopes=["https://www.googleapis.com/auth/cloud-platform"])
+        Returns:
+            The cached token, or None if service account auth is unavailable
+        """
+        left = self.seconds_left()
+        if left is not None and left > 0:
+            if left < self.refresh_margin:
+                # Renew without waiting; the current token is still valid
+                self._start_refresh()
+            return self._credentials.token
+        return await self.refresh()
+
+    async def _run(self) -> None:
+        """Keep the token fresh until cancelled."""
+        while True:
+            left = self.seconds_left()
+            if left is None or left <= self.refresh_margin:
+                if await self.refresh() is None:
+                    await asyncio.sleep(self.retry_seconds)
+                continue
+            await asyncio.sleep(min(left - self.refresh_margin, 3600))
+
+    def start(self) -> None:
+        """Start background refreshing (idempotent)."""
+        if self._background is None or self._background.done():
+            self._background = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background refreshing."""
+        for task in (self._background, self._refresh_task):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._background = self._refresh_task = None
+
+    def reset_after_fork(self) -> None:
+        """Forget tasks inherited from the parent's event loop (the cached token stays valid)."""
+        self._background = self._refresh_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        left = self.seconds_left()
+        return {
+            'has_token': left is not None and left > 0,
+            'expires_in_seconds': round(left, 1) if left is not None and left != float("inf") else None,
+            'background_refresh': self._background is not None and not self._background.done(),
+            'refreshes': self.refreshes,
+            'failures': self.failures,
+            'last_error': self.last_error,
+        }
+
+
+token_provider = ServiceAccountTokenProvider()
+os.register_at_fork(after_in_child=token_provider.reset_after_fork)
+
+
+# ============================================================================
+# Key and Model Routing Pool
+# ============================================================================
+
+class PoolKey:
+    """One API key in the routing pool, with its load and quarantine state."""
+
+    def __init__(self, index: int, api_key: Optional[str], weight: float):
+        self.index = index
+        self.api_key = api_key
+        self.weight = weight
+        self.in_flight = 0
+        self.quarantined_until = 0.0
+        self.requests = 0
+        self.throttled = 0
+
+    @property
+    def load(self) -> float:
+        """In-flight calls relative to this key's share of traffic."""
+        return self.in_flight / self.weight
+
+
+class GeminiRoute(NamedTuple):
+    """The key and model chosen for one request attempt."""
+    key: PoolKey
+    model: str
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return self.key.api_key
+
+
+def _parse_weighted_list(value: str, default: float) -> List[Tuple[str, float]]:
+    """Parse ``"name[:number], ..."`` into (name, number) pairs."""
+    items = []
+    for item in value.split(","):
+        name, _, number = item.strip().partition(":")
+        if name.strip():
+            items.append((name.strip(), float(number) if number.strip() else default))
+    return items
+
+
+class GeminiRoutingPool:
+    """
+    Spread Gemini calls across API keys and models.
+    
+    Each attempt picks, for the first model in preference order that has
+    room, the non-quarantined key with the lowest weighted load
+    (in-flight calls / weight). Every key has ``max_concurrent`` slots per
+    model; when all keys are full for the requested model, later models in
+    GEMINI_MODELS are used as fallbacks. A key that returns 429 is
+    quarantined for its Retry-After (or ``quarantine_seconds``) while
+    another key is available; the last available key is never quarantined,
+    so with one key a 429 is left to the governor's retry backoff.
+    """
+
+    def __init__(
+        self,
+        api_keys: List[Tuple[Optional[str], float]],
+        models: List[Tuple[str, int]],
+        quarantine_seconds: float,
+    ):
+        """
+        Initialize pool.
         
-        # Refresh token if needed
-        if not credentials.valid:
-            credentials.refresh(AuthRequest())
+        Args:
+            api_keys: (api_key, weight) pairs; a single (None, 1) entry means
+                service account authentication
+            models: (model, max concurrent calls per key) pairs in preference order
+            quarantine_seconds: Time a throttled key is skipped without a Retry-After
+        """
+        if not models:
+            raise ValueError("At least one Gemini model must be configured")
+        self.keys = [PoolKey(i, api_key, max(weight, 0.01)) for i, (api_key, weight) in enumerate(api_keys)]
+        if not self.keys:
+            self.keys = [PoolKey(0, None, 1.0)]
+        self.models: Dict[str, int] = {model: max(1, int(limit)) for model, limit in models}
+        self.primary_model = models[0][0]
+        self.quarantine_seconds = quarantine_seconds
+        self._in_flight: Dict[Tuple[int, str], int] = {}
+        self.fallbacks = 0
+        self.overflows = 0
+
+    @property
+    def has_api_keys(self) -> bool:
+        return any(key.api_key for key in self.keys)
+
+    @property
+    def secrets(self) -> List[str]:
+        return [key.api_key for key in self.keys if key.api_key]
+
+    def acquire(self, model: Optional[str] = None) -> GeminiRoute:
+        """
+        Choose and reserve a route for one attempt; pair with release().
         
-        return credentials.token
-    except Exception as e:
-        logger.warning(f"Failed to get service account token: {str(e)}")
-        return None
+        Args:
+            model: Preferred model (None for the primary model). Models outside
+                the pool are used as-is without fallback.
+        """
+        now = time.monotonic()
+        available = [key for key in self.keys if key.quarantined_until <= now]
+        if not available:
+            # Not reached while release() keeps one key in rotation; use the
+            # key whose quarantine ends first rather than failing the call
+            available = [min(self.keys, key=lambda key: key.quarantined_until)]
+        
+        preferred = model or self.primary_model
+        candidates = [preferred]
+        if preferred in self.models:
+            candidates += [name for name in self.models if name != preferred]
+        
+        route = None
+        for name in candidates:
+            limit = self.models.get(name, self.models[self.primary_model])
+            open_keys = [key for key in available if self._in_flight.get((key.index, name), 0) < limit]
+            if open_keys:
+                route = GeminiRoute(min(open_keys, key=lambda key: key.load), name)
+                break
+        if route is None:
+            # Everything is full: queue on the least-loaded key for the preferred model
+            self.overflows += 1
+            route = GeminiRoute(min(available, key=lambda key: key.load), preferred)
+        elif route.model != preferred:
+            self.fallbacks += 1
+            logger.info(f"Gemini model {preferred} saturated; falling back to {route.model}")
+        
+        route.key.in_flight += 1
+        route.key.requests += 1
+        slot = (route.key.index, route.model)
+        self._in_flight[slot] = self._in_flight.get(slot, 0) + 1
+        return route
+
+    def release(self, route: GeminiRoute, status_code: Optional[int] = None, retry_after: Optional[float] = None) -> None:
+        """
+        Return a route's slot, quarantining its key if the response was a 429.
+        
+        The key is only quarantined if another key is still in rotation.
+        Otherwise the retry (with the governor's backoff, which honors
+        Retry-After) goes to the same key.
+        """
+        route.key.in_flight -= 1
+        slot = (route.key.index, route.model)
+        self._in_flight[slot] -= 1
+        if status_code == 429:
+            route.key.throttled += 1
+            now = time.monotonic()
+            if not any(key is not route.key and key.quarantined_until <= now for key in self.keys):
+                logger.warning(f"Gemini key #{route.key.index} throttled; no other key available to switch to")
+                return
+            duration = retry_after if retry_after is not None else self.quarantine_seconds
+            route.key.quarantined_until = max(route.key.quarantined_until, now + duration)
+            logger.warning(f"Gemini key #{route.key.index} throttled; quarantined for {duration:.0f}s")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-key and per-model load (keys are identified by position only)."""
+        now = time.monotonic()
+        return {
+            'keys': [
+                {
+                    'key': key.index,
+                    'weight': key.weight,
+                    'in_flight': key.in_flight,
+                    'requests': key.requests,
+                    'throttled': key.throttled,
+                    'quarantined_seconds': round(max(0.0, key.quarantined_until - now), 1),
+                }
+                for key in self.keys
+            ],
+            'models': {
+                name: {
+                    'max_concurrent_per_key': limit,
+                    'in_flight': sum(count for (_, model), count in self._in_flight.items() if model == name),
+                }
+                for name, limit in self.models.items()
+            },
+            'fallbacks': self.fallbacks,
+            'overflows': self.overflows,
+        }
+
+
+def create_routing_pool() -> GeminiRoutingPool:
+    """Create the routing pool from GEMINI_API_KEY, GEMINI_API_KEYS and GEMINI_MODELS."""
+    api_keys: List[Tuple[Optional[str], float]] = []
+    primary = settings.GEMINI_API_KEY.strip() if settings.GEMINI_API_KEY else ""
+    if primary:
+        api_keys.append((primary, 1.0))
+    for api_key, weight in _parse_weighted_list(settings.GEMINI_API_KEYS, 1.0):
+        if api_key not in (existing for existing, _ in api_keys):
+            api_keys.append((api_key, weight))
+    models = [
+        (model, int(limit))
+        for model, limit in _parse_weighted_list(settings.GEMINI_MODELS, settings.GEMINI_ROUTE_MAX_CONCURRENT)
+    ]
+    return GeminiRoutingPool(api_keys, models, settings.GEMINI_KEY_QUARANTINE_SECONDS)
+
+
+gemini_pool = create_routing_pool()
+
+
+def gemini_configured() -> bool:
+    """Whether Gemini calls can authenticate: the pool has API keys or a service account is set up."""
+    return gemini_pool.has_api_keys or service_account_configured()
+
+
+# Use v1beta for compatibility (v1 may not have all models)
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+
+
+async def _get_credentials() -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve Gemini credentials.
+    
+    With API keys configured, the key for each attempt is chosen by the
+    routing pool and only the pool's first key is returned here.
+    
+    Returns:
+        Tuple of (api_key, access_token); exactly one is set
+    
+    Raises:
+        ValueError: If neither an API key nor service account credentials are available
+    """
+    if gemini_pool.has_api_keys:
+        return gemini_pool.secrets[0], None
+    
+    # Try to get service account token if available (advanced)
+    logger.info("GEMINI_API_KEY not configured, attempting service account authentication...")
+    access_token = await token_provider.get_token()
+    if not access_token:
+        raise ValueError(
+            "GEMINI_API_KEY is not configured and service account credentials are not available. "
+            "Please set GEMINI_API_KEY in backend/env.txt or configure GOOGLE_APPLICATION_CREDENTIALS."
+        )
+    return None, access_token
+
+
+def _build_payload(prompt: str, temperature: float, max_tokens: int) -> Dict[str, Any]:
+    """Build a generateContent request body."""
+    return {
+        "contents": [
+            {
+                "parts": [
+                    {
+                        "text": prompt
+                    }
+                ]
+            }
+        ],
+        "generationConfig": {
+            "temperature": temperature,
+            "maxOutputTokens": max_tokens,
+        }
+    }
+
+
+def _build_auth(
+    api_key: Optional[str],
+    access_token: Optional[str],
+) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Return (headers, query params) authenticating a Gemini request."""
+    headers = {
+        "Content-Type": "application/json",
+    }
+    params = {}
+    # Add Bearer token if using service account
+    if access_token:
+        headers["Authorization"] = f"Bearer {access_token}"
+    if api_key:
+        params["key"] = api_key
+    return headers, params
+
+
+def _redact_secrets(text: str, api_key: Optional[str], access_token: Optional[str]) -> str:
+    """Remove API keys (including every pool key), the access token and key query parameters from text."""
+    for secret in {api_key, *gemini_pool.secrets}:
+        if secret:
+            text = text.replace(secret, "[REDACTED]")
+    if access_token:
+        text = text.replace(access_token, "[REDACTED]")
+    return re.sub(r'[?&]key=[^&\s]+', '?key=[REDACTED]', text)
+
+
+def _extract_text(data: Dict[str, Any]) -> Optional[str]:
+    """Extract generated text from a Gemini response (or stream chunk)."""
+    # Response structure: {"candidates": [{"content": {"parts": [{"text": "..."}]}}]}
+    if "candidates" in data and len(data["candidates"]) > 0:
+        candidate = data["candidates"][0]
+        if "content" in candidate and "parts" in candidate["content"]:
+            parts = candidate["content"]["parts"]
+            if len(parts) > 0 and "text" in parts[0]:
+                return parts[0]["text"]
+    return None
 
 
 async def _make_gemini_http_request(
-    url: str,
+    model: Optional[str],
     payload: Dict[str, Any],
     api_key: Optional[str] = None,
     access_token: Optional[str] = None,
-) -> httpx.Response:
+) -> Tuple[httpx.Response, GeminiRoute]:
     """
     Make HTTP request to Gemini API with proper authentication.
     
     This function isolates all HTTP request logic in one place for easier debugging
-    and maintenance.
+    and maintenance. Each attempt (including retries) is routed through the
+    key/model pool, so a retry after a 429 goes to a different key.
     
     Args:
-        url: Gemini API endpoint URL
+        model: Preferred model (None for the pool's primary model)
         payload: Request payload dictionary
-        api_key: API key for authentication (used as query parameter)
+        api_key: API key for authentication; when set, the pool picks the key per attempt
         access_token: OAuth access token (used as Bearer token, advanced)
     
     Returns:
-        httpx.Response object
+        Tuple of (httpx.Response, route the final attempt used)
     
     Raises:
         ValueError: If neither api_key nor access_token is provided
         httpx.HTTPStatusError: If API request fails
         httpx.RequestError: If network request fails
+        app.upstream.UpstreamUnavailableError: If the circuit breaker is open
     """
     # Validate authentication
     if not api_key and not access_token:
         raise ValueError("Either GEMINI_API_KEY or service account credentials must be configured")
     
-    # Prepare headers
-    headers = {
-        "Content-Type": "application/json",
-    }
+    logger.debug(f"Using {'Bearer token (service account)' if access_token else 'API key'} authentication")
     
-    # Add Bearer token if using service account
-    if access_token:
-        headers["Authorization"] = f"Bearer {access_token}"
-        logger.debug("Using Bearer token authentication (service account)")
-    
-    # Prepare query parameters
-    params = {}
-    if api_key:
-        params["key"] = api_key
-        logger.debug("Using API key authentication")
-    
-    # Log request (with redacted payload)
-    redacted_payload = payload.copy()
+    # Log request (with redacted payload; deep copy so the sent prompt is untouched)
+    redacted_payload = copy.deepcopy(payload)
     if "contents" in redacted_payload:
         if isinstance(redacted_payload["contents"], list) and len(redacted_payload["contents"]) > 0:
             if "parts" in redacted_payload["contents"][0]:
@@ -132,57 +643,74 @@ async def _make_gemini_http_request(
                     if "text" in part:
                         part["text"] = _redact_long_text(part["text"], max_length=200)
     
-    logger.info(f"Gemini API request: POST {url}")
     logger.debug(f"Request payload (redacted): {json.dumps(redacted_payload, indent=2)}")
     logger.debug(f"Request params: key={'[REDACTED]' if api_key else 'None'}, access_token={'[REDACTED]' if access_token else 'None'}")
     
-    # Make the HTTP request
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
-            url,
-            headers=headers,
-            json=payload,
-            params=params if params else None,
-        )
-        
-        # Log response (with redacted content)
-        logger.info(f"Gemini API response: {response.status_code} {response.reason_phrase}")
-        
-        if response.status_code >= 400:
-            # Log error response (redacted)
-            try:
-                error_data = response.json()
-                redacted_error = json.dumps(error_data, indent=2)
-                # Redact any potential API key exposure
-                if api_key and api_key in redacted_error:
-                    redacted_error = redacted_error.replace(api_key, "[REDACTED]")
-                logger.error(f"Gemini API error response: {redacted_error}")
-            except:
-                logger.error(f"Gemini API error response (non-JSON): {response.text[:500]}")
-        else:
-            # Log successful response (redacted)
-            try:
-                response_data = response.json()
-                redacted_response = response_data.copy()
-                # Redact long text in response
-                if "candidates" in redacted_response:
-                    for candidate in redacted_response.get("candidates", []):
-                        if "content" in candidate and "parts" in candidate["content"]:
-                            for part in candidate["content"]["parts"]:
-                                if "text" in part:
-                                    part["text"] = _redact_long_text(part["text"], max_length=200)
-                logger.debug(f"Response data (redacted): {json.dumps(redacted_response, indent=2)}")
-            except:
-                logger.debug(f"Response (non-JSON): {_redact_long_text(response.text, max_length=500)}")
-        
+    client = get_http_client()
+    routes: List[GeminiRoute] = []
+    
+    async def send() -> httpx.Response:
+        route = gemini_pool.acquire(model)
+        routes.append(route)
+        headers, params = _build_auth(route.api_key if api_key else None, access_token)
+        url = f"{GEMINI_BASE_URL}/models/{route.model}:generateContent"
+        logger.info(f"Gemini API request: POST {url} (key #{route.key.index})")
+        try:
+            response = await client.post(url, headers=headers, json=payload, params=params if params else None)
+        except BaseException:
+            gemini_pool.release(route)
+            raise
+        gemini_pool.release(route, response.status_code, parse_retry_after(response.headers.get("Retry-After")))
         return response
+    
+    # Make the HTTP request on the shared, pooled client, with adaptive
+    # concurrency, retries and the circuit breaker (see app.upstream)
+    response = await gemini_governor.request(send)
+    api_key = routes[-1].api_key or api_key
+    
+    # Log response (with redacted content)
+    logger.info(f"Gemini API response: {response.status_code} {response.reason_phrase}")
+    
+    if response.status_code >= 400:
+        # Log error response (redacted)
+        try:
+            error_data = response.json()
+            redacted_error = json.dumps(error_data, indent=2)
+            # Redact any potential API key exposure
+            if api_key and api_key in redacted_error:
+                redacted_error = redacted_error.replace(api_key, "[REDACTED]")
+            logger.error(f"Gemini API error response: {redacted_error}")
+        except:
+            logger.error(f"Gemini API error response (non-JSON): {response.text[:500]}")
+    else:
+        # Log successful response (redacted)
+        try:
+            response_data = response.json()
+            redacted_response = response_data.copy()
+            # Redact long text in response
+            if "candidates" in redacted_response:
+                for candidate in redacted_response.get("candidates", []):
+                    if "content" in candidate and "parts" in candidate["content"]:
+                        for part in candidate["content"]["parts"]:
+                            if "text" in part:
+                                part["text"] = _redact_long_text(part["text"], max_length=200)
+            logger.debug(f"Response data (redacted): {json.dumps(redacted_response, indent=2)}")
+        except:
+            logger.debug(f"Response (non-JSON): {_redact_long_text(response.text, max_length=500)}")
+    
+    return response, routes[-1]
+
+
+# Concurrent identical generateContent calls share one upstream request
+gemini_single_flight = SingleFlight(name="gemini")
 
 
 async def call_gemini_api(
     prompt: str,
-    model: str = "gemini-pro",
+    model: Optional[str] = None,
     temperature: float = 0.7,
     max_tokens: int = 2048,
+    use_cache: bool = True,
 ) -> str:
     """
     Call Gemini API using HTTP REST interface.
@@ -191,11 +719,19 @@ async def call_gemini_api(
     1. API Key (GEMINI_API_KEY) - Simple, recommended for most cases
     2. Service Account (GOOGLE_APPLICATION_CREDENTIALS) - Advanced, for Cloud Run/Anthos
     
+    Responses are cached by normalized prompt, model, temperature and
+    max_tokens (see app.response_cache), and concurrent identical requests
+    share a single upstream call.
+    
     Args:
         prompt: The prompt text to send to Gemini
-        model: The Gemini model to use (default: "gemini-pro")
+        model: The Gemini model to use (default: the first of GEMINI_MODELS;
+            other pool models are used as fallbacks when it is saturated)
         temperature: Sampling temperature (0.0 to 1.0)
         max_tokens: Maximum tokens to generate
+        use_cache: Return a cached or in-flight response if one exists. When
+            False, a new response is always generated (and replaces the
+            cached one).
     
     Returns:
         The generated text response from Gemini
@@ -205,54 +741,48 @@ async def call_gemini_api(
         httpx.HTTPStatusError: If API request fails
         Exception: For other errors
     """
-    # Check for API key or service account credentials
-    api_key = settings.GEMINI_API_KEY.strip() if settings.GEMINI_API_KEY else ""
-    access_token = None
-    
-    # Try to get service account token if available (advanced)
-    if not api_key:
-        logger.info("GEMINI_API_KEY not configured, attempting service account authentication...")
-        access_token = _get_auth_token()
-        if not access_token:
-            raise ValueError(
-                "GEMINI_API_KEY is not configured and service account credentials are not available. "
-                "Please set GEMINI_API_KEY in backend/env.txt or configure GOOGLE_APPLICATION_CREDENTIALS."
-            )
-    
     # Sanitize prompt text (limit length to prevent abuse)
     prompt = sanitize_text(prompt, MAX_TEXT_LENGTH * 2)  # Allow longer prompts for AI
     
-    # Construct the Gemini API endpoint
-    # Use v1beta for compatibility (v1 may not have all models)
-    base_url = "https://generativelanguage.googleapis.com"
-    endpoint = f"/v1beta/models/{model}:generateContent"
-    url = f"{base_url}{endpoint}"
+    # Serve identical requests from the response cache
+    model = model or gemini_pool.primary_model
+    cache_key = response_cache.make_key(prompt, model, temperature, max_tokens)
+    if use_cache:
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Gemini response served from cache ({len(cached)} chars)")
+            return cached
+        # Identical requests already in flight share one upstream call
+        return await gemini_single_flight.do(
+            cache_key,
+            lambda: _generate_content(prompt, model, temperature, max_tokens, cache_key),
+        )
     
-    # Prepare request body
-    payload = {
-        "contents": [
-            {
-                "parts": [
-                    {
-                        "text": prompt
-                    }
-                ]
-            }
-        ],
-        "generationConfig": {
-            "temperature": temperature,
-            "maxOutputTokens": max_tokens,
-        }
-    }
+    return await _generate_content(prompt, model, temperature, max_tokens, cache_key)
+
+
+async def _generate_content(
+    prompt: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    cache_key: str,
+) -> str:
+    """Make one generateContent request and cache its text (see call_gemini_api)."""
+    # Check for API key or service account credentials
+    api_key, access_token = await _get_credentials()
+    
+    payload = _build_payload(prompt, temperature, max_tokens)
     
     # Make the HTTP request using isolated helper function
     try:
-        response = await _make_gemini_http_request(
-            url=url,
+        response, route = await _make_gemini_http_request(
+            model=model,
             payload=payload,
-            api_key=api_key if api_key else None,
+            api_key=api_key,
             access_token=access_token,
         )
+        api_key = route.api_key or api_key
         
         response.raise_for_status()
         
@@ -260,20 +790,17 @@ async def call_gemini_api(
         data = response.json()
         
         # Extract text from Gemini response
-        # Response structure: {"candidates": [{"content": {"parts": [{"text": "..."}]}}]}
-        if "candidates" in data and len(data["candidates"]) > 0:
-            candidate = data["candidates"][0]
-            if "content" in candidate and "parts" in candidate["content"]:
-                parts = candidate["content"]["parts"]
-                if len(parts) > 0 and "text" in parts[0]:
-                    result_text = parts[0]["text"]
-                    logger.info(f"Successfully received response from Gemini API ({len(result_text)} chars)")
-                    return result_text
+        result_text = _extract_text(data)
         
         # Fallback: try to extract text from response
-        if "text" in data:
+        if result_text is None and "text" in data:
             result_text = data["text"]
+        
+        if result_text is not None:
             logger.info(f"Successfully received response from Gemini API ({len(result_text)} chars)")
+            # Fallback-model answers are served but not cached under the requested model
+            if route.model == model:
+                await response_cache.set(cache_key, result_text)
             return result_text
         
         # If no text found, return error message
@@ -303,7 +830,6 @@ async def call_gemini_api(
         if access_token and access_token in error_str:
             error_str = error_str.replace(access_token, "[REDACTED]")
         # Redact any potential API key in URLs
-        import re
         error_str = re.sub(r'[?&]key=[^&\s]+', '?key=[REDACTED]', error_str)
         logger.error(f"Gemini API network error: {error_str}")
         raise Exception(f"Network error: Unable to connect to AI service")
@@ -320,12 +846,118 @@ async def call_gemini_api(
         if access_token:
             error_msg = error_msg.replace(access_token, "[REDACTED]")
         # Redact any potential API key in URLs
-        import re
         error_msg = re.sub(r'[?&]key=[^&\s]+', '?key=[REDACTED]', error_msg)
         logger.error(f"Gemini API error: {error_msg}")
         raise Exception(f"Error calling Gemini API: {error_msg}")
 
 
+async def stream_gemini_api(
+    prompt: str,
+    model: Optional[str] = None,
+    temperature: float = 0.7,
+    max_tokens: int = 2048,
+    use_cache: bool = True,
+) -> AsyncIterator[str]:
+    """
+    Stream generated text from Gemini as it is produced.
+    
+    Uses streamGenerateContent with server-sent events. A cached response is
+    yielded as a single chunk; a completed stream is stored in the cache.
+    
+    Args:
+        prompt: The prompt text to send to Gemini
+        model: The Gemini model to use (default: the first of GEMINI_MODELS;
+            other pool models are used as fallbacks when it is saturated)
+        temperature: Sampling temperature (0.0 to 1.0)
+        max_tokens: Maximum tokens to generate
+        use_cache: Return a cached response if one exists
+    
+    Yields:
+        Text chunks in generation order
+    
+    Raises:
+        ValueError: If API key or credentials are not configured
+        Exception: For API and network errors (secrets redacted)
+    """
+    prompt = sanitize_text(prompt, MAX_TEXT_LENGTH * 2)
+    
+    model = model or gemini_pool.primary_model
+    cache_key = response_cache.make_key(prompt, model, temperature, max_tokens)
+    if use_cache:
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Gemini response served from cache ({len(cached)} chars)")
+            yield cached
+            return
+    
+    api_key, access_token = await _get_credentials()
+    payload = _build_payload(prompt, temperature, max_tokens)
+    client = get_http_client()
+    held: List[GeminiRoute] = []
+    routes: List[GeminiRoute] = []
+    
+    async def send() -> httpx.Response:
+        route = gemini_pool.acquire(model)
+        routes.append(route)
+        headers, params = _build_auth(route.api_key if api_key else None, access_token)
+        params["alt"] = "sse"
+        url = f"{GEMINI_BASE_URL}/models/{route.model}:streamGenerateContent"
+        logger.info(f"Gemini API streaming request: POST {url} (key #{route.key.index})")
+        try:
+            request = client.build_request("POST", url, headers=headers, json=payload, params=params)
+            response = await client.send(request, stream=True)
+        except BaseException:
+            gemini_pool.release(route)
+            raise
+        if response.status_code >= 400:
+            gemini_pool.release(route, response.status_code, parse_retry_after(response.headers.get("Retry-After")))
+        else:
+            # Keep the route reserved until the stream has been read
+            held.append(route)
+        return response
+    
+    chunks: List[str] = []
+    try:
+        # The concurrency slot is held until the stream is fully read
+        async with gemini_governor.call(send) as response:
+            try:
+                if response.status_code >= 400:
+                    await response.aread()
+                    response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    text = _extract_text(json.loads(line[5:].strip()))
+                    if text:
+                        chunks.append(text)
+                        yield text
+            finally:
+                await response.aclose()
+                for route in held:
+                    gemini_pool.release(route)
+    except httpx.HTTPStatusError as e:
+        try:
+            error_detail = e.response.json().get("error", {}).get("message", "API request failed")
+        except Exception:
+            error_detail = f"HTTP {e.response.status_code}"
+        error_detail = _redact_secrets(error_detail, api_key, access_token)
+        logger.error(f"Gemini API HTTP error: {error_detail}")
+        raise Exception(f"Gemini API error: {error_detail}")
+    except httpx.RequestError as e:
+        logger.error(f"Gemini API network error: {_redact_secrets(str(e), api_key, access_token)}")
+        raise Exception("Network error: Unable to connect to AI service")
+    except ValueError as e:
+        error_msg = _redact_secrets(str(e), api_key, access_token)
+        logger.error(f"Gemini API error: {error_msg}")
+        raise Exception(f"Error calling Gemini API: {error_msg}")
+    
+    result_text = "".join(chunks)
+    logger.info(f"Finished streaming response from Gemini API ({len(result_text)} chars)")
+    # Fallback-model answers are served but not cached under the requested model
+    if result_text and routes[-1].model == model:
+        await response_cache.set(cache_key, result_text)
+
+
 def build_prompt_for_task(
     task: str,
     source_text: str,
@@ -400,6 +1032,34 @@ Rewrite the text to be more professional and clear:""",
     return prompts.get(task, f"Improve the following text:\n\n{source_text}")
 
 
+def clean_suggestion_line(line: str) -> Optional[str]:
+    """
+    Clean one line of model output into a suggestion.
+    
+    Drops blank lines and Markdown headings, removes leading bullets and
+    numbering, and sanitizes the rest.
+    
+    Returns:
+        The cleaned suggestion, or None if nothing is left
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    # Remove leading bullet points, numbers, etc.
+    cleaned = line.lstrip("- *•1234567890. )").strip()
+    if not cleaned:
+        return None
+    return sanitize_text(cleaned, MAX_TEXT_LENGTH) or None
+
+
+def _fallback_suggestion(response_text: str) -> str:
+    """Suggestion used when no line of the response survives cleaning."""
+    return (
+        sanitize_text(response_text.strip(), MAX_TEXT_LENGTH)
+        or sanitize_text("Unable to generate suggestions. Please try again.", MAX_TEXT_LENGTH)
+    )
+
+
 async def generate_suggestions(
     task: str,
     source_text: str,
@@ -407,6 +1067,7 @@ async def generate_suggestions(
     level: Optional[str] = None,
     job_desc: Optional[str] = None,
     count: int = 1,
+    use_cache: bool = True,
 ) -> List[str]:
     """
     Generate suggestions using Gemini API.
@@ -418,6 +1079,7 @@ async def generate_suggestions(
         level: Experience level (optional)
         job_desc: Job description (optional)
         count: Number of suggestions to generate
+        use_cache: Reuse a cached response for identical input
     
     Returns:
         List of suggestion strings
@@ -426,29 +1088,68 @@ async def generate_suggestions(
     prompt = build_prompt_for_task(task, source_text, role, level, job_desc, count)
     
     # Call Gemini API
-    response_text = await call_gemini_api(prompt, temperature=0.7, max_tokens=2048)
-    
-    # Parse response into list of suggestions
-    # Split by newlines and clean up
-    suggestions = [
-        line.strip()
-        for line in response_text.split("\n")
-        if line.strip() and not line.strip().startswith("#")
-    ]
+    response_text = await call_gemini_api(prompt, temperature=0.7, max_tokens=2048, use_cache=use_cache)
     
-    # Remove common prefixes like "- ", "* ", "1. ", etc.
+    # Parse response into list of suggestions, one per line
     cleaned_suggestions = []
-    for suggestion in suggestions:
-        # Remove leading bullet points, numbers, etc.
-        cleaned = suggestion.lstrip("- *•1234567890. )")
-        cleaned = cleaned.strip()
-        # Sanitize each suggestion before adding
+    for line in response_text.split("\n"):
+        cleaned = clean_suggestion_line(line)
         if cleaned:
-            cleaned = sanitize_text(cleaned, MAX_TEXT_LENGTH)
-            if cleaned:
-                cleaned_suggestions.append(cleaned)
+            cleaned_suggestions.append(cleaned)
     
     # Limit to requested count and ensure we have at least one suggestion
-    result = cleaned_suggestions[:count] if cleaned_suggestions else [sanitize_text(response_text.strip(), MAX_TEXT_LENGTH)]
-    return result if result else [sanitize_text("Unable to generate suggestions. Please try again.", MAX_TEXT_LENGTH)]
+    return cleaned_suggestions[:count] if cleaned_suggestions else [_fallback_suggestion(response_text)]
+
 
+async def stream_suggestions(
+    task: str,
+    source_text: str,
+    role: Optional[str] = None,
+    level: Optional[str] = None,
+    job_desc: Optional[str] = None,
+    count: int = 1,
+    use_cache: bool = True,
+) -> AsyncIterator[str]:
+    """
+    Stream suggestions as each line of the response completes.
+    
+    Applies the same cleaning as generate_suggestions, one line at a time,
+    and stops reading once ``count`` suggestions have been yielded.
+    
+    Args:
+        task: Task type (bullet, summary, skills, rewrite)
+        source_text: Source text to improve
+        role: Job role/title (optional)
+        level: Experience level (optional)
+        job_desc: Job description (optional)
+        count: Number of suggestions to generate
+        use_cache: Reuse a cached response for identical input
+    
+    Yields:
+        Suggestion strings in order
+    """
+    prompt = build_prompt_for_task(task, source_text, role, level, job_desc, count)
+    
+    received: List[str] = []
+    pending = ""
+    yielded = 0
+    stream = stream_gemini_api(prompt, temperature=0.7, max_tokens=2048, use_cache=use_cache)
+    try:
+        async for chunk in stream:
+            received.append(chunk)
+            *lines, pending = (pending + chunk).split("\n")
+            for line in lines:
+                cleaned = clean_suggestion_line(line)
+                if cleaned:
+                    yield cleaned
+                    yielded += 1
+                    if yielded >= count:
+                        return
+    finally:
+        await stream.aclose()
+    
+    cleaned = clean_suggestion_line(pending)
+    if cleaned:
+        yield cleaned
+    elif not yielded:
+        yield _fallback_suggestion("".join(received))
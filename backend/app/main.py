@@ -3,9 +3,18 @@ import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.config import settings
 from app.routers import suggest, ats, resumes, interview
-from app.db import connect_to_mongo, close_mongo_connection
+from app.db import connect_to_mongo, close_mongo_connection, database_status
+from app.gemini_client import (
+    open_http_client,
+    close_http_client,
+    gemini_pool,
+    service_account_configured,
+    token_provider,
+)
+from app.utils_parse import parse_pool
 
 # Configure logging
 logging.basicConfig(
@@ -18,11 +27,18 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
-    # Startup: connect to MongoDB
+    # Startup: start connecting to MongoDB (in the background) and open the pooled Gemini HTTP client
     await connect_to_mongo()
+    await open_http_client()
+    if not gemini_pool.has_api_keys and service_account_configured():
+        # Keep the service account token fresh off the request path
+        token_provider.start()
     yield
-    # Shutdown: close MongoDB connection
+    # Shutdown: close connections and stop parser workers
+    await token_provider.stop()
+    await close_http_client()
     await close_mongo_connection()
+    parse_pool.shutdown()
 
 
 app = FastAPI(
@@ -58,14 +74,32 @@ async def root():
     }
 
 
+@app.get("/api/metrics")
+async def metrics():
+    """Cache and client counters for monitoring."""
+    from app.gemini_client import gemini_single_flight
+    from app.rate_limiter import rate_limiter
+    from app.response_cache import response_cache
+    
+    return {
+        "gemini_cache": response_cache.stats(),
+        "gemini_single_flight": gemini_single_flight.stats(),
+        "gemini_pool": gemini_pool.stats(),
+        "service_account_token": token_provider.stats(),
+        "rate_limiter": rate_limiter.stats(),
+    }
+
+
 @app.get("/api/health")
 async def health():
     """
     Health check endpoint.
     
-    Returns system status without exposing sensitive information.
+    Returns system status without exposing sensitive information, including
+    the Gemini circuit breaker and concurrency limiter state.
     """
-    from app.db import get_db
+    from app.db import get_db, report_db_error
+    from app.upstream import gemini_governor
     
     # Check database connection (returns boolean)
     db_connected = False
@@ -75,12 +109,37 @@ async def health():
             # Test connection
             await client.admin.command('ping')
             db_connected = True
-    except Exception:
+    except Exception as e:
+        # Later checks answer from the cached failure instead of waiting again
+        report_db_error(e)
         db_connected = False
     
     return {
         "status": "ok",
         "env": settings.ENV,
-        "db": db_connected
+        "db": db_connected,
+        "gemini": gemini_governor.stats(),
     }
 
+
+@app.get("/api/health/live")
+async def liveness():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "ok"}
+
+
+@app.get("/api/health/ready")
+async def readiness():
+    """
+    Readiness probe.
+    
+    Returns 503 while a configured database is not connected, so load
+    balancers can hold traffic back; requests are still served meanwhile
+    and database routes fail fast. An unset MONGODB_URI counts as ready.
+    """
+    db = database_status()
+    ready = db["state"] in ("connected", "disabled")
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "db": db},
+    )
@@ -1,88 +1,467 @@
-"""Simple in-memory rate limiter per IP address."""
+"""Token-bucket rate limiter per IP address with pluggable storage.
+
+Backends (RATE_LIMIT_BACKEND):
+- memory: per-process buckets (each worker enforces its own limit)
+- shared: a memory-mapped table shared by the workers on one host
+- redis: buckets on a Redis-compatible server, updated by an atomic script
+"""
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import tempfile
 import time
-import asyncio
-from typing import Dict, Tuple
-from collections import defaultdict
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Protocol, Tuple
+from app.config import settings
+from app.redis_client import RedisClient, RedisError, create_redis_client
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Idle keys examined per call; keeps eviction O(1) per request
+EVICT_BATCH = 4
+
+
+def refill(tokens: float, last_seen: float, now: float, capacity: float, rate: float) -> float:
+    """Tokens in a bucket after refilling at ``rate`` per second since ``last_seen``."""
+    return min(capacity, tokens + max(0.0, now - last_seen) * rate)
+
+
+class RateLimitStore(Protocol):
+    """Storage for token buckets."""
+
+    name: str
+
+    async def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        """Refill the key's bucket and remove ``cost`` tokens if available; return (allowed, tokens left)."""
+
+    async def peek(self, key: str, capacity: float, rate: float) -> float:
+        """Return the key's current tokens without consuming any."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Return backend counters."""
+
+
+# ============================================================================
+# In-process Store
+# ============================================================================
+
+class MemoryRateLimitStore:
+    """
+    Buckets in a per-process ordered dict.
+
+    Each key stores two floats (tokens, last seen), ordered from least to
+    most recently seen. Operations do not await, so they are atomic under
+    asyncio. A key idle long enough to refill completely behaves exactly
+    like a new key, so idle keys are evicted (oldest first, a few per call);
+    ``max_keys`` bounds memory by evicting the least recently seen key.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_keys: int = 100_000, clock: Callable[[], float] = time.monotonic):
+        self.max_keys = max(1, max_keys)
+        self._clock = clock
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.evicted_idle = 0
+        self.evicted_overflow = 0
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _evict(self, now: float, full_after: float) -> None:
+        """Drop a few fully refilled idle keys, then enforce the key bound."""
+        buckets = self._buckets
+        cutoff = now - full_after
+        for _ in range(EVICT_BATCH):
+            if not buckets:
+                break
+            key, bucket = next(iter(buckets.items()))
+            if bucket[1] > cutoff:
+                break
+            del buckets[key]
+            self.evicted_idle += 1
+        while len(buckets) > self.max_keys:
+            buckets.popitem(last=False)
+            self.evicted_overflow += 1
+
+    def _refill(self, key: str, now: float, capacity: float, rate: float) -> List[float]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [capacity, now]
+            self._buckets[key] = bucket
+        else:
+            bucket[0] = refill(bucket[0], bucket[1], now, capacity, rate)
+            bucket[1] = now
+            self._buckets.move_to_end(key)
+        return bucket
+
+    async def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        now = self._clock()
+        bucket = self._refill(key, now, capacity, rate)
+        self._evict(now, capacity / rate)
+        if bucket[0] < cost:
+            return False, bucket[0]
+        bucket[0] -= cost
+        return True, bucket[0]
+
+    async def peek(self, key: str, capacity: float, rate: float) -> float:
+        return self._refill(key, self._clock(), capacity, rate)[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'backend': self.name,
+            'keys': len(self._buckets),
+            'max_keys': self.max_keys,
+            'evicted_idle': self.evicted_idle,
+            'evicted_overflow': self.evicted_overflow,
+        }
+
+
+# ============================================================================
+# Shared-memory Store
+# ============================================================================
+
+# Slot: key hash (0 = empty), tokens, last seen
+_SLOT = struct.Struct('<Qdd')
+# Slots probed per key before evicting the least recently seen one
+_PROBE = 4
+
+
+class SharedMemoryRateLimitStore:
+    """
+    Buckets in a fixed-size memory-mapped table shared by local workers.
+
+    Keys are hashed (stable across processes) to one of ``_PROBE``
+    consecutive slots; an idle (fully refilled) or least recently seen slot
+    is reused for new keys, so memory is fixed at ``slots * 24`` bytes.
+    Each update takes an exclusive ``flock`` on the table for a few
+    microseconds. Timestamps use the system-wide monotonic clock.
+
+    The file is opened lazily in each process, since flock locks are shared
+    by a forked child that inherits the descriptor.
+    """
+
+    name = "shared"
+
+    def __init__(self, path: str, slots: int = 131_072, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize store.
+
+        Args:
+            path: Table file, ideally on a memory-backed filesystem such as /dev/shm
+            slots: Number of buckets in the table
+            clock: Time source shared by all processes
+
+        Raises:
+            ValueError: If file locking is unavailable on this platform
+        """
+        if not FCNTL_AVAILABLE:
+            raise ValueError("Shared-memory rate limiting requires fcntl (POSIX only)")
+        self.path = path
+        self.slots = max(_PROBE, slots)
+        self._clock = clock
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._pid: Optional[int] = None
+        self.evicted = 0
+
+    def _open(self) -> mmap.mmap:
+        if self._map is not None and self._pid == os.getpid():
+            return self._map
+        size = self.slots * _SLOT.size
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_size < size:
+                os.ftruncate(fd, size)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        self._fd, self._map, self._pid = fd, mmap.mmap(fd, size), os.getpid()
+        return self._map
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little') or 1
+
+    def _update(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        table = self._open()
+        key_hash = self._hash(key)
+        start = key_hash % self.slots
+        now = self._clock()
+        full_after = capacity / rate
+
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            chosen = None
+            oldest = None
+            for i in range(_PROBE):
+                offset = ((start + i) % self.slots) * _SLOT.size
+                slot_hash, tokens, last_seen = _SLOT.unpack_from(table, offset)
+                if slot_hash == key_hash:
+                    chosen = (offset, refill(tokens, last_seen, now, capacity, rate))
+                    break
+                if chosen is None and (slot_hash == 0 or now - last_seen >= full_after):
+                    chosen = (offset, capacity)
+                if oldest is None or last_seen < oldest[1]:
+                    oldest = (offset, last_seen)
+            if chosen is None:
+                self.evicted += 1
+                chosen = (oldest[0], capacity)
+
+            offset, tokens = chosen
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            _SLOT.pack_into(table, offset, key_hash, tokens, now)
+            return allowed, tokens
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    async def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        return self._update(key, cost, capacity, rate)
+
+    async def peek(self, key: str, capacity: float, rate: float) -> float:
+        return self._update(key, 0, capacity, rate)[1]
+
+    def close(self) -> None:
+        if self._map is not None and self._pid == os.getpid():
+            self._map.close()
+            os.close(self._fd)
+        self._fd = self._map = self._pid = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'slots': self.slots,
+            'evicted': self.evicted,
+        }
+
+
+# ============================================================================
+# Redis Store
+# ============================================================================
+
+# ARGV: capacity, refill rate per second, cost, key TTL in ms.
+# Uses the server clock so all workers agree on time.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local ttl_ms = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= cost then
+  tokens = tokens - cost
+  allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ttl_ms)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitStore:
+    """
+    Buckets on a Redis-compatible server shared by any number of workers.
+
+    Each update is one atomic script call (EVALSHA, falling back to EVAL
+    when the server has not cached the script). Keys expire once they
+    would have refilled completely. If the server is unreachable requests
+    are allowed, so an outage of the limiter never takes the API down;
+    while the client has Redis marked down they are allowed without
+    contacting it, so an outage adds no latency either.
+    """
+
+    name = "redis"
+
+    def __init__(self, client: RedisClient, prefix: str = "resumegenie:ratelimit:"):
+        self._client = client
+        self._prefix = prefix
+        self._sha = hashlib.sha1(TOKEN_BUCKET_SCRIPT.encode('utf-8')).hexdigest()
+        self.errors = 0
+        self.skipped = 0
+
+    async def _run(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        if not self._client.available:
+            self.skipped += 1
+            return True, capacity
+        keys = [self._prefix + key]
+        ttl_ms = max(1, int(capacity / rate * 1000))
+        args = [repr(float(capacity)), repr(float(rate)), repr(float(cost)), ttl_ms]
+        try:
+            try:
+                allowed, tokens = await self._client.evalsha(self._sha, keys, args)
+            except RedisError as e:
+                if not str(e).startswith('NOSCRIPT'):
+                    raise
+                allowed, tokens = await self._client.eval(TOKEN_BUCKET_SCRIPT, keys, args)
+        except RedisError as e:
+            self.errors += 1
+            logger.warning(f"Rate limit backend unavailable, allowing request: {e}")
+            return True, capacity
+        return bool(allowed), float(tokens)
+
+    async def take(self, key: str, cost: float, capacity: float, rate: float) -> Tuple[bool, float]:
+        return await self._run(key, cost, capacity, rate)
+
+    async def peek(self, key: str, capacity: float, rate: float) -> float:
+        return (await self._run(key, 0, capacity, rate))[1]
+
+    def stats(self) -> Dict[str, Any]:
+        return {'backend': self.name, 'errors': self.errors, 'skipped': self.skipped}
+
+
+# ============================================================================
+# Rate Limiter
+# ============================================================================
+
+class RateLimitResult(NamedTuple):
+    """Outcome of charging a request against a client's budget."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    cost: int
+    reset_seconds: float  # Until the budget is full again
+    retry_after: float  # Until a request of this cost would be allowed (0 if allowed)
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """X-RateLimit-* response headers (plus Retry-After when rejected)."""
+        headers = {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(self.remaining),
+            'X-RateLimit-Reset': str(math.ceil(self.reset_seconds)),
+            'X-RateLimit-Cost': str(self.cost),
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(max(1, math.ceil(self.retry_after)))
+        return headers
 
 
 class RateLimiter:
-    """Simple in-memory rate limiter using sliding window per IP."""
-    
-    def __init__(self, max_requests: int = 10, window_seconds: int = 60):
+    """
+    Token-bucket rate limiter per IP address.
+
+    Each key has a bucket of ``max_requests`` tokens refilled at
+    ``max_requests / window_seconds`` tokens per second: a client may burst
+    up to the limit and sustains the same average rate. Requests may cost
+    more than one token, so expensive endpoints use more of the budget.
+    Storage is pluggable so the limit can be shared by several workers.
+    """
+
+    def __init__(
+        self,
+        max_requests: int = 10,
+        window_seconds: int = 60,
+        max_keys: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+        store: Optional[RateLimitStore] = None,
+    ):
         """
         Initialize rate limiter.
-        
+
         Args:
-            max_requests: Maximum number of requests per window
-            window_seconds: Time window in seconds
+            max_requests: Maximum number of requests per window (bucket size)
+            window_seconds: Time window in seconds (time to refill an empty bucket)
+            max_keys: Maximum number of keys tracked by the default in-process store
+            clock: Time source for the default in-process store
+            store: Bucket storage (default: in-process)
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: Dict[str, list] = defaultdict(list)
-        self._locks: Dict[str, asyncio.Lock] = {}
-        self._dict_lock = asyncio.Lock()  # Lock for managing IP locks dictionary
-    
-    async def _get_lock(self, ip: str) -> asyncio.Lock:
-        """Get or create lock for an IP address (thread-safe)."""
-        async with self._dict_lock:
-            if ip not in self._locks:
-                self._locks[ip] = asyncio.Lock()
-            return self._locks[ip]
-    
-    def _clean_old_requests(self, ip: str, now: float):
-        """Remove requests outside the time window."""
-        if ip not in self.requests:
-            return
-        
-        cutoff_time = now - self.window_seconds
-        self.requests[ip] = [
-            timestamp for timestamp in self.requests[ip]
-            if timestamp > cutoff_time
-        ]
-    
+        self.rate = max_requests / window_seconds
+        self.store = store if store is not None else MemoryRateLimitStore(max_keys=max_keys, clock=clock)
+
+    async def check(self, ip: str, cost: int = 1) -> RateLimitResult:
+        """
+        Charge a request against the given IP's budget if it fits.
+
+        Args:
+            ip: IP address
+            cost: Tokens the request uses; capped at the budget so any request can eventually run
+
+        Returns:
+            Whether the request is allowed, with the remaining budget and timings
+        """
+        cost = max(1, min(cost, self.max_requests))
+        capacity = float(self.max_requests)
+        allowed, tokens = await self.store.take(ip, cost, capacity, self.rate)
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.max_requests,
+            remaining=int(tokens),
+            cost=cost,
+            reset_seconds=(capacity - tokens) / self.rate,
+            retry_after=0.0 if allowed else (cost - tokens) / self.rate,
+        )
+
     async def is_allowed(self, ip: str) -> Tuple[bool, int]:
         """
-        Check if request is allowed for the given IP (thread-safe for async).
-        
+        Check if request is allowed for the given IP and consume a token if so.
+
         Args:
             ip: IP address
-        
+
         Returns:
             Tuple of (is_allowed, remaining_requests)
         """
-        # Get lock for this IP (thread-safe)
-        lock = await self._get_lock(ip)
-        
-        async with lock:
-            now = time.time()
-            
-            # Clean old requests
-            self._clean_old_requests(ip, now)
-            
-            # Check if limit exceeded
-            request_count = len(self.requests[ip])
-            
-            if request_count >= self.max_requests:
-                return False, 0
-            
-            # Add current request
-            self.requests[ip].append(now)
-            
-            # Return allowed status and remaining requests
-            remaining = self.max_requests - request_count - 1
-            return True, remaining
-    
+        result = await self.check(ip)
+        return result.allowed, result.remaining if result.allowed else 0
+
     async def get_remaining(self, ip: str) -> int:
-        """Get remaining requests for an IP (thread-safe for async)."""
-        lock = await self._get_lock(ip)
-        async with lock:
-            now = time.time()
-            self._clean_old_requests(ip, now)
-            request_count = len(self.requests[ip])
-            return max(0, self.max_requests - request_count)
+        """Get remaining requests for an IP."""
+        return int(await self.store.peek(ip, float(self.max_requests), self.rate))
 
+    def stats(self) -> Dict[str, Any]:
+        """Return limits and backend counters."""
+        return {
+            'max_requests': self.max_requests,
+            'window_seconds': self.window_seconds,
+            **self.store.stats(),
+        }
 
-# Global rate limiter instance
-# 10 requests per 60 seconds per IP
-rate_limiter = RateLimiter(max_requests=10, window_seconds=60)
 
+def create_rate_limit_store() -> RateLimitStore:
+    """Create the bucket store configured by RATE_LIMIT_BACKEND."""
+    backend = settings.RATE_LIMIT_BACKEND.strip().lower()
+    if backend == 'memory':
+        return MemoryRateLimitStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+    if backend == 'shared':
+        path = settings.RATE_LIMIT_SHARED_PATH
+        if not path:
+            directory = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+            path = os.path.join(directory, 'resumegenie-ratelimit')
+        return SharedMemoryRateLimitStore(path, slots=settings.RATE_LIMIT_SHARED_SLOTS)
+    if backend == 'redis':
+        return RedisRateLimitStore(create_redis_client())
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {settings.RATE_LIMIT_BACKEND}")
+
+
+# Global rate limiter instance
+# 10 requests per 60 seconds per IP by default
+rate_limiter = RateLimiter(
+    max_requests=settings.RATE_LIMIT_REQUESTS,
+    window_seconds=settings.RATE_LIMIT_WINDOW_SECONDS,
+    store=create_rate_limit_store(),
+)
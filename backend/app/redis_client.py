@@ -0,0 +1,245 @@
+"""Minimal asyncio client for Redis-compatible servers.
+
+Speaks RESP2 over a small pool of connections, which is enough for the
+shared caches and counters used by the API without adding a dependency.
+"""
+import asyncio
+import time
+from typing import Any, List, NamedTuple, Optional, Sequence, Union
+from urllib.parse import urlparse
+from app.config import settings
+
+RedisValue = Union[str, bytes, int, float]
+
+
+class RedisError(Exception):
+    """Raised when the server returns an error or the connection fails."""
+
+
+def _encode_command(args: Sequence[RedisValue]) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b'*%d\r\n' % len(args)]
+    for arg in args:
+        if isinstance(arg, bytes):
+            data = arg
+        elif isinstance(arg, str):
+            data = arg.encode('utf-8')
+        else:
+            data = str(arg).encode('utf-8')
+        parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+    return b''.join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one RESP reply.
+
+    Raises:
+        RedisError: For error replies
+        asyncio.IncompleteReadError: If the connection closes mid-reply
+    """
+    line = await reader.readuntil(b'\r\n')
+    kind, payload = line[:1], line[1:-2]
+    if kind == b'+':
+        return payload.decode('utf-8')
+    if kind == b'-':
+        raise RedisError(payload.decode('utf-8'))
+    if kind == b':':
+        return int(payload)
+    if kind == b'$':
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b'*':
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RedisError(f"Unexpected reply type: {kind!r}")
+
+
+class RedisUnavailableError(RedisError):
+    """Raised without contacting the server while it is marked down."""
+
+
+class _Connection(NamedTuple):
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+
+class RedisClient:
+    """
+    Async client for a Redis-compatible server with a small connection pool.
+
+    After a connection failure or timeout the server is marked down and
+    commands fail at once with RedisUnavailableError. The window doubles
+    with each consecutive failure; once it passes, one command probes the
+    server while the others keep failing fast. Callers that treat Redis
+    errors as a miss or an allowance therefore never wait on a dead server.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 2.0,
+        max_connections: int = 8,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+    ):
+        """
+        Initialize client. Connections are opened on demand.
+
+        Args:
+            url: Server URL (redis://[:password@]host[:port][/db])
+            timeout: Seconds allowed for connecting and for each command
+            max_connections: Commands in flight at once (one connection each)
+            backoff_base: Seconds the server is skipped after the first failure
+            backoff_max: Longest time the server is skipped
+        """
+        parsed = urlparse(url)
+        if parsed.scheme not in ('redis', ''):
+            raise ValueError(f"Unsupported Redis URL scheme: {parsed.scheme}")
+        self.host = parsed.hostname or 'localhost'
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.timeout = timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._slots = asyncio.Semaphore(max(1, max_connections))
+        self._idle: List[_Connection] = []
+        self._failures = 0
+        self._down_until = 0.0
+        self._probing = False
+
+    @property
+    def available(self) -> bool:
+        """False while the server is marked down (commands would fail fast)."""
+        if self._failures == 0:
+            return True
+        return not self._probing and time.monotonic() >= self._down_until
+
+    def _mark_down(self) -> None:
+        self._failures += 1
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (self._failures - 1)))
+        self._down_until = time.monotonic() + delay
+
+    async def _connect(self) -> _Connection:
+        """Open a connection and run AUTH/SELECT if configured."""
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        conn = _Connection(reader, writer)
+        try:
+            if self.password:
+                await self._send(conn, ('AUTH', self.password))
+            if self.db:
+                await self._send(conn, ('SELECT', self.db))
+        except BaseException:
+            writer.close()
+            raise
+        return conn
+
+    async def _send(self, conn: _Connection, args: Sequence[RedisValue]) -> Any:
+        """Write one command and read its reply on an open connection, both within the timeout."""
+        async def round_trip() -> Any:
+            conn.writer.write(_encode_command(args))
+            await conn.writer.drain()
+            return await read_reply(conn.reader)
+
+        return await asyncio.wait_for(round_trip(), self.timeout)
+
+    def _check_available(self) -> None:
+        if not self.available:
+            remaining = max(0.0, self._down_until - time.monotonic())
+            raise RedisUnavailableError(f"Redis marked down, retrying in {remaining:.1f}s")
+
+    async def execute(self, *args: RedisValue) -> Any:
+        """
+        Run one command and return its decoded reply.
+
+        Raises:
+            RedisUnavailableError: If the server is marked down
+            RedisError: For error replies, timeouts and connection failures
+        """
+        self._check_available()
+        async with self._slots:
+            # The server may have been marked down while this call waited
+            self._check_available()
+            probe = self._failures > 0
+            if probe:
+                self._probing = True
+            conn = self._idle.pop() if self._idle else None
+            if conn is not None and conn.writer.is_closing():
+                conn = None
+            try:
+                if conn is None:
+                    conn = await self._connect()
+                reply = await self._send(conn, args)
+            except RedisError:
+                # Error reply: the server is up and the connection still in a known state
+                if conn is not None:
+                    self._failures = 0
+                    self._idle.append(conn)
+                raise
+            except asyncio.CancelledError:
+                # A reply may still be in flight; never reuse this connection
+                if conn is not None:
+                    conn.writer.close()
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+                if conn is not None:
+                    conn.writer.close()
+                self._mark_down()
+                raise RedisError(f"Redis connection failed: {e.__class__.__name__}") from e
+            finally:
+                if probe:
+                    self._probing = False
+            self._failures = 0
+            self._idle.append(conn)
+            return reply
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored at key, or None."""
+        return await self.execute('GET', key)
+
+    async def set(self, key: str, value: RedisValue, px: Optional[int] = None) -> None:
+        """Store a value, optionally expiring after ``px`` milliseconds."""
+        if px is not None:
+            await self.execute('SET', key, value, 'PX', px)
+        else:
+            await self.execute('SET', key, value)
+
+    async def delete(self, *keys: str) -> int:
+        """Delete keys and return how many existed."""
+        return await self.execute('DEL', *keys)
+
+    async def eval(self, script: str, keys: List[str], args: List[RedisValue]) -> Any:
+        """Run a server-side script atomically."""
+        return await self.execute('EVAL', script, len(keys), *keys, *args)
+
+    async def evalsha(self, sha: str, keys: List[str], args: List[RedisValue]) -> Any:
+        """Run a script previously cached on the server by its SHA1 (raises NOSCRIPT if not cached)."""
+        return await self.execute('EVALSHA', sha, len(keys), *keys, *args)
+
+    async def close(self) -> None:
+        """Close idle connections."""
+        idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.writer.close()
+            try:
+                await conn.writer.wait_closed()
+            except OSError:
+                pass
+
+
+def create_redis_client() -> RedisClient:
+    """Create a client for REDIS_URL with the pool and backoff settings."""
+    return RedisClient(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        backoff_base=settings.REDIS_BACKOFF_BASE_SECONDS,
+        backoff_max=settings.REDIS_BACKOFF_MAX_SECONDS,
+    )
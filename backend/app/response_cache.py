@@ -0,0 +1,169 @@
+"""Cache for Gemini responses keyed by normalized prompt and generation settings."""
+import logging
+import time
+from typing import Any, Dict, Optional, Protocol
+from app.cache import LRUCache, content_hash
+from app.config import settings
+from app.redis_client import RedisClient, RedisError, create_redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseStore(Protocol):
+    """Storage backend for cached responses."""
+
+    name: str
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return the stored response or None."""
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        """Store a response for ``ttl_seconds``."""
+
+    async def clear(self) -> None:
+        """Remove all stored responses."""
+
+
+class MemoryResponseStore:
+    """In-process store: an LRU bounded by entry count, with per-entry expiry."""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self._entries = LRUCache(max_entries=max_entries, name="gemini_responses")
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key)
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        self._entries.set(key, (time.monotonic() + ttl_seconds, value))
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+class RedisResponseStore:
+    """Shared store on a Redis-compatible server; expiry and eviction are server-side."""
+
+    name = "redis"
+
+    def __init__(self, client: RedisClient, prefix: str = "resumegenie:gemini:"):
+        self._client = client
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._client.get(self._prefix + key)
+        return value.decode('utf-8') if value is not None else None
+
+    async def set(self, key: str, value: str, ttl_seconds: float) -> None:
+        await self._client.set(self._prefix + key, value, px=max(1, int(ttl_seconds * 1000)))
+
+    async def clear(self) -> None:
+        # Keys expire on their own; flushing a shared server is left to operators
+        pass
+
+
+class ResponseCache:
+    """
+    TTL cache for generated text with hit/miss counters.
+
+    Backend errors are logged and treated as misses, so an unavailable
+    cache server never fails a request.
+    """
+
+    def __init__(self, store: Optional[ResponseStore], ttl_seconds: float):
+        """
+        Initialize cache.
+
+        Args:
+            store: Storage backend (None disables caching)
+            ttl_seconds: Lifetime of a cached response
+        """
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.store is not None
+
+    @staticmethod
+    def make_key(prompt: str, model: str, temperature: float, max_tokens: int) -> str:
+        """
+        Build a cache key from the prompt and generation settings.
+
+        Runs of whitespace are collapsed so prompts that differ only in
+        formatting share an entry.
+        """
+        normalized = ' '.join(prompt.split())
+        return content_hash(model, repr(float(temperature)), str(int(max_tokens)), normalized)
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return a cached response or None."""
+        if self.store is None:
+            return None
+        try:
+            value = await self.store.get(key)
+        except RedisError as e:
+            self.errors += 1
+            logger.warning(f"Response cache read failed: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        """Store a response."""
+        if self.store is None:
+            return
+        try:
+            await self.store.set(key, value, self.ttl_seconds)
+        except RedisError as e:
+            self.errors += 1
+            logger.warning(f"Response cache write failed: {e}")
+
+    async def clear(self) -> None:
+        """Clear stored responses and reset counters."""
+        if self.store is not None:
+            await self.store.clear()
+        self.hits = self.misses = self.errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return backend name and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            'backend': self.store.name if self.store is not None else 'none',
+            'ttl_seconds': self.ttl_seconds,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def create_response_cache() -> ResponseCache:
+    """Create the response cache configured by GEMINI_CACHE_BACKEND."""
+    backend = settings.GEMINI_CACHE_BACKEND.strip().lower()
+    if backend == 'memory':
+        store = MemoryResponseStore(settings.GEMINI_CACHE_SIZE)
+    elif backend == 'redis':
+        store = RedisResponseStore(create_redis_client())
+    elif backend in ('none', ''):
+        store = None
+    else:
+        raise ValueError(f"Unknown GEMINI_CACHE_BACKEND: {settings.GEMINI_CACHE_BACKEND}")
+    return ResponseCache(store, settings.GEMINI_CACHE_TTL_SECONDS)
+
+
+response_cache = create_response_cache()
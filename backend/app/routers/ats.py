@@ -1,9 +1,41 @@
 """ATS (Applicant Tracking System) router for resume analysis."""
-import re
-from typing import List, Set, Dict, Any, Optional
+import asyncio
+import time
+import uuid
+from functools import partial
+from typing import AsyncIterator, Awaitable, Callable, Iterable, List, Set, Dict, Any, Optional, Tuple, Union
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from app.schemas import ATSRequest, ATSResponse, Resume, Experience, Achievement
-from app.utils_parse import parse_resume_file
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from app.config import settings
+from app.cache import LRUCache
+from app.db import encode_json
+from app.schemas import (
+    ATSRequest,
+    ATSResponse,
+    ATSBatchRequest,
+    ATSSessionUpdate,
+    ATSSessionResponse,
+    Resume,
+    Experience,
+    Achievement,
+)
+from app.utils_parse import ParserBusyError, parse_resume_file, text_cache_stats
+from app.utils_resume import apply_resume_change
+from app.utils_text import (
+    STOP_WORDS,
+    ATS_METRIC_KINDS,
+    SCORED_SECTIONS,
+    FieldSpec,
+    TextStats,
+    analyze_text,
+    analyze_resume_text,
+    field_selected,
+    item_fields,
+    section_fields,
+    get_job_index,
+    job_index_cache,
+)
 
 router = APIRouter()
 
@@ -23,63 +55,31 @@ WEIGHT_EXPERIENCE = 0.15  # Experience quality and completeness
 KEYWORD_MIN_LENGTH = 3  # Minimum keyword length
 KEYWORD_MATCH_RATIO_THRESHOLD = 0.3  # Minimum ratio of matched keywords to total keywords
 
-# Action verbs (common resume action verbs)
-ACTION_VERBS = {
-    'achieved', 'acted', 'adapted', 'administered', 'advanced', 'advised', 'allocated',
-    'analyzed', 'applied', 'appointed', 'approved', 'architected', 'assembled', 'assessed',
-    'assigned', 'attained', 'authored', 'automated', 'balanced', 'built', 'calculated',
-    'catalyzed', 'championed', 'changed', 'clarified', 'closed', 'coached', 'collaborated',
-    'collected', 'communicated', 'completed', 'composed', 'computed', 'conceived',
-    'conducted', 'configured', 'consolidated', 'constructed', 'consulted', 'contracted',
-    'contributed', 'controlled', 'converted', 'coordinated', 'created', 'critiqued',
-    'customized', 'decreased', 'delegated', 'delivered', 'demonstrated', 'designed',
-    'determined', 'developed', 'devised', 'directed', 'discovered', 'distributed',
-    'dramatized', 'drove', 'earned', 'edited', 'educated', 'elected', 'elicited',
-    'eliminated', 'emphasized', 'employed', 'enabled', 'enforced', 'engineered',
-    'enhanced', 'enlarged', 'enlisted', 'ensured', 'established', 'evaluated',
-    'examined', 'exceeded', 'executed', 'expanded', 'expedited', 'experimented',
-    'explained', 'explored', 'exported', 'extracted', 'facilitated', 'fashioned',
-    'focused', 'forecasted', 'formed', 'formulated', 'fostered', 'founded',
-    'generated', 'governed', 'grouped', 'guided', 'headed', 'helped', 'hired',
-    'honed', 'hosted', 'hypothesized', 'identified', 'illustrated', 'implemented',
-    'improved', 'increased', 'influenced', 'informed', 'initiated', 'innovated',
-    'inspected', 'inspired', 'installed', 'instituted', 'instructed', 'integrated',
-    'interpreted', 'interviewed', 'introduced', 'invented', 'investigated', 'invited',
-    'involved', 'joined', 'judged', 'justified', 'launched', 'led', 'lectured',
-    'lobbied', 'located', 'logged', 'maintained', 'managed', 'manipulated', 'mapped',
-    'marketed', 'mastered', 'matched', 'maximized', 'measured', 'mediated', 'merged',
-    'minimized', 'modeled', 'moderated', 'modernized', 'modified', 'monitored',
-    'motivated', 'moved', 'named', 'navigated', 'negotiated', 'nominated', 'operated',
-    'optimized', 'orchestrated', 'organized', 'originated', 'overhauled', 'oversaw',
-    'participated', 'partnered', 'performed', 'persuaded', 'pioneered', 'planned',
-    'positioned', 'prepared', 'presented', 'presided', 'prioritized', 'processed',
-    'produced', 'programmed', 'projected', 'promoted', 'proposed', 'proved', 'provided',
-    'publicized', 'published', 'purchased', 'pursued', 'qualified', 'quantified',
-    'questioned', 'raised', 'ran', 'ranked', 'rated', 'realized', 'received',
-    'recognized', 'recommended', 'reconciled', 'recorded', 'recruited', 'redesigned',
-    'reduced', 'referred', 'refined', 'regulated', 'reinforced', 'rejected', 'related',
-    'remedied', 'remodeled', 'reorganized', 'repaired', 'replaced', 'reported',
-    'represented', 'researched', 'resolved', 'responded', 'restored', 'restructured',
-    'retained', 'retrieved', 'revamped', 'reviewed', 'revised', 'revitalized',
-    'scheduled', 'secured', 'selected', 'separated', 'served', 'serviced', 'set',
-    'shaped', 'shared', 'showed', 'signaled', 'simplified', 'simulated', 'sold',
-    'solved', 'sorted', 'sought', 'sparked', 'sponsored', 'standardized', 'started',
-    'stimulated', 'stopped', 'strengthened', 'stressed', 'stretched', 'structured',
-    'studied', 'submitted', 'substituted', 'succeeded', 'suggested', 'summarized',
-    'supervised', 'supplied', 'supported', 'surpassed', 'surveyed', 'sustained',
-    'synthesized', 'systematized', 'tabulated', 'tailored', 'taught', 'teamed',
-    'terminated', 'tested', 'tightened', 'tolerated', 'touched', 'trained',
-    'transcended', 'transferred', 'transformed', 'translated', 'transmitted',
-    'traveled', 'treated', 'trimmed', 'tripled', 'troubleshot', 'trusted', 'turned',
-    'uncovered', 'understood', 'unified', 'united', 'unveiled', 'updated', 'upgraded',
-    'used', 'utilized', 'validated', 'valued', 'verified', 'viewed', 'visited',
-    'volunteered', 'waged', 'won', 'worked', 'wrote'
-}
-
 # Required sections for a complete resume
 REQUIRED_SECTIONS = ['personal', 'experience', 'skills']
 OPTIONAL_SECTIONS = ['summary', 'education', 'projects', 'achievements']
 
+# Resume fields read by the verb and metric categories
+VERB_FIELDS: FieldSpec = (
+    ('experience', ('description', 'position')),
+    ('achievements', ('description', 'title')),
+)
+METRIC_FIELDS: FieldSpec = (
+    ('experience', ('description',)),
+    ('achievements', ('description',)),
+    ('projects', ('description',)),
+)
+
+# Resume sections whose edits make each category stale
+# (keywords also go stale when the job description changes)
+CATEGORY_SECTIONS = {
+    'keywords': {'personal', 'summary', 'experience', 'education', 'skills', 'projects', 'achievements'},
+    'verbs': {'experience', 'achievements'},
+    'metrics': {'experience', 'achievements', 'projects'},
+    'sections': {'personal', 'summary', 'experience', 'education', 'skills', 'projects', 'achievements'},
+    'experience': {'experience'},
+}
+
 # Minimum number of action verbs expected in experience section
 MIN_ACTION_VERBS = 3
 
@@ -98,71 +98,20 @@ SCORE_FAIR = 40
 
 def extract_keywords(text: str) -> Set[str]:
     """Extract keywords from text (non-stop words, minimum length)."""
-    if not text:
-        return set()
-    
-    # Convert to lowercase and split into words
-    words = re.findall(r'\b[a-z]{3,}\b', text.lower())
-    
-    # Common stop words to exclude
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-        'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-        'should', 'could', 'may', 'might', 'must', 'can', 'this', 'that',
-        'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'what',
-        'which', 'who', 'when', 'where', 'why', 'how', 'all', 'each', 'every',
-        'both', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor',
-        'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just',
-        'now'
-    }
-    
-    # Filter out stop words and short words
-    keywords = {w for w in words if w not in stop_words and len(w) >= KEYWORD_MIN_LENGTH}
-    return keywords
+    return analyze_text(text).keywords(KEYWORD_MIN_LENGTH, STOP_WORDS)
 
 
 def count_action_verbs(text: str) -> int:
     """Count action verbs in text."""
-    if not text:
-        return 0
-    
-    words = re.findall(r'\b[a-z]+\b', text.lower())
-    verb_count = sum(1 for word in words if word in ACTION_VERBS)
-    return verb_count
+    return analyze_text(text).verb_count
 
 
 def count_quantitative_metrics(text: str) -> int:
     """Count quantitative metrics (numbers, percentages) in text."""
-    if not text:
-        return 0
-    
-    # Match numbers (integers, decimals, percentages, ratios)
-    patterns = [
-        r'\d+%',  # Percentages
-        r'\$\d+(?:,\d{3})*(?:\.\d+)?',  # Currency
-        r'\d+(?:\.\d+)?[x×]',  # Multipliers (2x, 3.5x)
-        r'\d+(?:\.\d+)?\s*(?:million|billion|thousand|k|M|B)',  # Large numbers
-        r'\d+(?:\.\d+)?\s*(?:years?|months?|weeks?|days?)',  # Time periods
-        r'\d+(?:\.\d+)?\s*(?:people|users|customers|clients|team|employees)',  # Counts
-        r'\d+(?:\.\d+)?\s*(?:points?|units?|items?|projects?|features?)',  # Counts
-        r'\d+\/\d+',  # Ratios
-        r'\d+(?:\.\d+)?%',  # Percentages (alternative)
-    ]
-    
-    metric_count = 0
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        metric_count += len(matches)
-    
-    # Also count standalone numbers that might be metrics (3+ digits or decimals)
-    standalone_numbers = re.findall(r'\b\d{3,}\b|\b\d+\.\d+\b', text)
-    metric_count += len(standalone_numbers)
-    
-    return metric_count
+    return analyze_text(text).metric_count(ATS_METRIC_KINDS)
 
 
-def calculate_keyword_score(resume_text: str, job_desc: str) -> Dict[str, Any]:
+def calculate_keyword_score(resume_keywords: Set[str], job_desc: str) -> Dict[str, Any]:
     """Calculate keyword overlap score between resume and job description."""
     if not job_desc:
         return {
@@ -173,9 +122,8 @@ def calculate_keyword_score(resume_text: str, job_desc: str) -> Dict[str, Any]:
             'matched_count': 0
         }
     
-    # Extract keywords from job description and resume
-    job_keywords = extract_keywords(job_desc)
-    resume_keywords = extract_keywords(resume_text)
+    # Keywords from the job description come from the shared index cache
+    job_keywords = get_job_index(job_desc).keywords_for(KEYWORD_MIN_LENGTH, STOP_WORDS)
     
     # Find matched and missing keywords
     matched_keywords = job_keywords.intersection(resume_keywords)
@@ -201,23 +149,9 @@ def calculate_keyword_score(resume_text: str, job_desc: str) -> Dict[str, Any]:
     }
 
 
-def calculate_verbs_score(resume: Resume) -> Dict[str, Any]:
-    """Calculate action verb usage score."""
-    # Collect text from experience and achievements
-    experience_text = ' '.join([
-        (exp.description or '') + ' ' + exp.position
-        for exp in resume.experience
-    ])
-    
-    achievements_text = ' '.join([
-        (ach.description or '') + ' ' + ach.title
-        for ach in resume.achievements
-    ])
-    
-    all_text = experience_text + ' ' + achievements_text
-    
-    # Count action verbs
-    verb_count = count_action_verbs(all_text)
+def calculate_verbs_score(verb_stats: TextStats) -> Dict[str, Any]:
+    """Calculate action verb usage score from experience and achievements text stats."""
+    verb_count = verb_stats.verb_count
     
     # Calculate score (0-100) based on verb count
     # More verbs = better score, capped at 100
@@ -239,28 +173,9 @@ def calculate_verbs_score(resume: Resume) -> Dict[str, Any]:
     }
 
 
-def calculate_metrics_score(resume: Resume) -> Dict[str, Any]:
-    """Calculate quantitative metrics score."""
-    # Collect text from experience, achievements, and projects
-    experience_text = ' '.join([
-        exp.description or ''
-        for exp in resume.experience
-    ])
-    
-    achievements_text = ' '.join([
-        ach.description or ''
-        for ach in resume.achievements
-    ])
-    
-    projects_text = ' '.join([
-        proj.description or ''
-        for proj in resume.projects
-    ])
-    
-    all_text = experience_text + ' ' + achievements_text + ' ' + projects_text
-    
-    # Count metrics
-    metric_count = count_quantitative_metrics(all_text)
+def calculate_metrics_score(metric_stats: TextStats) -> Dict[str, Any]:
+    """Calculate quantitative metrics score from experience, achievements and project text stats."""
+    metric_count = metric_stats.metric_count(ATS_METRIC_KINDS)
     
     # Calculate score (0-100) based on metric count
     if metric_count >= MIN_METRICS * 3:
@@ -406,43 +321,20 @@ def generate_tips(
     return tips
 
 
-# ============================================================================
-# API Endpoints
-# ============================================================================
-
-@router.post("/score", response_model=ATSResponse)
-async def get_ats_score(request: ATSRequest):
+def build_ats_response(results: Dict[str, Dict[str, Any]], job_desc: str) -> ATSResponse:
     """
-    Analyze resume against job description and provide ATS score.
+    Combine per-category results into the weighted ATS response.
     
-    This endpoint calculates an ATS score based on:
-    - Keyword overlap with job description (35%)
-    - Action verb usage (15%)
-    - Quantitative metrics (20%)
-    - Sections presence (15%)
-    - Experience quality (15%)
+    Args:
+        results: Category results keyed by 'keywords', 'verbs', 'metrics',
+            'sections' and 'experience'
+        job_desc: Job description the keywords were scored against
     """
-    resume = request.resume
-    job_desc = request.jobDesc or ""
-    
-    # Combine resume text for keyword matching
-    resume_text_parts = [
-        resume.personal.firstName + ' ' + resume.personal.lastName,
-        resume.summary or '',
-        ' '.join([exp.position + ' ' + (exp.description or '') for exp in resume.experience]),
-        ' '.join([edu.degree + ' ' + (edu.field or '') for edu in resume.education]),
-        ' '.join([skill.name for skill in resume.skills]),
-        ' '.join([proj.name + ' ' + (proj.description or '') for proj in resume.projects]),
-        ' '.join([ach.title + ' ' + (ach.description or '') for ach in resume.achievements]),
-    ]
-    resume_text = ' '.join(resume_text_parts)
-    
-    # Calculate individual scores
-    keyword_result = calculate_keyword_score(resume_text, job_desc)
-    verbs_result = calculate_verbs_score(resume)
-    metrics_result = calculate_metrics_score(resume)
-    sections_result = calculate_sections_score(resume)
-    experience_result = calculate_experience_score(resume)
+    keyword_result = results['keywords']
+    verbs_result = results['verbs']
+    metrics_result = results['metrics']
+    sections_result = results['sections']
+    experience_result = results['experience']
     
     # Calculate weighted overall score
     overall_score = int(
@@ -503,74 +395,50 @@ async def get_ats_score(request: ATSRequest):
     )
 
 
-@router.post("/analyze", response_model=ATSResponse)
-async def analyze_resume(request: ATSRequest):
-    """Detailed resume analysis (alias for /score)."""
-    return await get_ats_score(request)
+# ============================================================================
+# Scoring Entry Points
+# ============================================================================
 
+ALLOWED_UPLOAD_TYPES = [
+    'application/pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/msword',
+    'pdf',
+    'docx',
+    'doc'
+]
 
-@router.post("/score-file", response_model=ATSResponse)
-async def get_ats_score_from_file(
-    file: UploadFile = File(...),
-    jobDesc: Optional[str] = Form(None)
-):
-    """
-    Analyze resume from uploaded file against job description and provide ATS score.
-    
-    Accepts PDF or DOCX files. Extracts text from the file and analyzes it.
-    """
-    # Validate file type
-    allowed_types = [
-        'application/pdf',
-        'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-        'application/msword',
-        'pdf',
-        'docx',
-        'doc'
-    ]
-    
-    file_type = file.content_type or ''
-    file_ext = file.filename.split('.')[-1].lower() if file.filename else ''
-    
-    if file_type not in allowed_types and file_ext not in ['pdf', 'docx', 'doc']:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported file type. Please upload a PDF or DOCX file."
-        )
-    
-    # Validate file size (max 5MB)
-    file_content = await file.read()
-    if len(file_content) > 5 * 1024 * 1024:
-        raise HTTPException(
-            status_code=400,
-            detail="File size must be less than 5MB"
-        )
+MAX_UPLOAD_BYTES = 5 * 1024 * 1024
+
+
+def score_resume(resume: Resume, job_desc: str) -> ATSResponse:
+    """Score a structured resume against a job description."""
+    # Analyze every resume field once; categories combine the fields they need
+    analysis = analyze_resume_text(resume)
+    resume_keywords = analysis.all().keywords(KEYWORD_MIN_LENGTH, STOP_WORDS)
     
-    # Parse file
-    try:
-        resume_text = await parse_resume_file(file_content, file_type or file_ext)
-        if not resume_text or len(resume_text.strip()) < 100:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract sufficient text from the file. Please ensure the file contains selectable text."
-            )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to parse file: {str(e)}"
-        )
+    # Calculate individual scores
+    results = {
+        'keywords': calculate_keyword_score(resume_keywords, job_desc),
+        'verbs': calculate_verbs_score(analysis.select_fields(VERB_FIELDS)),
+        'metrics': calculate_metrics_score(analysis.select_fields(METRIC_FIELDS)),
+        'sections': calculate_sections_score(resume),
+        'experience': calculate_experience_score(resume),
+    }
     
-    # For file-based analysis, we'll analyze the text directly
-    # Since we don't have structured Resume object, we'll score based on text analysis
-    job_desc = jobDesc or ""
+    return build_ats_response(results, job_desc)
+
+
+def score_resume_text(resume_text: str, job_desc: str) -> ATSResponse:
+    """Score plain resume text (e.g. extracted from an uploaded file) against a job description."""
+    # Analyze the extracted text in a single pass
+    text_stats = analyze_text(resume_text)
     
     # Calculate keyword score
-    keyword_result = calculate_keyword_score(resume_text, job_desc)
+    keyword_result = calculate_keyword_score(text_stats.keywords(KEYWORD_MIN_LENGTH, STOP_WORDS), job_desc)
     
     # Calculate verb score from text
-    verb_count = count_action_verbs(resume_text)
+    verb_count = text_stats.verb_count
     if verb_count >= MIN_ACTION_VERBS * 3:
         verbs_score = 100
     elif verb_count >= MIN_ACTION_VERBS * 2:
@@ -583,7 +451,7 @@ async def get_ats_score_from_file(
         verbs_score = 20
     
     # Calculate metrics score
-    metric_count = count_quantitative_metrics(resume_text)
+    metric_count = text_stats.metric_count(ATS_METRIC_KINDS)
     if metric_count >= MIN_METRICS * 3:
         metrics_score = 100
     elif metric_count >= MIN_METRICS * 2:
@@ -596,11 +464,12 @@ async def get_ats_score_from_file(
         metrics_score = 20
     
     # For file-based, we'll estimate sections score
+    headings = text_stats.section_hits()
     sections_present = {
-        'personal': bool(re.search(r'\b(email|phone|contact)\b', resume_text, re.I)),
-        'experience': bool(re.search(r'\b(experience|work|employment)\b', resume_text, re.I)),
-        'education': bool(re.search(r'\b(education|degree|university|college)\b', resume_text, re.I)),
-        'skills': bool(re.search(r'\b(skills|competencies|technologies)\b', resume_text, re.I)),
+        'personal': bool(headings & {'email', 'phone', 'contact'}),
+        'experience': bool(headings & {'experience', 'work', 'employment'}),
+        'education': bool(headings & {'education', 'degree', 'university', 'college'}),
+        'skills': bool(headings & {'skills', 'competencies', 'technologies'}),
     }
     sections_score = sum([
         4 if sections_present.get('personal') else 0,
@@ -653,7 +522,7 @@ async def get_ats_score_from_file(
             'experience': {
                 'count': 1 if has_experience else 0,
                 'has_descriptions': has_experience,
-                'has_dates': bool(re.search(r'\d{4}', resume_text))
+                'has_dates': text_stats.has_year
             }
         }
     }
@@ -686,3 +555,449 @@ async def get_ats_score_from_file(
         breakdown=breakdown,
         tips=tips
     )
+
+
+async def read_resume_upload(file: UploadFile) -> Tuple[bytes, str]:
+    """
+    Validate an uploaded resume file and read its content.
+    
+    Returns:
+        Tuple of (file content, file type used for parsing)
+    
+    Raises:
+        HTTPException: 400 if the file type is unsupported or the file is too large
+    """
+    file_type = file.content_type or ''
+    file_ext = file.filename.split('.')[-1].lower() if file.filename else ''
+    
+    if file_type not in ALLOWED_UPLOAD_TYPES and file_ext not in ['pdf', 'docx', 'doc']:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Please upload a PDF or DOCX file."
+        )
+    
+    # Validate file size (max 5MB)
+    file_content = await file.read()
+    if len(file_content) > MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=400,
+            detail="File size must be less than 5MB"
+        )
+    
+    return file_content, file_type or file_ext
+
+
+async def extract_resume_text(file_content: bytes, file_type: str) -> str:
+    """
+    Extract text from an uploaded resume file.
+    
+    Raises:
+        HTTPException: 400 if the file cannot be parsed or has too little text,
+            429 if the parse pool is saturated, 500 on unexpected parser errors
+    """
+    try:
+        resume_text = await parse_resume_file(file_content, file_type, max_chars=settings.PARSE_MAX_CHARS)
+    except ParserBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to parse file: {str(e)}"
+        )
+    
+    if not resume_text or len(resume_text.strip()) < 100:
+        raise HTTPException(
+            status_code=400,
+            detail="Could not extract sufficient text from the file. Please ensure the file contains selectable text."
+        )
+    return resume_text
+
+
+# ============================================================================
+# Batch Scoring
+# ============================================================================
+
+# A batch job scores one resume; uploads rejected before scoring are passed
+# as the HTTPException instead so they are reported in order with the rest
+BatchJob = Callable[[], Awaitable[ATSResponse]]
+
+
+def check_batch_size(count: int, limit: int) -> None:
+    """
+    Validate the number of resumes in a batch.
+    
+    Raises:
+        HTTPException: 400 if the batch is empty, 413 if it exceeds the limit
+    """
+    if count == 0:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one resume")
+    if count > limit:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {count} resumes (maximum {limit})"
+        )
+
+
+async def score_resume_job(resume: Resume, job_desc: str) -> ATSResponse:
+    """
+    Score a structured resume on the event loop.
+    
+    Scoring is pure-Python CPU work of a few milliseconds, so threads would
+    only take turns on the GIL. The job yields to the event loop before
+    scoring so finished lines can be streamed between resumes.
+    """
+    await asyncio.sleep(0)
+    return score_resume(resume, job_desc)
+
+
+async def score_resume_upload(file_content: bytes, file_type: str, job_desc: str) -> ATSResponse:
+    """Extract text from an uploaded resume in the parse pool, then score it on the event loop."""
+    resume_text = await extract_resume_text(file_content, file_type)
+    return score_resume_text(resume_text, job_desc)
+
+
+async def stream_batch(
+    jobs: List[Tuple[Dict[str, Any], Union[BatchJob, HTTPException]]]
+) -> AsyncIterator[bytes]:
+    """
+    Run batch jobs and yield NDJSON lines in completion order.
+    
+    At most ATS_BATCH_CONCURRENCY jobs run at once. Uploads overlap while
+    their files are parsed; scoring itself runs on the event loop one resume
+    at a time, with lines sent between resumes.
+    
+    Each job is paired with metadata (index, filename) copied into its line.
+    Successful jobs yield a ``result`` line with the full ATS response and
+    failed ones an ``error`` line; a final ``summary`` line ranks the scored
+    resumes by score. Pending jobs are cancelled if the client disconnects.
+    
+    Args:
+        jobs: List of (metadata, job) pairs
+    
+    Yields:
+        Newline-terminated JSON lines
+    """
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(1, settings.ATS_BATCH_CONCURRENCY))
+    
+    async def run(meta: Dict[str, Any], job: Union[BatchJob, HTTPException]):
+        async with semaphore:
+            try:
+                if isinstance(job, HTTPException):
+                    raise job
+                return meta, await job(), None
+            except HTTPException as e:
+                return meta, None, (e.status_code, e.detail)
+            except Exception as e:
+                return meta, None, (500, f"Failed to score resume: {str(e)}")
+    
+    tasks = [asyncio.create_task(run(meta, job)) for meta, job in jobs]
+    ranking: List[Dict[str, Any]] = []
+    failed = 0
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            meta, result, error = await next_done
+            if error is None:
+                ranking.append({**meta, 'score': result.score})
+                line = {'type': 'result', **meta, **result.model_dump()}
+            else:
+                failed += 1
+                line = {'type': 'error', **meta, 'status': error[0], 'detail': error[1]}
+            yield encode_json(line) + b'\n'
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    ranking.sort(key=lambda item: (-item['score'], item['index']))
+    for rank, item in enumerate(ranking, start=1):
+        item['rank'] = rank
+    yield encode_json({
+        'type': 'summary',
+        'total': len(jobs),
+        'scored': len(ranking),
+        'failed': failed,
+        'ranking': ranking,
+        'elapsedMs': round((time.perf_counter() - started) * 1000, 1),
+    }) + b'\n'
+
+
+# ============================================================================
+# Incremental Scoring Sessions
+# ============================================================================
+
+class ATSSession:
+    """
+    Incremental scoring state for a resume being edited.
+    
+    Keeps per-field text stats plus running totals for the fields each
+    category reads. An edit re-analyzes only the touched fields, swaps their
+    stats in the totals, and recomputes only the categories that depend on
+    the edited sections.
+    """
+    
+    # Running totals maintained per field selection
+    TOTALS: Dict[str, FieldSpec] = {
+        'verbs': VERB_FIELDS,
+        'metrics': METRIC_FIELDS,
+    }
+    
+    def __init__(self, resume: Resume, job_desc: str):
+        self.id = uuid.uuid4().hex
+        self.resume = resume
+        self.job_desc = job_desc
+        self.fields: Dict[str, TextStats] = {}
+        self.totals: Dict[str, TextStats] = {name: TextStats() for name in ('all', *self.TOTALS)}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.last_used = time.monotonic()
+        for section in SCORED_SECTIONS:
+            self._replace_fields(section, None)
+        self.rescore(CATEGORY_SECTIONS)
+    
+    def _account(self, name: str, stats: TextStats, add: bool) -> None:
+        """Add or remove one field's stats from the running totals."""
+        for total_name, total in self.totals.items():
+            if total_name == 'all' or field_selected(name, self.TOTALS[total_name]):
+                if add:
+                    total += stats
+                else:
+                    total -= stats
+    
+    def _replace_fields(self, section: str, index: Optional[int]) -> None:
+        """Re-analyze the fields of a section (or of one item) after an edit."""
+        if index is None:
+            stale = [name for name in self.fields if name.split('.', 1)[0] == section]
+        else:
+            prefix = f'{section}.{index}.'
+            stale = [name for name in self.fields if name.startswith(prefix)]
+        for name in stale:
+            self._account(name, self.fields.pop(name), add=False)
+        
+        if index is None:
+            fresh = section_fields(self.resume, section)
+        else:
+            fresh = item_fields(section, index, getattr(self.resume, section)[index])
+        for name, text in fresh:
+            stats = analyze_text(text)
+            self.fields[name] = stats
+            self._account(name, stats, add=True)
+    
+    def rescore(self, categories: Iterable[str]) -> None:
+        """Recompute the given categories from the running totals."""
+        for category in categories:
+            if category == 'keywords':
+                # Only job keywords matter, so look them up instead of listing resume words
+                words = self.totals['all'].words
+                job_keywords = get_job_index(self.job_desc).keywords_for(KEYWORD_MIN_LENGTH, STOP_WORDS)
+                resume_keywords = {w for w in job_keywords if w in words}
+                self.results[category] = calculate_keyword_score(resume_keywords, self.job_desc)
+            elif category == 'verbs':
+                self.results[category] = calculate_verbs_score(self.totals['verbs'])
+            elif category == 'metrics':
+                self.results[category] = calculate_metrics_score(self.totals['metrics'])
+            elif category == 'sections':
+                self.results[category] = calculate_sections_score(self.resume)
+            elif category == 'experience':
+                self.results[category] = calculate_experience_score(self.resume)
+    
+    def apply(self, update: ATSSessionUpdate) -> List[str]:
+        """
+        Apply field changes and rescore the affected categories.
+        
+        Changes are applied in order. If one fails validation, the changes
+        before it stay applied and their categories are still rescored.
+        
+        Returns:
+            Sorted list of recomputed categories
+        """
+        self.last_used = time.monotonic()
+        dirty: Set[str] = set()
+        try:
+            for change in update.changes:
+                section, index = apply_resume_change(self.resume, change.path, change.value, change.op)
+                if section in SCORED_SECTIONS:
+                    self._replace_fields(section, index)
+                dirty.update(
+                    category for category, sections in CATEGORY_SECTIONS.items()
+                    if section in sections
+                )
+            if update.jobDesc is not None and update.jobDesc != self.job_desc:
+                self.job_desc = update.jobDesc
+                dirty.add('keywords')
+        finally:
+            self.rescore(dirty)
+        return sorted(dirty)
+    
+    def response(self, recomputed: List[str]) -> ATSSessionResponse:
+        """Build the session response from the current category results."""
+        scored = build_ats_response(self.results, self.job_desc)
+        return ATSSessionResponse(
+            sessionId=self.id,
+            recomputed=recomputed,
+            **scored.model_dump()
+        )
+
+
+# Sessions are per-process; an evicted or expired session, or one created
+# by another worker or instance, returns 404 and the client starts a new one.
+# Keeping sessions needs WEB_WORKERS=1 and sticky routing to each instance.
+ats_sessions = LRUCache(max_entries=settings.ATS_SESSION_CACHE_SIZE, name="ats_sessions")
+
+
+def get_session(session_id: str) -> ATSSession:
+    """
+    Look up a live scoring session.
+    
+    Raises:
+        HTTPException: 404 if the session does not exist or has expired
+    """
+    session = ats_sessions.get(session_id)
+    if session is not None and time.monotonic() - session.last_used > settings.ATS_SESSION_TTL_SECONDS:
+        ats_sessions.pop(session_id)
+        session = None
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Scoring session not found or expired. Start a new session."
+        )
+    return session
+
+
+# ============================================================================
+# API Endpoints
+# ============================================================================
+
+@router.post("/score", response_model=ATSResponse)
+async def get_ats_score(request: ATSRequest):
+    """
+    Analyze resume against job description and provide ATS score.
+    
+    This endpoint calculates an ATS score based on:
+    - Keyword overlap with job description (35%)
+    - Action verb usage (15%)
+    - Quantitative metrics (20%)
+    - Sections presence (15%)
+    - Experience quality (15%)
+    """
+    return score_resume(request.resume, request.jobDesc or "")
+
+
+@router.post("/analyze", response_model=ATSResponse)
+async def analyze_resume(request: ATSRequest):
+    """Detailed resume analysis (alias for /score)."""
+    return await get_ats_score(request)
+
+
+@router.post("/score-file", response_model=ATSResponse)
+async def get_ats_score_from_file(
+    file: UploadFile = File(...),
+    jobDesc: Optional[str] = Form(None)
+):
+    """
+    Analyze resume from uploaded file against job description and provide ATS score.
+    
+    Accepts PDF or DOCX files. Extracts text from the file and analyzes it.
+    """
+    file_content, file_type = await read_resume_upload(file)
+    resume_text = await extract_resume_text(file_content, file_type)
+    
+    # For file-based analysis, we'll analyze the text directly
+    # Since we don't have structured Resume object, we'll score based on text analysis
+    return score_resume_text(resume_text, jobDesc or "")
+
+@router.post("/score-batch")
+async def score_batch(request: ATSBatchRequest):
+    """
+    Score many resumes against one job description.
+    
+    The job description is tokenized once and shared by every resume. Resumes
+    are scored one after another and streamed back as NDJSON (one line per
+    resume), followed by a summary line ranking them by score.
+    """
+    check_batch_size(len(request.resumes), settings.ATS_BATCH_MAX_RESUMES)
+    job_desc = request.jobDesc or ""
+    # Build the job index up front so every resume hits the cache
+    get_job_index(job_desc)
+    
+    jobs = [
+        ({'index': index}, partial(score_resume_job, resume, job_desc))
+        for index, resume in enumerate(request.resumes)
+    ]
+    return StreamingResponse(stream_batch(jobs), media_type="application/x-ndjson")
+
+
+@router.post("/score-batch-file")
+async def score_batch_files(
+    files: List[UploadFile] = File(...),
+    jobDesc: Optional[str] = Form(None)
+):
+    """
+    Score many uploaded resume files (PDF or DOCX) against one job description.
+    
+    Streams NDJSON like /score-batch. A file that cannot be read or parsed
+    yields an error line for that file without failing the batch.
+    """
+    check_batch_size(len(files), settings.ATS_BATCH_MAX_FILES)
+    job_desc = jobDesc or ""
+    get_job_index(job_desc)
+    
+    # Read every upload before streaming; the files are closed once this returns
+    jobs = []
+    for index, file in enumerate(files):
+        meta = {'index': index, 'filename': file.filename}
+        try:
+            file_content, file_type = await read_resume_upload(file)
+        except HTTPException as e:
+            jobs.append((meta, e))
+            continue
+        jobs.append((meta, partial(score_resume_upload, file_content, file_type, job_desc)))
+    return StreamingResponse(stream_batch(jobs), media_type="application/x-ndjson")
+
+
+@router.post("/sessions", response_model=ATSSessionResponse)
+async def create_scoring_session(request: ATSRequest):
+    """
+    Start an incremental scoring session.
+    
+    Scores the full resume once and returns a sessionId. Later edits are sent
+    to PATCH /sessions/{sessionId} as field-level changes.
+    """
+    session = ATSSession(request.resume, request.jobDesc or "")
+    ats_sessions.set(session.id, session)
+    return session.response(sorted(CATEGORY_SECTIONS))
+
+
+@router.patch("/sessions/{session_id}", response_model=ATSSessionResponse)
+async def update_scoring_session(session_id: str, update: ATSSessionUpdate):
+    """
+    Apply field-level changes to a scoring session and rescore incrementally.
+    
+    Each change targets a path such as 'summary', 'experience.2.description',
+    'skills.4' or 'projects'. Only the touched fields are re-analyzed and only
+    categories that depend on the edited sections are recomputed.
+    """
+    session = get_session(session_id)
+    try:
+        recomputed = session.apply(update)
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return session.response(recomputed)
+
+
+@router.delete("/sessions/{session_id}")
+async def delete_scoring_session(session_id: str):
+    """End a scoring session."""
+    get_session(session_id)
+    ats_sessions.pop(session_id)
+    return {"message": "Session deleted", "sessionId": session_id}
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """Report hit/miss counters for the ATS caches."""
+    return {
+        "job_index": job_index_cache.stats(),
+        "sessions": ats_sessions.stats(),
+        "parsed_text": text_cache_stats(),
+    }
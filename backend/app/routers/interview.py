@@ -1,22 +1,33 @@
 """Interview questions router for generating interview questions based on resume and job description."""
-from fastapi import APIRouter, HTTPException, Request, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Request, Response, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from app.schemas import (
     InterviewQuestionsRequest,
     InterviewQuestionsResponse,
     InterviewQuestion,
+    InterviewGenerationMetadata,
+    InterviewGenerationResult,
     Resume
 )
 from app.config import settings
-from app.gemini_client import call_gemini_api
-from app.rate_limiter import rate_limiter
-from app.utils_parse import parse_resume_file
-from typing import List
+from app.gemini_client import call_gemini_api, gemini_configured, gemini_pool, stream_gemini_api
+from app.rate_limiter import RateLimitResult, rate_limiter
+from app.utils_parse import ParserBusyError, parse_resume_file
+from app.utils_stream import JSONArrayStreamParser, format_sse
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Union
+import asyncio
 import json
+import math
 import re
+import time
 import logging
 
 router = APIRouter()
 
+# Resume text sent to the model for uploaded files
+MAX_RESUME_FILE_CHARS = 20000
+
 
 def get_client_ip(http_request: Request) -> str:
     """Extract client IP address from request."""
@@ -34,6 +45,58 @@ def get_client_ip(http_request: Request) -> str:
     return "unknown"
 
 
+def interview_cost(num_tech: int, num_behavioral: int) -> int:
+    """Rate-limit tokens charged for generating the given number of questions."""
+    per_token = max(1, settings.RATE_LIMIT_INTERVIEW_QUESTIONS_PER_TOKEN)
+    return math.ceil((num_tech + num_behavioral) / per_token)
+
+
+async def check_interview_allowed(http_request: Request, cost: int) -> RateLimitResult:
+    """
+    Check that the AI service is configured and the client can afford the request.
+    
+    Args:
+        http_request: Incoming request (for the client IP)
+        cost: Rate-limit tokens the request uses (see interview_cost)
+    
+    Returns:
+        The rate-limit result, whose headers should be sent with the response
+    
+    Raises:
+        HTTPException: 503 if Gemini is not configured, 429 if rate limited
+    """
+    if not gemini_configured():
+        raise HTTPException(
+            status_code=503,
+            detail=(
+                "AI service is currently unavailable. "
+                "Please configure GEMINI_API_KEY or GEMINI_API_KEYS in your environment variables."
+            )
+        )
+    
+    client_ip = get_client_ip(http_request)
+    limit = await rate_limiter.check(client_ip, cost)
+    if not limit.allowed:
+        raise HTTPException(
+            status_code=429,
+            detail=(
+                f"Rate limit exceeded. "
+                f"This request costs {limit.cost} of the {rate_limiter.max_requests} requests allowed "
+                f"per {rate_limiter.window_seconds} seconds. "
+                f"Please try again later or ask for fewer questions."
+            ),
+            headers=limit.headers,
+        )
+    return limit
+
+
+def redact_secrets(message: str) -> str:
+    """Remove every Gemini API key in the routing pool from an error message."""
+    for api_key in gemini_pool.secrets:
+        message = message.replace(api_key, "[REDACTED]")
+    return message
+
+
 def build_resume_summary(resume: Resume) -> str:
     """Build a summary of the resume for prompt generation."""
     parts = []
@@ -99,12 +162,12 @@ def build_resume_summary(resume: Resume) -> str:
     return "\n".join(parts)
 
 
-async def generate_technical_questions(
-    resume_summary: str,
-    job_desc: str,
-    count: int
-) -> List[InterviewQuestion]:
-    """Generate technical interview questions."""
+TECHNICAL_FALLBACK_ANSWER = "Answer based on your experience."
+BEHAVIORAL_FALLBACK_ANSWER = "Use the STAR method: describe a Situation, Task, Action, and Result from your experience."
+
+
+def build_technical_prompt(resume_summary: str, job_desc: str, count: int) -> str:
+    """Build the prompt for technical interview questions."""
     job_section = ("No specific job description provided. Generate general technical questions based on the resume."
                    if not job_desc else "Job Description:\n" + job_desc)
     prompt = f"""You are an expert technical interviewer. Based on the COMPLETE resume content and job description provided below, generate EXACTLY {count} technical interview questions that would be asked for this position.
@@ -143,95 +206,11 @@ Format your response as a JSON array with this structure:
 ]
 
 Return ONLY the JSON array, no additional text before or after."""
-
-    try:
-        logger = logging.getLogger(__name__)
-        logger.info(f"Generating {count} technical questions. Resume length: {len(resume_summary)} chars, Job desc length: {len(job_desc)} chars")
-        
-        response = await call_gemini_api(
-            prompt=prompt,
-            temperature=0.7,
-            max_tokens=8000  # Increased to allow for more detailed questions and answers
-        )
-        
-        logger.info(f"Received response from Gemini API. Response length: {len(response) if response else 0} chars")
-        logger.debug(f"Response preview (first 500 chars): {response[:500] if response else 'None'}")
-        
-        # Check if response is empty or None
-        if not response or not response.strip():
-            logger.error("Empty response from AI service")
-            raise Exception("Empty response from AI service")
-        
-        # Extract JSON from response
-        json_match = re.search(r'\[.*\]', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            try:
-                questions_data = json.loads(json_str)
-                logger.info(f"Successfully parsed JSON. Found {len(questions_data)} questions in response")
-            except json.JSONDecodeError as e:
-                # If JSON parsing fails, log and fall through to text parsing
-                logger.warning(f"Failed to parse JSON from response: {e}. Response preview: {response[:200]}")
-                json_match = None  # Force fallback to text parsing
-            
-            if json_match:  # Only if JSON was successfully parsed
-                questions = []
-                for q_data in questions_data:
-                    if isinstance(q_data, dict) and 'question' in q_data and 'suggested_answer' in q_data:
-                        questions.append(InterviewQuestion(
-                            question=q_data['question'],
-                            suggested_answer=q_data['suggested_answer'],
-                            category='technical'
-                        ))
-                
-                logger.info(f"Successfully created {len(questions)} technical questions")
-                return questions[:count] if questions else []
-        
-        # Fallback: try to parse as plain text
-        logger.info("Attempting to parse response as plain text (JSON parsing failed or no JSON found)")
-        lines = [line.strip() for line in response.split('\n') if line.strip()]
-        questions = []
-        current_question = None
-        current_answer = []
-        
-        for line in lines:
-            if line.startswith('Q:') or line.startswith('Question:'):
-                if current_question:
-                    questions.append(InterviewQuestion(
-                        question=current_question,
-                        suggested_answer=' '.join(current_answer),
-                        category='technical'
-                    ))
-                current_question = line.replace('Q:', '').replace('Question:', '').strip()
-                current_answer = []
-            elif line.startswith('A:') or line.startswith('Answer:'):
-                current_answer.append(line.replace('A:', '').replace('Answer:', '').strip())
-            elif current_question:
-                current_answer.append(line)
-        
-        if current_question:
-            questions.append(InterviewQuestion(
-                question=current_question,
-                suggested_answer=' '.join(current_answer) if current_answer else "Answer based on your experience.",
-                category='technical'
-            ))
-        
-        logger.info(f"Parsed {len(questions)} questions from text format")
-        if not questions:
-            logger.warning(f"No questions extracted. Full response: {response[:1000]}")
-        
-        return questions[:count] if questions else []
-            
-    except Exception as e:
-        raise Exception(f"Failed to generate technical questions: {str(e)}")
+    return prompt
 
 
-async def generate_behavioral_questions(
-    resume_summary: str,
-    job_desc: str,
-    count: int
-) -> List[InterviewQuestion]:
-    """Generate behavioral interview questions."""
+def build_behavioral_prompt(resume_summary: str, job_desc: str, count: int) -> str:
+    """Build the prompt for behavioral interview questions."""
     job_section = ("No specific job description provided. Generate general behavioral questions based on the resume."
                    if not job_desc else "Job Description:\n" + job_desc)
     prompt = f"""You are an expert behavioral interviewer. Based on the COMPLETE resume content and job description provided below, generate EXACTLY {count} behavioral interview questions using the STAR method (Situation, Task, Action, Result).
@@ -269,10 +248,113 @@ Format your response as a JSON array with this structure:
 ]
 
 Return ONLY the JSON array, no additional text before or after."""
+    return prompt
+
+
+def question_from_data(data: Any, category: str) -> Optional[InterviewQuestion]:
+    """Build a question from one decoded JSON element, or None if it is unusable."""
+    if not isinstance(data, dict) or 'question' not in data or 'suggested_answer' not in data:
+        return None
+    try:
+        return InterviewQuestion(
+            question=data['question'],
+            suggested_answer=data['suggested_answer'],
+            category=category
+        )
+    except ValidationError:
+        return None
+
+
+def parse_questions_response(
+    response: str,
+    category: str,
+    count: int,
+    fallback_answer: str
+) -> List[InterviewQuestion]:
+    """
+    Parse questions from a model response.
+    
+    Expects a JSON array; falls back to "Q:"/"A:" plain text.
+    
+    Raises:
+        Exception: If the response is empty
+    """
+    logger = logging.getLogger(__name__)
+    
+    # Check if response is empty or None
+    if not response or not response.strip():
+        logger.error("Empty response from AI service")
+        raise Exception("Empty response from AI service")
+    
+    # Extract JSON from response
+    json_match = re.search(r'\[.*\]', response, re.DOTALL)
+    if json_match:
+        json_str = json_match.group(0)
+        try:
+            questions_data = json.loads(json_str)
+            logger.info(f"Successfully parsed JSON. Found {len(questions_data)} questions in response")
+        except json.JSONDecodeError as e:
+            # If JSON parsing fails, log and fall through to text parsing
+            logger.warning(f"Failed to parse JSON from response: {e}. Response preview: {response[:200]}")
+            json_match = None  # Force fallback to text parsing
+        
+        if json_match:  # Only if JSON was successfully parsed
+            questions = []
+            for q_data in questions_data:
+                question = question_from_data(q_data, category)
+                if question is not None:
+                    questions.append(question)
+            
+            logger.info(f"Successfully created {len(questions)} {category} questions")
+            return questions[:count] if questions else []
+    
+    # Fallback: try to parse as plain text
+    logger.info("Attempting to parse response as plain text (JSON parsing failed or no JSON found)")
+    lines = [line.strip() for line in response.split('\n') if line.strip()]
+    questions = []
+    current_question = None
+    current_answer = []
+    
+    for line in lines:
+        if line.startswith('Q:') or line.startswith('Question:'):
+            if current_question:
+                questions.append(InterviewQuestion(
+                    question=current_question,
+                    suggested_answer=' '.join(current_answer),
+                    category=category
+                ))
+            current_question = line.replace('Q:', '').replace('Question:', '').strip()
+            current_answer = []
+        elif line.startswith('A:') or line.startswith('Answer:'):
+            current_answer.append(line.replace('A:', '').replace('Answer:', '').strip())
+        elif current_question:
+            current_answer.append(line)
+    
+    if current_question:
+        questions.append(InterviewQuestion(
+            question=current_question,
+            suggested_answer=' '.join(current_answer) if current_answer else fallback_answer,
+            category=category
+        ))
+    
+    logger.info(f"Parsed {len(questions)} questions from text format")
+    if not questions:
+        logger.warning(f"No questions extracted. Full response: {response[:1000]}")
+    
+    return questions[:count] if questions else []
+
+
+async def generate_technical_questions(
+    resume_summary: str,
+    job_desc: str,
+    count: int
+) -> List[InterviewQuestion]:
+    """Generate technical interview questions."""
+    prompt = build_technical_prompt(resume_summary, job_desc, count)
 
     try:
         logger = logging.getLogger(__name__)
-        logger.info(f"Generating {count} behavioral questions. Resume length: {len(resume_summary)} chars, Job desc length: {len(job_desc)} chars")
+        logger.info(f"Generating {count} technical questions. Resume length: {len(resume_summary)} chars, Job desc length: {len(job_desc)} chars")
         
         response = await call_gemini_api(
             prompt=prompt,
@@ -283,79 +365,242 @@ Return ONLY the JSON array, no additional text before or after."""
         logger.info(f"Received response from Gemini API. Response length: {len(response) if response else 0} chars")
         logger.debug(f"Response preview (first 500 chars): {response[:500] if response else 'None'}")
         
-        # Check if response is empty or None
-        if not response or not response.strip():
-            logger.error("Empty response from AI service")
-            raise Exception("Empty response from AI service")
-        
-        # Extract JSON from response
-        json_match = re.search(r'\[.*\]', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            try:
-                questions_data = json.loads(json_str)
-                logger.info(f"Successfully parsed JSON. Found {len(questions_data)} questions in response")
-            except json.JSONDecodeError as e:
-                # If JSON parsing fails, log and fall through to text parsing
-                logger.warning(f"Failed to parse JSON from response: {e}. Response preview: {response[:200]}")
-                json_match = None  # Force fallback to text parsing
+        return parse_questions_response(response, 'technical', count, TECHNICAL_FALLBACK_ANSWER)
             
-            if json_match:  # Only if JSON was successfully parsed
-                questions = []
-                for q_data in questions_data:
-                    if isinstance(q_data, dict) and 'question' in q_data and 'suggested_answer' in q_data:
-                        questions.append(InterviewQuestion(
-                            question=q_data['question'],
-                            suggested_answer=q_data['suggested_answer'],
-                            category='behavioral'
-                        ))
-                
-                logger.info(f"Successfully created {len(questions)} behavioral questions")
-                return questions[:count] if questions else []
-        
-        # Fallback: try to parse as plain text
-        logger.info("Attempting to parse response as plain text (JSON parsing failed or no JSON found)")
-        lines = [line.strip() for line in response.split('\n') if line.strip()]
-        questions = []
-        current_question = None
-        current_answer = []
-        
-        for line in lines:
-            if line.startswith('Q:') or line.startswith('Question:'):
-                if current_question:
-                    questions.append(InterviewQuestion(
-                        question=current_question,
-                        suggested_answer=' '.join(current_answer),
-                        category='behavioral'
-                    ))
-                current_question = line.replace('Q:', '').replace('Question:', '').strip()
-                current_answer = []
-            elif line.startswith('A:') or line.startswith('Answer:'):
-                current_answer.append(line.replace('A:', '').replace('Answer:', '').strip())
-            elif current_question:
-                current_answer.append(line)
+    except Exception as e:
+        raise Exception(f"Failed to generate technical questions: {str(e)}")
+
+
+async def generate_behavioral_questions(
+    resume_summary: str,
+    job_desc: str,
+    count: int
+) -> List[InterviewQuestion]:
+    """Generate behavioral interview questions."""
+    prompt = build_behavioral_prompt(resume_summary, job_desc, count)
+
+    try:
+        logger = logging.getLogger(__name__)
+        logger.info(f"Generating {count} behavioral questions. Resume length: {len(resume_summary)} chars, Job desc length: {len(job_desc)} chars")
         
-        if current_question:
-            questions.append(InterviewQuestion(
-                question=current_question,
-                suggested_answer=' '.join(current_answer) if current_answer else "Use the STAR method: describe a Situation, Task, Action, and Result from your experience.",
-                category='behavioral'
-            ))
+        response = await call_gemini_api(
+            prompt=prompt,
+            temperature=0.7,
+            max_tokens=8000  # Increased to allow for more detailed questions and answers
+        )
         
-        logger.info(f"Parsed {len(questions)} questions from text format")
-        if not questions:
-            logger.warning(f"No questions extracted. Full response: {response[:1000]}")
+        logger.info(f"Received response from Gemini API. Response length: {len(response) if response else 0} chars")
+        logger.debug(f"Response preview (first 500 chars): {response[:500] if response else 'None'}")
         
-        return questions[:count] if questions else []
+        return parse_questions_response(response, 'behavioral', count, BEHAVIORAL_FALLBACK_ANSWER)
             
     except Exception as e:
         raise Exception(f"Failed to generate behavioral questions: {str(e)}")
 
 
+async def _timed(
+    call: Awaitable[List[InterviewQuestion]]
+) -> Tuple[Union[List[InterviewQuestion], Exception], float]:
+    """Await a generation call, returning its result (or exception) and elapsed milliseconds."""
+    started = time.perf_counter()
+    try:
+        result = await call
+    except Exception as e:
+        result = e
+    return result, (time.perf_counter() - started) * 1000
+
+
+def _generation_result(
+    result: Union[List[InterviewQuestion], Exception],
+    elapsed_ms: float
+) -> InterviewGenerationResult:
+    """Describe one generation call for the response metadata."""
+    if isinstance(result, Exception):
+        return InterviewGenerationResult(
+            status='failed',
+            elapsed_ms=round(elapsed_ms, 1),
+            error=redact_secrets(str(result)),
+        )
+    return InterviewGenerationResult(status='ok', count=len(result), elapsed_ms=round(elapsed_ms, 1))
+
+
+async def generate_all_questions(
+    resume_summary: str,
+    job_desc: str,
+    num_tech: int,
+    num_behavioral: int,
+) -> InterviewQuestionsResponse:
+    """
+    Generate technical and behavioral questions concurrently.
+    
+    If one call fails, the questions from the other are still returned and
+    the failed call is marked in the response metadata.
+    
+    Raises:
+        Exception: The technical call's error if both calls fail
+        HTTPException: 500 if no questions were generated
+    """
+    started = time.perf_counter()
+    (technical, technical_ms), (behavioral, behavioral_ms) = await asyncio.gather(
+        _timed(generate_technical_questions(resume_summary=resume_summary, job_desc=job_desc, count=num_tech)),
+        _timed(generate_behavioral_questions(resume_summary=resume_summary, job_desc=job_desc, count=num_behavioral)),
+    )
+    total_ms = (time.perf_counter() - started) * 1000
+    
+    if isinstance(technical, Exception) and isinstance(behavioral, Exception):
+        raise technical
+    
+    metadata = InterviewGenerationMetadata(
+        technical=_generation_result(technical, technical_ms),
+        behavioral=_generation_result(behavioral, behavioral_ms),
+        total_ms=round(total_ms, 1),
+    )
+    for category, result in (('technical', metadata.technical), ('behavioral', metadata.behavioral)):
+        if result.status == 'failed':
+            logging.getLogger(__name__).warning(f"{category.capitalize()} question generation failed: {result.error}")
+    technical_questions = [] if isinstance(technical, Exception) else technical
+    behavioral_questions = [] if isinstance(behavioral, Exception) else behavioral
+    
+    # Ensure we have at least some questions
+    if not technical_questions and not behavioral_questions:
+        raise HTTPException(
+            status_code=500,
+            detail="Unable to generate interview questions. Please try again or refine your input."
+        )
+    
+    return InterviewQuestionsResponse(
+        technical_questions=technical_questions,
+        behavioral_questions=behavioral_questions,
+        metadata=metadata,
+    )
+
+
+async def stream_category(
+    category: str,
+    prompt: str,
+    count: int,
+    fallback_answer: str,
+    emit: Callable[[bytes], Awaitable[None]],
+) -> InterviewGenerationResult:
+    """
+    Stream one set of questions, emitting each as soon as it is complete.
+    
+    Each array element in the model output is sent as a ``question`` event
+    when its closing brace arrives. If the output is not a JSON array, the
+    full text is parsed with the same fallback as the non-streaming path.
+    Failures are sent as an ``error`` event rather than raised.
+    
+    Args:
+        category: 'technical' or 'behavioral'
+        prompt: Generation prompt
+        count: Maximum number of questions to emit
+        fallback_answer: Answer used by the plain-text fallback parser
+        emit: Coroutine that sends one encoded event
+        
+    Returns:
+        Status and timing for the response metadata
+    """
+    started = time.perf_counter()
+    first_question_ms = None
+    emitted = 0
+    
+    async def send(question: InterviewQuestion) -> None:
+        nonlocal emitted, first_question_ms
+        if first_question_ms is None:
+            first_question_ms = round((time.perf_counter() - started) * 1000, 1)
+        await emit(format_sse('question', {'index': emitted, **question.model_dump()}))
+        emitted += 1
+    
+    try:
+        parser = JSONArrayStreamParser()
+        chunks = []
+        async for chunk in stream_gemini_api(prompt=prompt, temperature=0.7, max_tokens=8000):
+            chunks.append(chunk)
+            for element in parser.feed(chunk):
+                question = question_from_data(element, category)
+                if question is not None and emitted < count:
+                    await send(question)
+        
+        if not parser.started:
+            for question in parse_questions_response(''.join(chunks), category, count, fallback_answer):
+                await send(question)
+    except Exception as e:
+        error = redact_secrets(f"Failed to generate {category} questions: {str(e)}")
+        logging.getLogger(__name__).warning(error)
+        await emit(format_sse('error', {'category': category, 'detail': error}))
+        return InterviewGenerationResult(
+            status='failed',
+            count=emitted,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+            error=error,
+            first_question_ms=first_question_ms,
+        )
+    
+    return InterviewGenerationResult(
+        status='ok',
+        count=emitted,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        first_question_ms=first_question_ms,
+    )
+
+
+async def stream_all_questions(
+    resume_summary: str,
+    job_desc: str,
+    num_tech: int,
+    num_behavioral: int,
+) -> AsyncIterator[bytes]:
+    """
+    Generate both sets of questions concurrently as server-sent events.
+    
+    Events are ``question`` (one per question, interleaved across
+    categories as they complete), ``error`` (one per failed category) and a
+    final ``done`` carrying the generation metadata.
+    """
+    started = time.perf_counter()
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def produce(category: str, prompt: str, count: int, fallback_answer: str) -> InterviewGenerationResult:
+        try:
+            return await stream_category(category, prompt, count, fallback_answer, queue.put)
+        finally:
+            await queue.put(None)
+    
+    tasks = [
+        asyncio.create_task(produce(
+            'technical', build_technical_prompt(resume_summary, job_desc, num_tech), num_tech, TECHNICAL_FALLBACK_ANSWER
+        )),
+        asyncio.create_task(produce(
+            'behavioral', build_behavioral_prompt(resume_summary, job_desc, num_behavioral), num_behavioral, BEHAVIORAL_FALLBACK_ANSWER
+        )),
+    ]
+    try:
+        pending = len(tasks)
+        while pending:
+            event = await queue.get()
+            if event is None:
+                pending -= 1
+            else:
+                yield event
+        
+        technical, behavioral = [task.result() for task in tasks]
+        metadata = InterviewGenerationMetadata(
+            technical=technical,
+            behavioral=behavioral,
+            total_ms=round((time.perf_counter() - started) * 1000, 1),
+        )
+        yield format_sse('done', metadata.model_dump())
+    finally:
+        # Client disconnected or the stream was closed early
+        for task in tasks:
+            task.cancel()
+
+
 @router.post("/generate", response_model=InterviewQuestionsResponse)
 async def generate_interview_questions(
     request: InterviewQuestionsRequest,
-    http_request: Request
+    http_request: Request,
+    response: Response,
 ):
     """
     Generate interview questions (technical and behavioral) based on resume and job description.
@@ -365,58 +610,22 @@ async def generate_interview_questions(
     - Behavioral questions using STAR method based on resume experience
     - Suggested answers for each question
     """
-    # Check if Gemini API key is configured
-    if not settings.GEMINI_API_KEY or settings.GEMINI_API_KEY.strip() == "":
-        raise HTTPException(
-            status_code=503,
-            detail=(
-                "AI service is currently unavailable. "
-                "Please configure GEMINI_API_KEY in your environment variables."
-            )
-        )
-    
-    # Rate limiting
-    client_ip = get_client_ip(http_request)
-    is_allowed, remaining = await rate_limiter.is_allowed(client_ip)
-    
-    if not is_allowed:
-        raise HTTPException(
-            status_code=429,
-            detail=(
-                f"Rate limit exceeded. "
-                f"Limit: {rate_limiter.max_requests} requests per {rate_limiter.window_seconds} seconds. "
-                f"Please try again later."
-            )
-        )
+    limit = await check_interview_allowed(
+        http_request, interview_cost(request.numTechQuestions, request.numBehavioralQuestions)
+    )
+    response.headers.update(limit.headers)
     
     try:
         # Build resume summary
         resume_summary = build_resume_summary(request.resume)
         job_desc = request.jobDesc or ""
         
-        # Generate technical and behavioral questions
-        technical_questions = await generate_technical_questions(
-            resume_summary=resume_summary,
-            job_desc=job_desc,
-            count=request.numTechQuestions
-        )
-        
-        behavioral_questions = await generate_behavioral_questions(
+        # Generate technical and behavioral questions concurrently
+        return await generate_all_questions(
             resume_summary=resume_summary,
             job_desc=job_desc,
-            count=request.numBehavioralQuestions
-        )
-        
-        # Ensure we have at least some questions
-        if not technical_questions and not behavioral_questions:
-            raise HTTPException(
-                status_code=500,
-                detail="Unable to generate interview questions. Please try again or refine your input."
-            )
-        
-        return InterviewQuestionsResponse(
-            technical_questions=technical_questions,
-            behavioral_questions=behavioral_questions
+            num_tech=request.numTechQuestions,
+            num_behavioral=request.numBehavioralQuestions,
         )
         
     except HTTPException:
@@ -424,10 +633,8 @@ async def generate_interview_questions(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        error_message = str(e)
         # Never expose API key
-        if settings.GEMINI_API_KEY and settings.GEMINI_API_KEY in error_message:
-            error_message = error_message.replace(settings.GEMINI_API_KEY, "[REDACTED]")
+        error_message = redact_secrets(str(e))
         raise HTTPException(
             status_code=500,
             detail=f"An error occurred while generating questions: {error_message}"
@@ -437,6 +644,7 @@ async def generate_interview_questions(
 @router.post("/generate-file", response_model=InterviewQuestionsResponse)
 async def generate_interview_questions_from_file(
     http_request: Request,
+    response: Response,
     file: UploadFile = File(...),
     jobDesc: str | None = Form(None),
     numTechQuestions: int = Form(5),
@@ -445,28 +653,12 @@ async def generate_interview_questions_from_file(
     """
     Generate interview questions using an uploaded resume file (PDF/DOCX) and optional job description.
     """
-    # Check AI availability
-    if not settings.GEMINI_API_KEY or settings.GEMINI_API_KEY.strip() == "":
-        raise HTTPException(
-            status_code=503,
-            detail=(
-                "AI service is currently unavailable. "
-                "Please configure GEMINI_API_KEY in your environment variables."
-            )
-        )
+    # Validate question counts
+    numTechQuestions = max(1, min(20, numTechQuestions))  # Clamp between 1-20
+    numBehavioralQuestions = max(1, min(20, numBehavioralQuestions))  # Clamp between 1-20
 
-    # Rate limiting
-    client_ip = get_client_ip(http_request)
-    is_allowed, _remaining = await rate_limiter.is_allowed(client_ip)
-    if not is_allowed:
-        raise HTTPException(
-            status_code=429,
-            detail=(
-                f"Rate limit exceeded. "
-                f"Limit: {rate_limiter.max_requests} requests per {rate_limiter.window_seconds} seconds. "
-                f"Please try again later."
-            )
-        )
+    limit = await check_interview_allowed(http_request, interview_cost(numTechQuestions, numBehavioralQuestions))
+    response.headers.update(limit.headers)
 
     # Validate and read file
     allowed_types = [
@@ -488,7 +680,12 @@ async def generate_interview_questions_from_file(
 
     # Parse file to text
     try:
-        resume_text = await parse_resume_file(file_content, file_type or file_ext)
+        # Extract one character past the cap so truncation can still be reported
+        resume_text = await parse_resume_file(
+            file_content, file_type or file_ext, max_chars=MAX_RESUME_FILE_CHARS + 1
+        )
+    except ParserBusyError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -497,37 +694,54 @@ async def generate_interview_questions_from_file(
     if not resume_text or len(resume_text.strip()) < 50:
         raise HTTPException(status_code=400, detail="Unable to extract sufficient text from the resume file.")
 
-    # Validate question counts
-    numTechQuestions = max(1, min(20, numTechQuestions))  # Clamp between 1-20
-    numBehavioralQuestions = max(1, min(20, numBehavioralQuestions))  # Clamp between 1-20
-
-    # Build prompts using ALL resume text (increase limit to 20000 chars for comprehensive resumes)
+    # Build prompts using ALL resume text (up to MAX_RESUME_FILE_CHARS for comprehensive resumes)
     # Most resumes are under 20000 chars, but we keep a safety cap
-    resume_summary = f"Complete Resume Content (all text extracted from file):\n{resume_text[:20000]}"
-    if len(resume_text) > 20000:
-        resume_summary += f"\n\n[Note: Resume content truncated at 20000 characters. Total length: {len(resume_text)} characters]"
+    resume_summary = f"Complete Resume Content (all text extracted from file):\n{resume_text[:MAX_RESUME_FILE_CHARS]}"
+    if len(resume_text) > MAX_RESUME_FILE_CHARS:
+        resume_summary += f"\n\n[Note: Resume content truncated at {MAX_RESUME_FILE_CHARS} characters]"
     
     job_desc = (jobDesc or "").strip()
 
-    # Generate questions
+    # Generate technical and behavioral questions concurrently
     try:
-        technical_questions = await generate_technical_questions(
+        return await generate_all_questions(
             resume_summary=resume_summary,
             job_desc=job_desc,
-            count=numTechQuestions,
-        )
-        behavioral_questions = await generate_behavioral_questions(
-            resume_summary=resume_summary,
-            job_desc=job_desc,
-            count=numBehavioralQuestions,
-        )
-        return InterviewQuestionsResponse(
-            technical_questions=technical_questions,
-            behavioral_questions=behavioral_questions,
+            num_tech=numTechQuestions,
+            num_behavioral=numBehavioralQuestions,
         )
+    except HTTPException:
+        raise
     except Exception as e:
-        error_message = str(e)
-        if settings.GEMINI_API_KEY and settings.GEMINI_API_KEY in error_message:
-            error_message = error_message.replace(settings.GEMINI_API_KEY, "[REDACTED]")
+        error_message = redact_secrets(str(e))
         raise HTTPException(status_code=500, detail=f"An error occurred while generating questions: {error_message}")
 
+
+@router.post("/generate-stream")
+async def generate_interview_questions_stream(
+    request: InterviewQuestionsRequest,
+    http_request: Request
+):
+    """
+    Stream interview questions as server-sent events.
+    
+    Same input as /generate. Each question is sent as a ``question`` event as
+    soon as the model has finished writing it, so the first questions are
+    shown while the rest are still being generated. Failures of either
+    category are sent as ``error`` events and the stream ends with ``done``.
+    """
+    limit = await check_interview_allowed(
+        http_request, interview_cost(request.numTechQuestions, request.numBehavioralQuestions)
+    )
+    
+    resume_summary = build_resume_summary(request.resume)
+    return StreamingResponse(
+        stream_all_questions(
+            resume_summary=resume_summary,
+            job_desc=request.jobDesc or "",
+            num_tech=request.numTechQuestions,
+            num_behavioral=request.numBehavioralQuestions,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **limit.headers},
+    )
@@ -1,16 +1,22 @@
 """Resume CRUD router."""
-from fastapi import APIRouter, HTTPException, status
-from app.schemas import ResumeCreate, ResumeResponse
-from app.db import get_collection
+from typing import Any, Dict, List, Union
+from fastapi import APIRouter, Body, HTTPException, status
+from app.schemas import ResumeCreate, ResumeResponse, ResumePatchOperation
+from app.db import get_collection, report_db_error
 from app.utils import sanitize_resume_data
+from app.utils_resume import build_resume_patch
 from bson import ObjectId
 from bson.errors import InvalidId
 from datetime import datetime
 from pydantic import ValidationError
+from pymongo import ReturnDocument
 
 
 router = APIRouter()
 
+# Most operations (or merge-patch fields) accepted in one PATCH request
+MAX_PATCH_OPERATIONS = 100
+
 
 def validate_object_id(resume_id: str) -> ObjectId:
     """
@@ -42,7 +48,7 @@ def check_database_configured(collection) -> None:
         collection: Collection instance (may be None)
     
     Raises:
-        HTTPException: If database is not configured (501)
+        HTTPException: If database is not configured (501) or not connected (503)
     """
     from app.config import settings
     
@@ -58,17 +64,37 @@ def check_database_configured(collection) -> None:
                 )
             )
         else:
-            # MONGODB_URI is set but connection failed
+            # MONGODB_URI is set but not connected (yet); fail fast while it connects in the background
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail=(
                     "Unable to connect to database. "
                     "Please check that MongoDB is running and MONGODB_URI is correct. "
                     "For local development, ensure MongoDB is started with: docker compose up -d"
-                )
+                ),
+                headers={"Retry-After": "5"},
             )
 
 
+def database_error(e: Exception, action: str) -> HTTPException:
+    """
+    Map a failed database operation to an HTTP error.
+    
+    Connection failures mark the database unavailable (so later requests
+    fail fast) and become 503; anything else is a 500.
+    """
+    if report_db_error(e):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database is temporarily unavailable. Please try again later.",
+            headers={"Retry-After": "5"},
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"Error {action}: {str(e)}"
+    )
+
+
 def convert_doc_to_response(doc: dict) -> ResumeResponse:
     """
     Convert MongoDB document to ResumeResponse.
@@ -108,7 +134,8 @@ async def create_resume(resume: ResumeCreate):
     Create a new resume.
     
     Stores the resume in MongoDB collection 'resumes' with created_at and updated_at timestamps.
-    Returns the created resume with its generated ID.
+    Returns the created resume with its generated ID. The response is built from the
+    inserted document, so this is a single database round-trip.
     """
     collection = await get_collection("resumes")
     check_database_configured(collection)
@@ -128,26 +155,15 @@ async def create_resume(resume: ResumeCreate):
         # Insert into database
         result = await collection.insert_one(resume_dict)
         
-        # Fetch the created document
-        created_doc = await collection.find_one({"_id": result.inserted_id})
-        
-        if not created_doc:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to retrieve created resume"
-            )
-        
-        # Convert to response
-        return convert_doc_to_response(created_doc)
+        # The stored document is exactly what was sent; no need to read it back
+        resume_dict["_id"] = result.inserted_id
+        return convert_doc_to_response(resume_dict)
         
     except HTTPException:
         # Re-raise HTTP exceptions (they're already properly formatted)
         raise
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error creating resume: {str(e)}"
-        )
+        raise database_error(e, "creating resume")
 
 
 @router.get("/{resume_id}", response_model=ResumeResponse)
@@ -187,10 +203,7 @@ async def get_resume(resume_id: str):
         # Re-raise HTTP exceptions (404, etc.)
         raise
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error retrieving resume: {str(e)}"
-        )
+        raise database_error(e, "retrieving resume")
 
 
 @router.put("/{resume_id}", response_model=ResumeResponse)
@@ -198,6 +211,9 @@ async def update_resume(resume_id: str, resume: ResumeCreate):
     """
     Update an existing resume.
     
+    Replaces the resume fields and returns the updated document in a single
+    atomic round-trip; created_at is left untouched.
+    
     Args:
         resume_id: MongoDB ObjectId of the resume to update
         resume: Updated resume data
@@ -215,45 +231,28 @@ async def update_resume(resume_id: str, resume: ResumeCreate):
     object_id = validate_object_id(resume_id)
     
     try:
-        # Check if resume exists
-        existing_doc = await collection.find_one({"_id": object_id})
-        if not existing_doc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Resume with ID '{resume_id}' not found"
-            )
-        
         # Convert resume to dictionary
         resume_dict = resume.model_dump()
         
         # Sanitize resume data before storing
         resume_dict = sanitize_resume_data(resume_dict)
         
-        # Update timestamp (preserve created_at)
+        # Update timestamp; created_at is not in $set, so it is preserved
         resume_dict["updated_at"] = datetime.utcnow()
-        resume_dict["created_at"] = existing_doc.get("created_at", datetime.utcnow())
         
-        # Update document
-        result = await collection.update_one(
+        # Update and read back in one round-trip
+        updated_doc = await collection.find_one_and_update(
             {"_id": object_id},
-            {"$set": resume_dict}
+            {"$set": resume_dict},
+            return_document=ReturnDocument.AFTER,
         )
         
-        if result.matched_count == 0:
+        if not updated_doc:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Resume with ID '{resume_id}' not found"
             )
         
-        # Fetch updated document
-        updated_doc = await collection.find_one({"_id": object_id})
-        
-        if not updated_doc:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to retrieve updated resume"
-            )
-        
         # Convert to response
         return convert_doc_to_response(updated_doc)
         
@@ -261,10 +260,131 @@ async def update_resume(resume_id: str, resume: ResumeCreate):
         # Re-raise HTTP exceptions (404, etc.)
         raise
     except Exception as e:
+        raise database_error(e, "updating resume")
+
+
+@router.patch("/{resume_id}", response_model=ResumeResponse)
+async def patch_resume(
+    resume_id: str,
+    patch: Union[List[ResumePatchOperation], Dict[str, Any]] = Body(...),
+):
+    """
+    Apply a partial update to a resume.
+    
+    Accepts either a JSON Patch (RFC 6902) array of add/replace/remove/test
+    operations, or a field-path merge patch: an object mapping field paths
+    to new values (``{"experience.2.description": "..."}``). Only the
+    changed parts are validated and written, as targeted $set/$push/$pull
+    operators in one atomic update. Removing a list item takes one extra
+    read to find the item's id.
+    
+    Args:
+        resume_id: MongoDB ObjectId of the resume to patch
+        patch: Patch operations or field-path merge patch
+    
+    Returns:
+        ResumeResponse with updated resume data
+    
+    Raises:
+        HTTPException: 400 if the ID or patch is invalid, 404 if not found,
+            409 if a test fails or an index is out of range, 501 if DB not configured
+    """
+    collection = await get_collection("resumes")
+    check_database_configured(collection)
+    
+    # Validate ObjectId format
+    object_id = validate_object_id(resume_id)
+    
+    if isinstance(patch, dict):
+        changes = [("replace", path, value) for path, value in patch.items()]
+    else:
+        changes = [(operation.op, operation.path, operation.value) for operation in patch]
+    if not changes:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Patch is empty")
+    if len(changes) > MAX_PATCH_OPERATIONS:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error updating resume: {str(e)}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Patch has more than {MAX_PATCH_OPERATIONS} operations"
         )
+    
+    try:
+        resume_patch = build_resume_patch(changes)
+    except ValueError as e:
+        # Includes pydantic ValidationError
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    not_applicable = HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=(
+            "Patch does not apply to the current resume (a test failed, an index is out of range, "
+            "or the item to remove shares its id with another item)"
+        )
+    )
+    
+    try:
+        query = {"_id": object_id}
+        conditions = list(resume_patch.conditions)
+        update = {"$set": {**resume_patch.set, "updated_at": datetime.utcnow()}}
+        if resume_patch.push:
+            update["$push"] = resume_patch.push
+        
+        if resume_patch.remove:
+            # Look up the ids of the items to remove. $pull removes every item
+            # matching the id, so the filter below makes sure each item is
+            # still at its position and is the only one with that id.
+            projection = {"_id": 1}
+            projection.update({
+                section: {"$slice": [index, 1]} for section, index in resume_patch.remove.items()
+            })
+            doc = await collection.find_one(query, projection)
+            if not doc:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Resume with ID '{resume_id}' not found"
+                )
+            pull = {}
+            for section, index in resume_patch.remove.items():
+                items = doc.get(section) or []
+                if not items or not isinstance(items[0], dict) or "id" not in items[0]:
+                    raise not_applicable
+                item_id = items[0]["id"]
+                conditions.append({f"{section}.{index}.id": {"$eq": item_id}})
+                conditions.append({"$expr": {"$eq": [
+                    {"$size": {"$filter": {
+                        "input": f"${section}",
+                        "cond": {"$eq": ["$$this.id", {"$literal": item_id}]},
+                    }}},
+                    1,
+                ]}})
+                pull[section] = {"id": {"$eq": item_id}}
+            update["$pull"] = pull
+        
+        if conditions:
+            query["$and"] = conditions
+        
+        updated_doc = await collection.find_one_and_update(
+            query,
+            update,
+            return_document=ReturnDocument.AFTER,
+        )
+        
+        if not updated_doc:
+            # Tell a missing resume apart from a patch that does not apply
+            if not await collection.find_one({"_id": object_id}, {"_id": 1}):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Resume with ID '{resume_id}' not found"
+                )
+            raise not_applicable
+        
+        # Convert to response
+        return convert_doc_to_response(updated_doc)
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions (404, 409)
+        raise
+    except Exception as e:
+        raise database_error(e, "patching resume")
 
 
 @router.delete("/{resume_id}", status_code=status.HTTP_200_OK)
@@ -306,7 +426,4 @@ async def delete_resume(resume_id: str):
         # Re-raise HTTP exceptions (404, etc.)
         raise
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error deleting resume: {str(e)}"
-        )
+        raise database_error(e, "deleting resume")
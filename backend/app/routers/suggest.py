@@ -1,14 +1,18 @@
 """Suggestion router for AI-powered resume suggestions."""
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from app.schemas import SuggestRequest, SuggestResponse
-from app.config import settings
-from app.gemini_client import generate_suggestions
-from app.rate_limiter import rate_limiter
-from typing import List
+from app.gemini_client import gemini_configured, gemini_pool, generate_suggestions, stream_suggestions
+from app.rate_limiter import RateLimitResult, rate_limiter
+from app.utils_stream import format_sse
+from typing import AsyncIterator, List
 
 
 router = APIRouter()
 
+# Rate-limit tokens charged per suggestion request (one short Gemini call)
+SUGGEST_COST = 1
+
 
 def get_client_ip(http_request: Request) -> str:
     """Extract client IP address from request."""
@@ -30,43 +34,105 @@ def get_client_ip(http_request: Request) -> str:
     return "unknown"
 
 
-@router.post("/", response_model=SuggestResponse)
-async def get_suggestions(request: SuggestRequest, http_request: Request):
+async def check_suggest_allowed(http_request: Request) -> RateLimitResult:
     """
-    Get AI-powered suggestions for resume content.
+    Check that the AI service is configured and the client is within its rate limit.
     
-    This endpoint uses Gemini API to generate suggestions for improving
-    resume content based on the task type.
+    Returns:
+        The rate-limit result, whose headers should be sent with the response
     
-    - bullet: Convert responsibility to 2-4 STAR-style bullets
-    - summary: Generate 2-3 line summary tailored to role/level
-    - skills: Return categorized skills
-    - rewrite: Grammar/tone improvement
+    Raises:
+        HTTPException: 503 if Gemini is not configured, 429 if rate limited
     """
-    # Check if Gemini API key is configured
-    if not settings.GEMINI_API_KEY or settings.GEMINI_API_KEY.strip() == "":
+    # Check that Gemini credentials are configured
+    if not gemini_configured():
         raise HTTPException(
             status_code=503,
             detail=(
                 "AI service is currently unavailable. "
-                "Please configure GEMINI_API_KEY in your environment variables. "
+                "Please configure GEMINI_API_KEY or GEMINI_API_KEYS (or GOOGLE_APPLICATION_CREDENTIALS) "
+                "in your environment variables. "
                 "See backend/README_ENV.md for setup instructions."
             )
         )
     
     # Rate limiting per IP (async)
     client_ip = get_client_ip(http_request)
-    is_allowed, remaining = await rate_limiter.is_allowed(client_ip)
+    limit = await rate_limiter.check(client_ip, SUGGEST_COST)
     
-    if not is_allowed:
+    if not limit.allowed:
         raise HTTPException(
             status_code=429,
             detail=(
                 f"Rate limit exceeded. "
                 f"Limit: {rate_limiter.max_requests} requests per {rate_limiter.window_seconds} seconds. "
                 f"Please try again later."
-            )
+            ),
+            headers=limit.headers,
+        )
+    return limit
+
+
+# Returned when Gemini produces no usable suggestions
+FALLBACK_SUGGESTION = "Unable to generate suggestions. Please try again or refine your input."
+
+
+def suggestion_error(e: Exception) -> HTTPException:
+    """Map a suggestion generation error to a client-safe HTTP error."""
+    if isinstance(e, ValueError):
+        # Configuration errors (e.g., missing API key)
+        error_msg = str(e)
+        # Never expose API key in error messages
+        if "GEMINI_API_KEY" in error_msg or "API key" in error_msg:
+            error_msg = "AI service configuration error. Please contact support."
+        return HTTPException(
+            status_code=503,
+            detail=f"Service configuration error: {error_msg}"
+        )
+    
+    # API errors or other exceptions
+    error_message = str(e)
+    
+    # Never expose API keys in error messages
+    for api_key in gemini_pool.secrets:
+        error_message = error_message.replace(api_key, "[REDACTED]")
+    
+    # Check for specific error types
+    if "Gemini API error" in error_message or "API" in error_message:
+        # Gemini API returned an error - don't expose internal details
+        return HTTPException(
+            status_code=503,
+            detail="AI service is currently unavailable. Please try again later."
         )
+    elif "Network error" in error_message or "connection" in error_message.lower():
+        # Network/connection error
+        return HTTPException(
+            status_code=503,
+            detail="Unable to connect to AI service. Please try again later."
+        )
+    else:
+        # Unknown error - don't expose internal details
+        return HTTPException(
+            status_code=500,
+            detail="An error occurred while processing your request. Please try again later."
+        )
+
+
+@router.post("/", response_model=SuggestResponse)
+async def get_suggestions(request: SuggestRequest, http_request: Request, response: Response):
+    """
+    Get AI-powered suggestions for resume content.
+    
+    This endpoint uses Gemini API to generate suggestions for improving
+    resume content based on the task type.
+    
+    - bullet: Convert responsibility to 2-4 STAR-style bullets
+    - summary: Generate 2-3 line summary tailored to role/level
+    - skills: Return categorized skills
+    - rewrite: Grammar/tone improvement
+    """
+    limit = await check_suggest_allowed(http_request)
+    response.headers.update(limit.headers)
     
     try:
         # Generate suggestions using Gemini API
@@ -77,66 +143,87 @@ async def get_suggestions(request: SuggestRequest, http_request: Request):
             level=request.level,
             job_desc=request.jobDesc,
             count=request.count,
+            use_cache=not request.fresh,
         )
         
         # Ensure we have at least one suggestion
         if not suggestions:
-            suggestions = [
-                "Unable to generate suggestions. Please try again or refine your input."
-            ]
+            suggestions = [FALLBACK_SUGGESTION]
         
         return SuggestResponse(suggestions=suggestions)
         
-    except ValueError as e:
-        # Configuration errors (e.g., missing API key)
-        error_msg = str(e)
-        # Never expose API key in error messages
-        if "GEMINI_API_KEY" in error_msg or "API key" in error_msg:
-            error_msg = "AI service configuration error. Please contact support."
-        raise HTTPException(
-            status_code=503,
-            detail=f"Service configuration error: {error_msg}"
-        )
     except Exception as e:
-        # API errors or other exceptions
-        error_message = str(e)
-        
-        # Never expose API key in error messages
-        if settings.GEMINI_API_KEY and settings.GEMINI_API_KEY in error_message:
-            error_message = error_message.replace(settings.GEMINI_API_KEY, "[REDACTED]")
-        
-        # Check for specific error types
-        if "Gemini API error" in error_message or "API" in error_message:
-            # Gemini API returned an error - don't expose internal details
-            raise HTTPException(
-                status_code=503,
-                detail="AI service is currently unavailable. Please try again later."
-            )
-        elif "Network error" in error_message or "connection" in error_message.lower():
-            # Network/connection error
-            raise HTTPException(
-                status_code=503,
-                detail="Unable to connect to AI service. Please try again later."
-            )
-        else:
-            # Unknown error - don't expose internal details
-            raise HTTPException(
-                status_code=500,
-                detail="An error occurred while processing your request. Please try again later."
-            )
+        raise suggestion_error(e)
+
+
+async def _suggestion_events(first: str, suggestions: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Encode streamed suggestions as server-sent events, ending with ``done``."""
+    index = 0
+    try:
+        yield format_sse("suggestion", {"index": index, "text": first})
+        async for suggestion in suggestions:
+            index += 1
+            yield format_sse("suggestion", {"index": index, "text": suggestion})
+    except Exception as e:
+        # Headers are already sent; report the failure in-band
+        error = suggestion_error(e)
+        yield format_sse("error", {"status": error.status_code, "detail": error.detail})
+    finally:
+        await suggestions.aclose()
+    yield format_sse("done", {"count": index + 1})
+
+
+@router.post("/stream")
+async def stream_suggestions_endpoint(request: SuggestRequest, http_request: Request):
+    """
+    Stream suggestions as server-sent events.
+    
+    Same input as the suggestions endpoint. Each cleaned suggestion is sent
+    as a ``suggestion`` event as soon as its line of the response is
+    complete, followed by a final ``done`` event; an empty response sends the
+    fallback suggestion instead. Errors before the first
+    suggestion are returned as normal HTTP errors; later ones are sent as an
+    ``error`` event.
+    """
+    limit = await check_suggest_allowed(http_request)
+    
+    suggestions = stream_suggestions(
+        task=request.task,
+        source_text=request.sourceText,
+        role=request.role,
+        level=request.level,
+        job_desc=request.jobDesc,
+        count=request.count,
+        use_cache=not request.fresh,
+    )
+    try:
+        # Wait for the first suggestion so early failures keep their status code
+        first = await suggestions.__anext__()
+    except StopAsyncIteration:
+        # Nothing usable came back; send the same fallback as the non-streaming endpoint
+        first = FALLBACK_SUGGESTION
+    except Exception as e:
+        await suggestions.aclose()
+        raise suggestion_error(e)
+    
+    return StreamingResponse(
+        _suggestion_events(first, suggestions),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", **limit.headers},
+    )
 
 
 @router.post("/summary", response_model=SuggestResponse)
-async def suggest_summary(request: SuggestRequest, http_request: Request):
+async def suggest_summary(request: SuggestRequest, http_request: Request, response: Response):
     """Generate summary suggestions."""
     # Force task to summary
     request.task = "summary"
-    return await get_suggestions(request, http_request)
+    return await get_suggestions(request, http_request, response)
 
 
 @router.post("/bullet", response_model=SuggestResponse)
-async def suggest_bullet_points(request: SuggestRequest, http_request: Request):
+async def suggest_bullet_points(request: SuggestRequest, http_request: Request, response: Response):
     """Generate bullet point suggestions."""
     # Force task to bullet
     request.task = "bullet"
-    return await get_suggestions(request, http_request)
+    return await get_suggestions(request, http_request, response)
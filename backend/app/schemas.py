@@ -1,8 +1,9 @@
 """Pydantic schemas for request/response models."""
 from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator, ConfigDict
-from typing import List, Optional, Dict, Any
+from typing import List, Literal, Optional, Dict, Any
 from datetime import datetime
 import re
+from app.config import settings
 from app.utils import sanitize_text, sanitize_url, MAX_TEXT_LENGTH, MAX_SHORT_TEXT_LENGTH
 
 
@@ -265,6 +266,13 @@ class ResumeResponse(Resume):
     updated_at: Optional[datetime] = Field(None, description="Update timestamp")
 
 
+class ResumePatchOperation(BaseModel):
+    """A single JSON Patch (RFC 6902) operation on a stored resume."""
+    op: Literal['add', 'replace', 'remove', 'test'] = Field(..., description="Operation")
+    path: str = Field(..., min_length=1, max_length=200, description="JSON Pointer (e.g. '/experience/2/description', '/skills/-')")
+    value: Any = Field(None, description="Value for 'add', 'replace' and 'test'")
+
+
 # ============================================================================
 # Suggestion Schemas
 # ============================================================================
@@ -277,6 +285,7 @@ class SuggestRequest(BaseModel):
     sourceText: str = Field(..., min_length=1, max_length=MAX_TEXT_LENGTH, description="Source text to improve")
     jobDesc: Optional[str] = Field(None, max_length=MAX_TEXT_LENGTH, description="Job description for context")
     count: int = Field(1, ge=1, le=10, description="Number of suggestions to generate")
+    fresh: bool = Field(False, description="Skip cached suggestions and generate new ones")
 
     @field_validator('sourceText', 'jobDesc', 'role', mode='before')
     @classmethod
@@ -360,6 +369,47 @@ class ATSResponse(BaseModel):
         return v
 
 
+class ATSBatchRequest(BaseModel):
+    """Request schema for scoring many resumes against one job description."""
+    resumes: List[Resume] = Field(..., max_length=settings.ATS_BATCH_MAX_RESUMES, description="Resumes to score")
+    jobDesc: Optional[str] = Field(None, max_length=MAX_TEXT_LENGTH, description="Job description for comparison")
+
+    @field_validator('jobDesc', mode='before')
+    @classmethod
+    def sanitize_job_desc(cls, v):
+        """Sanitize job description field."""
+        if v is None:
+            return None
+        return sanitize_text(str(v), MAX_TEXT_LENGTH)
+
+
+class ATSFieldChange(BaseModel):
+    """A single field-level change to a resume in a scoring session."""
+    path: str = Field(..., min_length=1, max_length=200, description="Field path (e.g. 'summary', 'experience.2.description', 'skills.4')")
+    op: Literal['set', 'remove'] = Field('set', description="Operation ('remove' applies to list items)")
+    value: Any = Field(None, description="New value for 'set'")
+
+
+class ATSSessionUpdate(BaseModel):
+    """Request schema for incremental ATS rescoring."""
+    changes: List[ATSFieldChange] = Field(default_factory=list, max_length=100, description="Changes applied in order")
+    jobDesc: Optional[str] = Field(None, max_length=MAX_TEXT_LENGTH, description="New job description (omit to keep the current one)")
+
+    @field_validator('jobDesc', mode='before')
+    @classmethod
+    def sanitize_job_desc(cls, v):
+        """Sanitize job description field."""
+        if v is None:
+            return None
+        return sanitize_text(str(v), MAX_TEXT_LENGTH)
+
+
+class ATSSessionResponse(ATSResponse):
+    """Response schema for incremental ATS scoring sessions."""
+    sessionId: str = Field(..., description="Scoring session ID")
+    recomputed: List[str] = Field(default_factory=list, description="Categories recomputed for this request")
+
+
 # ============================================================================
 # Legacy/Backward Compatibility Schemas
 # ============================================================================
@@ -435,7 +485,24 @@ class InterviewQuestionsRequest(BaseModel):
         return sanitize_text(str(v), MAX_TEXT_LENGTH)
 
 
+class InterviewGenerationResult(BaseModel):
+    """Outcome and timing of one question-generation call."""
+    status: Literal['ok', 'failed'] = Field(..., description="Whether this set of questions was generated")
+    count: int = Field(0, ge=0, description="Number of questions returned")
+    elapsed_ms: float = Field(..., ge=0, description="Time spent on this call in milliseconds")
+    error: Optional[str] = Field(None, description="Error message if the call failed")
+    first_question_ms: Optional[float] = Field(None, ge=0, description="Time to the first streamed question in milliseconds")
+
+
+class InterviewGenerationMetadata(BaseModel):
+    """Per-call status and timing for interview question generation."""
+    technical: InterviewGenerationResult
+    behavioral: InterviewGenerationResult
+    total_ms: float = Field(..., ge=0, description="Wall-clock time for both calls in milliseconds")
+
+
 class InterviewQuestionsResponse(BaseModel):
     """Response schema for interview questions."""
     technical_questions: List[InterviewQuestion] = Field(default_factory=list, description="Technical questions")
     behavioral_questions: List[InterviewQuestion] = Field(default_factory=list, description="Behavioral questions")
+    metadata: Optional[InterviewGenerationMetadata] = Field(None, description="Generation status and timing per call")
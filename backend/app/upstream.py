@@ -0,0 +1,377 @@
+"""Concurrency, retry and circuit-breaker policy for calls to an upstream API."""
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional
+import httpx
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying, and the subset that means "slow down"
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+THROTTLE_STATUS = frozenset({429, 503})
+
+# Failures where the request never reached the model, so a retry cannot duplicate work
+RETRYABLE_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError)
+
+
+class UpstreamUnavailableError(Exception):
+    """Raised without calling upstream while the circuit breaker is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(
+            f"{name} is temporarily unavailable after repeated failures; "
+            f"retry in {retry_after:.0f}s"
+        )
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait (never negative), or None if absent or unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    max_delay: float,
+    retry_after: Optional[float] = None,
+) -> Optional[float]:
+    """
+    Delay before retry number ``attempt`` (0-based), using full jitter.
+
+    A server-provided Retry-After is treated as a minimum. If it is longer
+    than ``max_delay`` the request is not retried, since holding a client
+    request that long is worse than failing it.
+
+    Returns:
+        Seconds to sleep, or None if the request should not be retried
+    """
+    if retry_after is not None and retry_after > max_delay:
+        return None
+    delay = random.uniform(0, min(max_delay, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted by additive-increase/multiplicative-decrease.
+
+    Every successful call raises the limit by ``1 / limit`` (about +1 per
+    round of calls); a throttling response multiplies it by
+    ``decrease_ratio``, at most once per ``decrease_cooldown`` seconds so a
+    burst of simultaneous 429s counts as one signal. Callers over the limit
+    wait in FIFO order.
+    """
+
+    def __init__(
+        self,
+        initial: int,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_ratio: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.decrease_ratio = decrease_ratio
+        self.decrease_cooldown = decrease_cooldown
+        self.in_flight = 0
+        self.throttled = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = float('-inf')
+
+    @property
+    def max_in_flight(self) -> int:
+        return int(self.limit)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot."""
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # A slot was handed over just as we were cancelled
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """Free a slot and hand it to the next waiter."""
+        self.in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < self.max_in_flight:
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold one slot for the duration of the block."""
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def on_success(self) -> None:
+        """Additive increase."""
+        self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        self._wake()
+
+    def on_throttle(self) -> None:
+        """Multiplicative decrease."""
+        self.throttled += 1
+        now = time.monotonic()
+        if now - self._last_decrease < self.decrease_cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_ratio)
+        logger.warning(f"Upstream throttling; concurrency limit lowered to {self.max_in_flight}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'limit': self.max_in_flight,
+            'in_flight': self.in_flight,
+            'waiting': sum(1 for future in self._waiters if not future.done()),
+            'throttled': self.throttled,
+        }
+
+
+class CircuitBreaker:
+    """
+    Fail fast after consecutive failures.
+
+    After ``failure_threshold`` failed calls in a row the circuit opens and
+    calls are rejected for ``reset_timeout`` seconds. Then one probe call is
+    let through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int, reset_timeout: float, name: str = "upstream"):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.failures = 0
+        self.opened = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def before_call(self) -> None:
+        """
+        Admit a call or reject it.
+
+        Raises:
+            UpstreamUnavailableError: While open, or while a half-open probe is running
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+        raise UpstreamUnavailableError(self.name, max(1.0, remaining))
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info(f"{self.name} circuit closed")
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or (self._opened_at is None and self.failures >= self.failure_threshold):
+            if self._opened_at is None:
+                self.opened += 1
+                logger.error(f"{self.name} circuit opened after {self.failures} consecutive failures")
+            self._opened_at = time.monotonic()
+        self._probing = False
+
+    def abandon(self) -> None:
+        """Release a half-open probe whose outcome will never be recorded."""
+        self._probing = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'state': self.state,
+            'consecutive_failures': self.failures,
+            'times_opened': self.opened,
+        }
+
+
+class UpstreamGovernor:
+    """Apply the circuit breaker, adaptive concurrency limit and retries to upstream calls."""
+
+    def __init__(
+        self,
+        limiter: AdaptiveLimiter,
+        breaker: CircuitBreaker,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+    ):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retries = 0
+
+    @asynccontextmanager
+    async def call(self, send: Callable[[], Awaitable[httpx.Response]]) -> AsyncIterator[httpx.Response]:
+        """
+        Send a request under the governor's policies.
+
+        Retryable responses (429/5xx) and connection failures are retried
+        with jittered exponential backoff; the concurrency slot is released
+        while backing off. The final response is yielded with its slot still
+        held, so streamed bodies count against the limit until the block exits.
+
+        Args:
+            send: Issues one attempt of the request
+
+        Yields:
+            The final response (possibly an error status the caller should raise)
+
+        Raises:
+            UpstreamUnavailableError: If the circuit is open
+            httpx.TransportError: If the last attempt failed to get a response
+        """
+        self.breaker.before_call()
+        outcome_recorded = False
+        try:
+            attempt = 0
+            while True:
+                await self.limiter.acquire()
+                try:
+                    response = await send()
+                    error = None
+                except httpx.TransportError as e:
+                    response, error = None, e
+                except BaseException:
+                    self.limiter.release()
+                    raise
+
+                if response is not None and response.status_code not in RETRYABLE_STATUS:
+                    self.limiter.on_success()
+                    self.breaker.record_success()
+                    outcome_recorded = True
+                    try:
+                        yield response
+                    finally:
+                        self.limiter.release()
+                    return
+
+                self.limiter.release()
+                retry_after = None
+                if response is not None:
+                    if response.status_code in THROTTLE_STATUS:
+                        self.limiter.on_throttle()
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+                delay = None
+                if attempt < self.max_retries and (error is None or isinstance(error, RETRYABLE_ERRORS)):
+                    delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+                if delay is None:
+                    self.breaker.record_failure()
+                    outcome_recorded = True
+                    if error is not None:
+                        raise error
+                    yield response
+                    return
+
+                status = response.status_code if response is not None else error.__class__.__name__
+                logger.warning(f"Upstream call failed ({status}); retry {attempt + 1} in {delay:.2f}s")
+                if response is not None:
+                    await response.aclose()
+                self.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+        finally:
+            if not outcome_recorded:
+                self.breaker.abandon()
+
+    async def request(self, send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """Send a non-streaming request under the governor's policies (see call)."""
+        async with self.call(send) as response:
+            return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Return circuit, concurrency and retry state."""
+        return {
+            'circuit': self.breaker.stats(),
+            'concurrency': self.limiter.stats(),
+            'retries': self.retries,
+        }
+
+
+def create_gemini_governor() -> UpstreamGovernor:
+    """Create the governor for Gemini calls from settings."""
+    return UpstreamGovernor(
+        limiter=AdaptiveLimiter(
+            initial=settings.GEMINI_CONCURRENCY_INITIAL,
+            min_limit=settings.GEMINI_CONCURRENCY_MIN,
+            max_limit=settings.GEMINI_CONCURRENCY_MAX,
+        ),
+        breaker=CircuitBreaker(
+            failure_threshold=settings.GEMINI_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.GEMINI_CIRCUIT_RESET_SECONDS,
+            name="Gemini API",
+        ),
+        max_retries=settings.GEMINI_MAX_RETRIES,
+        backoff_base=settings.GEMINI_BACKOFF_BASE_SECONDS,
+        backoff_max=settings.GEMINI_BACKOFF_MAX_SECONDS,
+    )
+
+
+gemini_governor = create_gemini_governor()
@@ -2,6 +2,16 @@
 from typing import Dict, List, Any, Set, Optional
 import re
 from app.schemas import Resume, Experience, Achievement
+from app.utils_text import (
+    STOP_WORDS as BASE_STOP_WORDS,
+    ATS_100_METRIC_KINDS,
+    TECHNICAL_TERMS,
+    TextStats,
+    ResumeAnalysis,
+    get_job_index,
+    analyze_text,
+    analyze_resume_text,
+)
 
 # ============================================================================
 # ATS Scoring Constants (100-point system)
@@ -17,59 +27,6 @@ POINTS_FILE_OPT = 5        # File Optimization (not scored in API)
 POINTS_CONTACT = 5         # Contact Information Quality
 POINTS_JOB_RELEVANCE = 10  # Job-Relevance Score
 
-# Action verbs for Experience Strength scoring
-ACTION_VERBS = {
-    'achieved', 'acted', 'adapted', 'administered', 'advanced', 'advised', 'allocated',
-    'analyzed', 'applied', 'appointed', 'approved', 'architected', 'assembled', 'assessed',
-    'assigned', 'attained', 'authored', 'automated', 'balanced', 'built', 'calculated',
-    'catalyzed', 'championed', 'changed', 'clarified', 'closed', 'coached', 'collaborated',
-    'collected', 'communicated', 'completed', 'composed', 'computed', 'conceived',
-    'conducted', 'configured', 'consolidated', 'constructed', 'consulted', 'contracted',
-    'contributed', 'controlled', 'converted', 'coordinated', 'created', 'critiqued',
-    'customized', 'decreased', 'delegated', 'delivered', 'demonstrated', 'designed',
-    'determined', 'developed', 'devised', 'directed', 'discovered', 'distributed',
-    'dramatized', 'drove', 'earned', 'edited', 'educated', 'elected', 'elicited',
-    'eliminated', 'emphasized', 'employed', 'enabled', 'enforced', 'engineered',
-    'enhanced', 'enlarged', 'enlisted', 'ensured', 'established', 'evaluated',
-    'examined', 'exceeded', 'executed', 'expanded', 'expedited', 'experimented',
-    'explained', 'explored', 'exported', 'extracted', 'facilitated', 'fashioned',
-    'focused', 'forecasted', 'formed', 'formulated', 'fostered', 'founded',
-    'generated', 'governed', 'grouped', 'guided', 'headed', 'helped', 'hired',
-    'honed', 'hosted', 'hypothesized', 'identified', 'illustrated', 'implemented',
-    'improved', 'increased', 'influenced', 'informed', 'initiated', 'innovated',
-    'inspected', 'inspired', 'installed', 'instituted', 'instructed', 'integrated',
-    'interpreted', 'interviewed', 'introduced', 'invented', 'investigated', 'invited',
-    'involved', 'joined', 'judged', 'justified', 'launched', 'led', 'lectured',
-    'lobbied', 'located', 'logged', 'maintained', 'managed', 'manipulated', 'mapped',
-    'marketed', 'mastered', 'matched', 'maximized', 'measured', 'mediated', 'merged',
-    'minimized', 'modeled', 'moderated', 'modernized', 'modified', 'monitored',
-    'motivated', 'moved', 'named', 'navigated', 'negotiated', 'nominated', 'operated',
-    'optimized', 'orchestrated', 'organized', 'originated', 'overhauled', 'oversaw',
-    'participated', 'partnered', 'performed', 'persuaded', 'pioneered', 'planned',
-    'positioned', 'prepared', 'presented', 'presided', 'prioritized', 'processed',
-    'produced', 'programmed', 'projected', 'promoted', 'proposed', 'proved', 'provided',
-    'publicized', 'published', 'purchased', 'pursued', 'qualified', 'quantified',
-    'questioned', 'raised', 'ran', 'ranked', 'rated', 'realized', 'received',
-    'recognized', 'recommended', 'reconciled', 'recorded', 'recruited', 'redesigned',
-    'reduced', 'referred', 'refined', 'regulated', 'reinforced', 'rejected', 'related',
-    'remedied', 'remodeled', 'reorganized', 'repaired', 'replaced', 'reported',
-    'represented', 'researched', 'resolved', 'responded', 'restored', 'restructured',
-    'retained', 'retrieved', 'revamped', 'reviewed', 'revised', 'revitalized',
-    'scheduled', 'secured', 'selected', 'separated', 'served', 'serviced', 'set',
-    'shaped', 'shared', 'showed', 'signaled', 'simplified', 'simulated', 'sold',
-    'solved', 'sorted', 'sought', 'sparked', 'sponsored', 'standardized', 'started',
-    'stimulated', 'stopped', 'strengthened', 'stressed', 'stretched', 'structured',
-    'studied', 'submitted', 'substituted', 'succeeded', 'suggested', 'summarized',
-    'supervised', 'supplied', 'supported', 'surpassed', 'surveyed', 'sustained',
-    'synthesized', 'systematized', 'tabulated', 'tailored', 'taught', 'teamed',
-    'terminated', 'tested', 'tightened', 'tolerated', 'touched', 'trained',
-    'transcended', 'transferred', 'transformed', 'translated', 'transmitted',
-    'traveled', 'treated', 'trimmed', 'tripled', 'troubleshot', 'trusted', 'turned',
-    'uncovered', 'understood', 'unified', 'united', 'unveiled', 'updated', 'upgraded',
-    'used', 'utilized', 'validated', 'valued', 'verified', 'viewed', 'visited',
-    'volunteered', 'waged', 'won', 'worked', 'wrote'
-}
-
 # Standard section names that ATS expects
 STANDARD_SECTIONS = {
     'experience', 'work experience', 'employment', 'employment history',
@@ -81,6 +38,12 @@ STANDARD_SECTIONS = {
     'summary', 'professional summary', 'profile summary', 'objective', 'career objective'
 }
 
+# Stop words excluded from keywords (slightly broader than the weighted scorer's)
+STOP_WORDS = BASE_STOP_WORDS | {'then', 'there', 'their', 'them'}
+
+# Section headings that indicate a clear hierarchy
+HIERARCHY_HEADINGS = {'experience', 'education', 'skills', 'summary', 'projects'}
+
 # Professional email patterns
 PROFESSIONAL_EMAIL_DOMAINS = {
     'gmail.com', 'yahoo.com', 'outlook.com', 'hotmail.com', 'icloud.com',
@@ -94,67 +57,17 @@ PROFESSIONAL_EMAIL_DOMAINS = {
 
 def extract_keywords(text: str, min_length: int = 3) -> Set[str]:
     """Extract keywords from text (non-stop words, minimum length)."""
-    if not text:
-        return set()
-    
-    # Convert to lowercase and split into words
-    words = re.findall(r'\b[a-z]{' + str(min_length) + r',}\b', text.lower())
-    
-    # Common stop words to exclude
-    stop_words = {
-        'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-        'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
-        'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
-        'should', 'could', 'may', 'might', 'must', 'can', 'this', 'that',
-        'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'what',
-        'which', 'who', 'when', 'where', 'why', 'how', 'all', 'each', 'every',
-        'both', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor',
-        'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just',
-        'now', 'than', 'then', 'there', 'their', 'them', 'these', 'they'
-    }
-    
-    # Filter out stop words and short words
-    keywords = {w for w in words if w not in stop_words and len(w) >= min_length}
-    return keywords
+    return analyze_text(text).keywords(min_length, STOP_WORDS)
 
 
 def count_action_verbs(text: str) -> int:
     """Count action verbs in text."""
-    if not text:
-        return 0
-    
-    words = re.findall(r'\b[a-z]+\b', text.lower())
-    verb_count = sum(1 for word in words if word in ACTION_VERBS)
-    return verb_count
+    return analyze_text(text).verb_count
 
 
 def count_quantitative_metrics(text: str) -> int:
     """Count quantitative metrics (numbers, percentages) in text."""
-    if not text:
-        return 0
-    
-    # Match numbers (integers, decimals, percentages, ratios)
-    patterns = [
-        r'\d+%',  # Percentages
-        r'\$\d+(?:,\d{3})*(?:\.\d+)?',  # Currency
-        r'\d+(?:\.\d+)?[x×]',  # Multipliers (2x, 3.5x)
-        r'\d+(?:\.\d+)?\s*(?:million|billion|thousand|k|M|B)',  # Large numbers
-        r'\d+(?:\.\d+)?\s*(?:years?|months?|weeks?|days?)',  # Time periods
-        r'\d+(?:\.\d+)?\s*(?:people|users|customers|clients|team|employees)',  # Counts
-        r'\d+(?:\.\d+)?\s*(?:points?|units?|items?|projects?|features?)',  # Counts
-        r'\d+\/\d+',  # Ratios
-    ]
-    
-    metric_count = 0
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        metric_count += len(matches)
-    
-    # Also count standalone numbers that might be metrics (3+ digits or decimals)
-    standalone_numbers = re.findall(r'\b\d{3,}\b|\b\d+\.\d+\b', text)
-    metric_count += len(standalone_numbers)
-    
-    return metric_count
+    return analyze_text(text).metric_count(ATS_100_METRIC_KINDS)
 
 
 def validate_email(email: str) -> bool:
@@ -189,7 +102,7 @@ def validate_phone(phone: str) -> bool:
 # ATS Scoring Functions (100-point system)
 # ============================================================================
 
-def score_keyword_match(resume_text: str, job_desc: str) -> Dict[str, Any]:
+def score_keyword_match(resume_stats: TextStats, job_desc: str) -> Dict[str, Any]:
     """
     Score keyword match (40 points).
     
@@ -215,21 +128,17 @@ def score_keyword_match(resume_text: str, job_desc: str) -> Dict[str, Any]:
             'suggestions': ['Add a job description to get keyword matching analysis']
         }
     
-    # Extract keywords from both
-    job_keywords = extract_keywords(job_desc)
-    resume_keywords = extract_keywords(resume_text)
+    # Extract keywords from both (job description index is cached)
+    job_index = get_job_index(job_desc)
+    job_keywords = job_index.keywords_for(3, STOP_WORDS)
+    resume_keywords = resume_stats.keywords(3, STOP_WORDS)
     
     # Find matched and missing keywords
     matched_keywords = job_keywords.intersection(resume_keywords)
     missing_keywords = job_keywords - resume_keywords
     
     # Categorize keywords (simple heuristic)
-    technical_keywords = matched_keywords.intersection({
-        'python', 'javascript', 'java', 'react', 'node', 'sql', 'database',
-        'api', 'git', 'docker', 'aws', 'cloud', 'linux', 'machine', 'learning',
-        'algorithm', 'data', 'structure', 'backend', 'frontend', 'fullstack',
-        'framework', 'library', 'testing', 'deployment', 'cicd', 'kubernetes'
-    })
+    technical_keywords = matched_keywords.intersection(TECHNICAL_TERMS)
     
     # Calculate scores
     total_keywords = len(job_keywords)
@@ -244,12 +153,7 @@ def score_keyword_match(resume_text: str, job_desc: str) -> Dict[str, Any]:
         match_ratio = matched_count / total_keywords
         
         # Technical skills (20 pts)
-        technical_ratio = len(technical_keywords) / max(1, len(extract_keywords(job_desc).intersection({
-            'python', 'javascript', 'java', 'react', 'node', 'sql', 'database',
-            'api', 'git', 'docker', 'aws', 'cloud', 'linux', 'machine', 'learning',
-            'algorithm', 'data', 'structure', 'backend', 'frontend', 'fullstack',
-            'framework', 'library', 'testing', 'deployment', 'cicd', 'kubernetes'
-        })))
+        technical_ratio = len(technical_keywords) / max(1, len(job_index.technical))
         technical_score = int(technical_ratio * 20)
         
         # Soft skills (5 pts)
@@ -277,7 +181,7 @@ def score_keyword_match(resume_text: str, job_desc: str) -> Dict[str, Any]:
         'matched_keywords': list(matched_keywords)[:15],
         'missing_keywords': list(missing_keywords)[:15],
         'suggestions': [
-            f"Add {len(missing_keywords[:10])} missing keywords to improve match",
+            f"Add {min(10, len(missing_keywords))} missing keywords to improve match",
             "Include technical skills from job description in your skills section",
             "Use keywords naturally in experience descriptions"
         ] if missing_keywords else []
@@ -345,7 +249,7 @@ def score_structure_sections(resume: Resume) -> Dict[str, Any]:
     }
 
 
-def score_formatting_readability(resume_text: str, resume: Resume) -> Dict[str, Any]:
+def score_formatting_readability(resume_stats: TextStats, resume: Resume) -> Dict[str, Any]:
     """
     Score formatting & readability (15 points).
     
@@ -363,7 +267,7 @@ def score_formatting_readability(resume_text: str, resume: Resume) -> Dict[str,
     points += 4
     
     # Consistent formatting (3 pts) - Check bullet points consistency
-    has_bullets = bool(re.search(r'[•\-\*]\s+', resume_text))
+    has_bullets = resume_stats.has_bullets
     if has_bullets:
         points += 3
     
@@ -375,7 +279,7 @@ def score_formatting_readability(resume_text: str, resume: Resume) -> Dict[str,
     points += 1
     
     # Clear hierarchy (2 pts) - Check for section headings
-    has_sections = bool(re.search(r'\b(experience|education|skills|summary|projects)\b', resume_text, re.I))
+    has_sections = bool(resume_stats.section_hits() & HIERARCHY_HEADINGS)
     if has_sections:
         points += 1
     
@@ -396,7 +300,7 @@ def score_formatting_readability(resume_text: str, resume: Resume) -> Dict[str,
     }
 
 
-def score_experience_strength(resume: Resume) -> Dict[str, Any]:
+def score_experience_strength(resume: Resume, analysis: Optional[ResumeAnalysis] = None) -> Dict[str, Any]:
     """
     Score experience strength (10 points).
     
@@ -419,18 +323,12 @@ def score_experience_strength(resume: Resume) -> Dict[str, Any]:
     # Internship or job present (5 pts)
     points += 5
     
-    # Collect experience text
-    experience_text = ' '.join([
-        (exp.description or '') + ' ' + (exp.position or '')
-        for exp in resume.experience
-    ])
+    # Collect experience text stats
+    analysis = analysis or analyze_resume_text(resume)
+    experience_stats = analysis.select('experience', 'description', 'position')
     
     # Action verbs at bullet start (3 pts)
-    bullets = re.split(r'[\n\r]', experience_text)
-    bullets_with_verbs = sum(1 for bullet in bullets if any(
-        bullet.strip().lower().startswith(verb + ' ') 
-        for verb in ACTION_VERBS
-    ))
+    bullets_with_verbs = experience_stats.verb_lines
     if bullets_with_verbs >= 3:
         points += 3
     elif bullets_with_verbs >= 1:
@@ -439,7 +337,7 @@ def score_experience_strength(resume: Resume) -> Dict[str, Any]:
         points += 0
     
     # Measurable results (2 pts)
-    metric_count = count_quantitative_metrics(experience_text)
+    metric_count = experience_stats.metric_count(ATS_100_METRIC_KINDS)
     if metric_count >= 2:
         points += 2
     elif metric_count >= 1:
@@ -567,7 +465,7 @@ def score_contact_quality(resume: Resume) -> Dict[str, Any]:
     }
 
 
-def score_job_relevance(resume: Resume, job_desc: str) -> Dict[str, Any]:
+def score_job_relevance(resume: Resume, job_desc: str, analysis: Optional[ResumeAnalysis] = None) -> Dict[str, Any]:
     """
     Score job-relevance (10 points).
     
@@ -585,11 +483,11 @@ def score_job_relevance(resume: Resume, job_desc: str) -> Dict[str, Any]:
     max_points = 10
     
     # Extract keywords from job description
-    job_keywords = extract_keywords(job_desc, min_length=4)
+    job_keywords = get_job_index(job_desc).keywords_for(4, STOP_WORDS)
+    analysis = analysis or analyze_resume_text(resume)
     
     # Check skills alignment
-    skills_text = ' '.join([skill.name for skill in resume.skills])
-    skills_keywords = extract_keywords(skills_text)
+    skills_keywords = analysis.select('skills').keywords(3, STOP_WORDS)
     skills_match = len(skills_keywords.intersection(job_keywords))
     if skills_match >= 5:
         points += 4
@@ -599,8 +497,7 @@ def score_job_relevance(resume: Resume, job_desc: str) -> Dict[str, Any]:
         points += 2
     
     # Check projects alignment
-    projects_text = ' '.join([proj.name + ' ' + (proj.description or '') for proj in resume.projects])
-    projects_keywords = extract_keywords(projects_text)
+    projects_keywords = analysis.select('projects').keywords(3, STOP_WORDS)
     projects_match = len(projects_keywords.intersection(job_keywords))
     if projects_match >= 3:
         points += 3
@@ -608,7 +505,7 @@ def score_job_relevance(resume: Resume, job_desc: str) -> Dict[str, Any]:
         points += 2
     
     # Check summary/objective alignment
-    summary_keywords = extract_keywords(resume.summary or '')
+    summary_keywords = analysis.select('summary').keywords(3, STOP_WORDS)
     summary_match = len(summary_keywords.intersection(job_keywords))
     if summary_match >= 2:
         points += 3
@@ -637,26 +534,18 @@ def calculate_ats_score_100(resume: Resume, job_desc: str = "") -> Dict[str, Any
     
     Returns detailed breakdown with scores and suggestions.
     """
-    # Combine resume text for analysis
-    resume_text_parts = [
-        resume.personal.firstName + ' ' + resume.personal.lastName if resume.personal else '',
-        resume.summary or '',
-        ' '.join([exp.position + ' ' + (exp.description or '') for exp in resume.experience]),
-        ' '.join([edu.degree + ' ' + (edu.field or '') for edu in resume.education]),
-        ' '.join([skill.name for skill in resume.skills]),
-        ' '.join([proj.name + ' ' + (proj.description or '') for proj in resume.projects]),
-        ' '.join([ach.title + ' ' + (ach.description or '') for ach in resume.achievements]),
-    ]
-    resume_text = ' '.join(resume_text_parts)
+    # Analyze every resume field once; categories combine the fields they need
+    analysis = analyze_resume_text(resume)
+    resume_stats = analysis.all()
     
     # Calculate all category scores
-    keyword_result = score_keyword_match(resume_text, job_desc)
+    keyword_result = score_keyword_match(resume_stats, job_desc)
     structure_result = score_structure_sections(resume)
-    formatting_result = score_formatting_readability(resume_text, resume)
-    experience_result = score_experience_strength(resume)
+    formatting_result = score_formatting_readability(resume_stats, resume)
+    experience_result = score_experience_strength(resume, analysis)
     education_result = score_education_relevance(resume)
     contact_result = score_contact_quality(resume)
-    relevance_result = score_job_relevance(resume, job_desc)
+    relevance_result = score_job_relevance(resume, job_desc, analysis)
     
     # Calculate total score
     total_score = (
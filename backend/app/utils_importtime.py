@@ -0,0 +1,115 @@
+"""Import-time profiling based on ``python -X importtime``."""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+# Directory containing the ``app`` package, so the profiled interpreter imports this code
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class ImportRecord(NamedTuple):
+    """One line of ``-X importtime`` output (times in microseconds)."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """
+    Parse ``-X importtime`` output.
+
+    Lines look like ``import time:   self [us] | cumulative | <indent>module``,
+    where each level of nesting adds two spaces before the module name.
+
+    Args:
+        output: Captured stderr of an interpreter run with ``-X importtime``
+
+    Returns:
+        One record per imported module, in import completion order
+    """
+    records = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Header line ("self [us] | cumulative | imported package")
+            continue
+        name = fields[2].rstrip()
+        stripped = name.lstrip(" ")
+        # One space separates the column from the name; each level adds two more
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append(ImportRecord(stripped, int(fields[0]), int(fields[1]), depth))
+    return records
+
+
+def measure_imports(module: str = "app.main") -> List[ImportRecord]:
+    """
+    Import a module in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        module: Dotted module name to import
+
+    Returns:
+        Parsed import records
+
+    Raises:
+        ValueError: If the import fails
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "unknown error"
+        raise ValueError(f"Importing {module} failed: {error}")
+    return parse_importtime(result.stderr)
+
+
+def group_name(module: str) -> str:
+    """Group third-party modules by top-level package; keep this app's modules separate."""
+    if module == "app" or module.startswith("app."):
+        return module
+    return module.split(".")[0]
+
+
+def summarize(records: List[ImportRecord], by_package: bool = True) -> List[Dict[str, object]]:
+    """
+    Total self time per package (or per module), slowest first.
+
+    Self times are summed rather than cumulative ones, so nothing is
+    counted twice and the rows add up to the total import time.
+    """
+    totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for record in records:
+        name = group_name(record.module) if by_package else record.module
+        totals[name][0] += record.self_us
+        totals[name][1] += 1
+    rows = [{'name': name, 'self_us': self_us, 'modules': count} for name, (self_us, count) in totals.items()]
+    rows.sort(key=lambda row: row['self_us'], reverse=True)
+    return rows
+
+
+def format_report(records: List[ImportRecord], module: str, top: int = 25, by_package: bool = True) -> str:
+    """Render a plain-text import-time report."""
+    total_us = sum(record.self_us for record in records)
+    rows = summarize(records, by_package)
+    label = "package" if by_package else "module"
+    lines = [
+        f"Import time of {module}: {total_us / 1000:.1f} ms across {len(records)} modules",
+        "",
+        f"{'ms':>8}  {'share':>6}  {'modules':>7}  {label}",
+    ]
+    for row in rows[:top]:
+        share = row['self_us'] / total_us if total_us else 0.0
+        lines.append(f"{row['self_us'] / 1000:>8.1f}  {share:>6.1%}  {row['modules']:>7}  {row['name']}")
+    if len(rows) > top:
+        rest = sum(row['self_us'] for row in rows[top:])
+        lines.append(f"{rest / 1000:>8.1f}  {'':>6}  {'':>7}  ({len(rows) - top} more)")
+    return "\n".join(lines)
@@ -1,37 +1,165 @@
 """Utility functions for parsing resume files (PDF, DOCX)."""
+import asyncio
 import io
-from typing import Optional
-import PyPDF2
-from docx import Document
+import logging
+import multiprocessing
+import os
+import signal
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, Optional
+from app.cache import LRUCache, SQLiteCache, content_hash
+from app.config import settings
 
-async def parse_pdf(file_content: bytes) -> Optional[str]:
-    """Extract text from PDF file."""
+logger = logging.getLogger(__name__)
+
+PDF_TYPES = ('application/pdf', 'pdf')
+DOCX_TYPES = (
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'application/msword',
+    'docx',
+    'doc',
+)
+
+
+class ParserBusyError(Exception):
+    """Raised when the parse pool has no room for another job."""
+
+
+class ParseTimeoutError(ValueError):
+    """Raised when a file takes longer than the per-job timeout to parse."""
+
+
+# ============================================================================
+# Text Extractors (run inside parse pool workers)
+# ============================================================================
+
+class PageTimeoutError(Exception):
+    """Raised inside the extractor when one PDF page exceeds its time budget."""
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]) -> Iterator[None]:
+    """
+    Raise PageTimeoutError if the block runs longer than ``seconds``.
+
+    Uses SIGALRM, which is only available in the main thread of a Unix
+    process (as in parse pool workers). Elsewhere the block runs unbounded
+    and the parse pool's per-job timeout still applies.
+    """
+    if (
+        not seconds
+        or not hasattr(signal, 'SIGALRM')
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise PageTimeoutError()
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def load_parsers() -> None:
+    """
+    Import the PDF and DOCX libraries.
+
+    They take tens of milliseconds to import, so they are loaded on first
+    use rather than at startup; parser processes load them as they start.
+    """
+    import PyPDF2  # noqa: F401
+    import docx  # noqa: F401
+
+
+def iter_pdf_pages(
+    file_content: bytes,
+    max_pages: Optional[int] = None,
+    page_timeout: Optional[float] = None,
+) -> Iterator[str]:
+    """
+    Yield the text of each PDF page lazily.
+
+    Pages are only extracted as the caller asks for them, so stopping the
+    iteration early skips the remaining pages entirely.
+
+    Args:
+        file_content: PDF file bytes
+        max_pages: Stop after this many pages
+        page_timeout: Seconds allowed per page; slower pages are skipped
+    """
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    for number, page in enumerate(pdf_reader.pages):
+        if max_pages is not None and number >= max_pages:
+            return
+        try:
+            with time_limit(page_timeout):
+                text = page.extract_text()
+        except PageTimeoutError:
+            logger.warning(f"Skipped PDF page {number + 1}: extraction exceeded {page_timeout:g}s")
+            continue
+        yield text or ''
+
+
+def extract_pdf_text(
+    file_content: bytes,
+    max_chars: Optional[int] = None,
+    max_pages: Optional[int] = None,
+    page_timeout: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Extract text from PDF file, stopping once the character or page budget is reached.
+
+    Args:
+        file_content: PDF file bytes
+        max_chars: Stop once this many characters are extracted (text is cut to it)
+        max_pages: Stop after this many pages
+        page_timeout: Seconds allowed per page; slower pages are skipped
+    """
     try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
         text_parts = []
-        
-        for page in pdf_reader.pages:
-            text = page.extract_text()
+        length = 0
+
+        for text in iter_pdf_pages(file_content, max_pages, page_timeout):
             if text:
                 text_parts.append(text)
-        
-        return '\n'.join(text_parts) if text_parts else None
+                length += len(text) + 1
+                if max_chars is not None and length >= max_chars:
+                    break
+
+        text = '\n'.join(text_parts)
+        if max_chars is not None:
+            text = text[:max_chars]
+        return text or None
     except Exception as e:
         raise ValueError(f"Failed to parse PDF: {str(e)}")
 
 
-async def parse_docx(file_content: bytes) -> Optional[str]:
-    """Extract text from DOCX file."""
+def extract_docx_text(file_content: bytes, max_chars: Optional[int] = None) -> Optional[str]:
+    """Extract text from DOCX file, cut to ``max_chars`` if given."""
+    from docx import Document
+
     try:
         docx_file = io.BytesIO(file_content)
         doc = Document(docx_file)
         text_parts = []
-        
+
         for paragraph in doc.paragraphs:
             if paragraph.text.strip():
                 text_parts.append(paragraph.text)
-        
+
         # Also extract text from tables
         for table in doc.tables:
             for row in table.rows:
@@ -41,18 +169,314 @@ async def parse_docx(file_content: bytes) -> Optional[str]:
                         row_text.append(cell.text.strip())
                 if row_text:
                     text_parts.append(' | '.join(row_text))
-        
-        return '\n'.join(text_parts) if text_parts else None
+
+        text = '\n'.join(text_parts)
+        if max_chars is not None:
+            text = text[:max_chars]
+        return text or None
     except Exception as e:
         raise ValueError(f"Failed to parse DOCX: {str(e)}")
 
 
-async def parse_resume_file(file_content: bytes, file_type: str) -> Optional[str]:
-    """Parse resume file based on file type."""
-    if file_type == 'application/pdf' or file_type == 'pdf':
-        return await parse_pdf(file_content)
-    elif file_type in ['application/vnd.openxmlformats-officedocument.wordprocessingml.document', 'application/msword', 'docx', 'doc']:
-        return await parse_docx(file_content)
-    else:
-        raise ValueError(f"Unsupported file type: {file_type}")
+def get_extractor(file_type: str) -> Callable[[bytes], Optional[str]]:
+    """
+    Return the text extractor for a file type.
+
+    Raises:
+        ValueError: If the file type is not supported
+    """
+    if file_type in PDF_TYPES:
+        return extract_pdf_text
+    if file_type in DOCX_TYPES:
+        return extract_docx_text
+    raise ValueError(f"Unsupported file type: {file_type}")
+
+
+# ============================================================================
+# Parse Pool
+# ============================================================================
+
+class ParsePool:
+    """
+    Bounded process pool for CPU-bound file parsing.
+
+    Parsing runs in worker processes so large uploads never block the event
+    loop. At most ``workers + max_queue`` jobs are admitted at once; past that
+    ParserBusyError is raised so callers can shed load with a 429.
+
+    A running process cannot be cancelled on its own, so a job that exceeds
+    ``timeout`` terminates the pool's workers and the next job starts a fresh
+    pool. Jobs caught up in that restart are retried once. Threads (with
+    ``workers=0``) cannot be stopped either, so a timed-out thread keeps its
+    slot until it finishes.
+    """
+
+    def __init__(self, workers: int, timeout: float, max_queue: int):
+        """
+        Initialize parse pool.
+
+        Args:
+            workers: Number of worker processes (0 parses in a thread instead)
+            timeout: Seconds a single job may take
+            max_queue: Jobs allowed to wait when every worker is busy
+        """
+        self.workers = max(0, workers)
+        self.timeout = timeout
+        self.max_queue = max(0, max_queue)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of jobs running or queued at once."""
+        return max(1, self.workers) + self.max_queue
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Return the executor, starting worker processes on first use."""
+        if self._executor is None:
+            # Spawned workers do not inherit the server's sockets or threads
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=load_parsers,
+            )
+        return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """Discard an executor and terminate its workers (once per executor)."""
+        if self._executor is not executor:
+            return
+        self._executor = None
+        self.restarts += 1
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        # Queued jobs are left for the executor to fail with BrokenProcessPool so run() retries them
+        executor.shutdown(wait=False)
+        for process in processes:
+            process.terminate()
+        logger.warning("Parse pool restarted after a stuck or crashed worker")
+
+    def _release(self, future: Optional[asyncio.Future] = None) -> None:
+        """Free a job's slot (used as a done callback for threads that outlive their timeout)."""
+        self._pending -= 1
+        if future is not None and not future.cancelled():
+            # Nobody awaits a timed-out thread; retrieve its exception so it is not logged
+            future.exception()
+
+    async def _run_in_thread(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a job in a thread; the job keeps its slot until the thread finishes, even after a timeout."""
+        future = asyncio.get_running_loop().run_in_executor(None, func, *args)
+        future.add_done_callback(self._release)
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ParseTimeoutError(f"File took longer than {self.timeout:g}s to parse")
+        self.completed += 1
+        return result
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run ``func(*args)`` in the pool.
+
+        Args:
+            func: Picklable module-level function
+            *args: Picklable arguments
+
+        Returns:
+            The function's return value
+
+        Raises:
+            ParserBusyError: If the pool is saturated
+            ParseTimeoutError: If the job exceeds the timeout
+        """
+        if self._pending >= self.capacity:
+            self.rejected += 1
+            raise ParserBusyError("File parser is busy. Please try again shortly.")
+
+        self._pending += 1
+        if self.workers == 0:
+            return await self._run_in_thread(func, *args)
+
+        try:
+            loop = asyncio.get_running_loop()
+            for attempt in range(2):
+                executor = self._get_executor()
+                try:
+                    result = await asyncio.wait_for(
+                        loop.run_in_executor(executor, func, *args),
+                        self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    self._restart(executor)
+                    raise ParseTimeoutError(f"File took longer than {self.timeout:g}s to parse")
+                except asyncio.CancelledError:
+                    # The job's future was cancelled by a restart, not the caller
+                    if asyncio.current_task().cancelling() or self._executor is executor or attempt:
+                        raise
+                    continue
+                except BrokenProcessPool:
+                    self._restart(executor)
+                    if attempt:
+                        raise
+                    continue
+                self.completed += 1
+                return result
+        finally:
+            self._release()
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def reset_after_fork(self) -> None:
+        """Forget the parent's worker processes and jobs; this process starts its own."""
+        self._executor = None
+        self._pending = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size and job counters."""
+        return {
+            'workers': self.workers,
+            'pending': self._pending,
+            'capacity': self.capacity,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+            'restarts': self.restarts,
+        }
+
+
+# Created per process; worker processes start on the first upload
+parse_pool = ParsePool(
+    workers=settings.PARSE_WORKERS,
+    timeout=settings.PARSE_TIMEOUT_SECONDS,
+    max_queue=settings.PARSE_MAX_QUEUE,
+)
+os.register_at_fork(after_in_child=parse_pool.reset_after_fork)
+
+
+# ============================================================================
+# Extracted Text Cache
+# ============================================================================
+
+# Keyed by a SHA-256 of the extractor and file bytes, so a re-uploaded file
+# skips parsing. Files without text are cached as '' and returned as None.
+text_cache = LRUCache(
+    max_entries=settings.PARSE_CACHE_SIZE,
+    max_weight=settings.PARSE_CACHE_MAX_CHARS,
+    weigh=len,
+    name="parsed_text",
+)
+
+disk_text_cache: Optional[SQLiteCache] = None
+if settings.PARSE_CACHE_PATH:
+    try:
+        disk_text_cache = SQLiteCache(
+            settings.PARSE_CACHE_PATH,
+            max_bytes=settings.PARSE_CACHE_DISK_MAX_BYTES,
+            name="parsed_text_disk",
+        )
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Disk cache for parsed text disabled: {e}")
+if disk_text_cache is not None:
+    os.register_at_fork(after_in_child=disk_text_cache.reset_after_fork)
+
+
+async def get_cached_text(key: str) -> Optional[str]:
+    """Look up extracted text in memory, then on disk (promoting disk hits)."""
+    text = text_cache.get(key)
+    if text is None and disk_text_cache is not None:
+        try:
+            text = await asyncio.to_thread(disk_text_cache.get, key)
+        except sqlite3.Error as e:
+            logger.warning(f"Parsed text disk cache read failed: {e}")
+            return None
+        if text is not None:
+            text_cache.set(key, text)
+    return text
+
+
+async def set_cached_text(key: str, text: str) -> None:
+    """Store extracted text in both cache tiers."""
+    text_cache.set(key, text)
+    if disk_text_cache is not None:
+        try:
+            await asyncio.to_thread(disk_text_cache.set, key, text)
+        except sqlite3.Error as e:
+            logger.warning(f"Parsed text disk cache write failed: {e}")
+
+
+def text_cache_stats() -> Dict[str, Any]:
+    """Return stats for both cache tiers."""
+    return {
+        'memory': text_cache.stats(),
+        'disk': disk_text_cache.stats() if disk_text_cache is not None else None,
+    }
+
+
+# ============================================================================
+# Async API
+# ============================================================================
+
+async def parse_pdf(file_content: bytes, max_chars: Optional[int] = None) -> Optional[str]:
+    """Extract text from PDF file in the parse pool."""
+    return await parse_pool.run(
+        partial(
+            extract_pdf_text,
+            max_chars=max_chars,
+            max_pages=settings.PARSE_MAX_PAGES,
+            page_timeout=settings.PARSE_PAGE_TIMEOUT_SECONDS,
+        ),
+        file_content
+    )
+
+
+async def parse_docx(file_content: bytes, max_chars: Optional[int] = None) -> Optional[str]:
+    """Extract text from DOCX file in the parse pool."""
+    return await parse_pool.run(partial(extract_docx_text, max_chars=max_chars), file_content)
+
+
+async def parse_resume_file(
+    file_content: bytes,
+    file_type: str,
+    max_chars: Optional[int] = None,
+) -> Optional[str]:
+    """
+    Parse resume file based on file type.
+
+    Text is extracted once per file, up to PARSE_MAX_CHARS characters or
+    PARSE_MAX_PAGES PDF pages, and cached by extractor and file content, so
+    repeat uploads skip parsing whichever endpoint they go to. Each caller's
+    budget is applied to the cached text.
+
+    Args:
+        file_content: File bytes
+        file_type: MIME type or extension
+        max_chars: Character budget for this caller (None returns all
+            extracted text); at most PARSE_MAX_CHARS
 
+    Raises:
+        ValueError: If the file type is unsupported or the file cannot be parsed
+        ParseTimeoutError: If parsing exceeds the per-job timeout
+        ParserBusyError: If the parse pool is saturated
+    """
+    extractor = get_extractor(file_type)
+    key = content_hash(extractor.__name__, file_content)
+    text = await get_cached_text(key)
+    if text is None:
+        options: Dict[str, Any] = {'max_chars': settings.PARSE_MAX_CHARS}
+        if extractor is extract_pdf_text:
+            options['max_pages'] = settings.PARSE_MAX_PAGES
+            options['page_timeout'] = settings.PARSE_PAGE_TIMEOUT_SECONDS
+        text = await parse_pool.run(partial(extractor, **options), file_content) or ''
+        await set_cached_text(key, text)
+    if max_chars is not None:
+        text = text[:max_chars]
+    return text or None
@@ -0,0 +1,311 @@
+"""Helpers for addressing and editing parts of a resume by field path."""
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from app.schemas import (
+    Resume,
+    Personal,
+    Experience,
+    Education,
+    Skill,
+    Project,
+    Achievement,
+    Extras,
+)
+from app.utils import sanitize_resume_data
+
+# Resume sections that hold a list of items, with the item model
+LIST_SECTION_MODELS = {
+    'experience': Experience,
+    'education': Education,
+    'skills': Skill,
+    'projects': Project,
+    'achievements': Achievement,
+}
+
+# Resume sections that hold a single nested object
+OBJECT_SECTION_MODELS = {
+    'personal': Personal,
+    'extras': Extras,
+}
+
+# Top-level scalar fields
+SCALAR_FIELDS = {'summary'}
+
+PathPart = Union[str, int]
+
+
+def parse_field_path(path: str) -> List[PathPart]:
+    """
+    Parse a field path into its parts.
+
+    Accepts dotted paths (``experience.2.description``) and JSON Pointers
+    (``/experience/2/description``). Numeric parts become list indexes.
+
+    Raises:
+        ValueError: If the path is empty or does not start with a resume section
+    """
+    if not path or not path.strip('./'):
+        raise ValueError("Field path must not be empty")
+    separator = '/' if path.startswith('/') else '.'
+    raw_parts = path.strip(separator).split(separator)
+    parts: List[PathPart] = []
+    for raw in raw_parts:
+        # JSON Pointer escapes
+        raw = raw.replace('~1', '/').replace('~0', '~')
+        parts.append(int(raw) if raw.isdigit() else raw)
+    section = parts[0]
+    if section not in LIST_SECTION_MODELS and section not in OBJECT_SECTION_MODELS and section not in SCALAR_FIELDS:
+        raise ValueError(f"Unknown resume section: {section}")
+    return parts
+
+
+def apply_resume_change(
+    resume: Resume,
+    path: str,
+    value: Any = None,
+    op: str = "set",
+) -> Tuple[str, Optional[int]]:
+    """
+    Apply a single change to a resume in place, validating only what changed.
+
+    Supported targets:
+    - ``summary`` / ``personal`` / ``extras`` / ``experience`` (whole field or section)
+    - ``personal.email`` / ``extras.languages`` (attribute of an object section)
+    - ``experience.2`` (one list item; index == length appends)
+    - ``experience.2.description`` (attribute of one list item)
+
+    ``op`` is ``set`` or ``remove``; ``remove`` is supported for list items.
+
+    Args:
+        resume: Resume to modify
+        path: Field path (dotted or JSON Pointer)
+        value: New value for ``set``
+        op: Operation name
+
+    Returns:
+        Tuple of (section, item index). The index is None when the whole
+        section changed or list indexes shifted.
+
+    Raises:
+        ValueError: If the path or operation is invalid
+        pydantic.ValidationError: If the new value fails validation
+    """
+    if op not in ('set', 'remove'):
+        raise ValueError(f"Unsupported operation: {op}")
+
+    parts = parse_field_path(path)
+    section = parts[0]
+
+    if len(parts) == 1:
+        if op == 'remove':
+            raise ValueError(f"Cannot remove section '{section}'; set it to an empty value instead")
+        Resume.__pydantic_validator__.validate_assignment(resume, section, value)
+        return section, None
+
+    if section in OBJECT_SECTION_MODELS:
+        if len(parts) != 2 or not isinstance(parts[1], str) or op == 'remove':
+            raise ValueError(f"Invalid path for section '{section}': {path}")
+        model = OBJECT_SECTION_MODELS[section]
+        _check_attribute(model, parts[1], path)
+        updated = getattr(resume, section).model_copy()
+        model.__pydantic_validator__.validate_assignment(updated, parts[1], value)
+        setattr(resume, section, updated)
+        return section, None
+
+    if section not in LIST_SECTION_MODELS or not isinstance(parts[1], int) or len(parts) > 3:
+        raise ValueError(f"Invalid path: {path}")
+
+    model = LIST_SECTION_MODELS[section]
+    items = getattr(resume, section)
+    index = parts[1]
+
+    if len(parts) == 2:
+        if op == 'remove':
+            _check_index(items, index, path)
+            del items[index]
+            return section, None
+        item = model.model_validate(value)
+        if index == len(items):
+            items.append(item)
+        else:
+            _check_index(items, index, path)
+            items[index] = item
+        return section, index
+
+    if op == 'remove':
+        raise ValueError(f"Cannot remove attribute; set it to null instead: {path}")
+    attribute = parts[2]
+    _check_index(items, index, path)
+    _check_attribute(model, attribute, path)
+    updated = items[index].model_copy()
+    model.__pydantic_validator__.validate_assignment(updated, attribute, value)
+    items[index] = updated
+    return section, index
+
+
+def _check_index(items: list, index: int, path: str) -> None:
+    """Raise ValueError if index is out of range."""
+    if index >= len(items):
+        raise ValueError(f"Index out of range: {path}")
+
+
+def _check_attribute(model, attribute: PathPart, path: str) -> None:
+    """Raise ValueError if the model has no such field."""
+    if not isinstance(attribute, str) or attribute not in model.model_fields:
+        raise ValueError(f"Unknown field: {path}")
+
+
+# ============================================================================
+# Patches as MongoDB updates
+# ============================================================================
+
+# JSON Patch (RFC 6902) operations accepted for stored resumes
+PATCH_OPS = ('add', 'replace', 'remove', 'test')
+
+
+class ResumePatch(NamedTuple):
+    """A resume patch translated into a single MongoDB update."""
+
+    set: Dict[str, Any]
+    push: Dict[str, Any]
+    # List section -> index of the item to remove. MongoDB cannot $pull by
+    # position, so the caller looks up the item's id and pulls by id,
+    # provided no other item in the list shares it.
+    remove: Dict[str, int]
+    # Filters the stored document must match for the patch to apply
+    conditions: List[Dict[str, Any]]
+
+
+def build_resume_patch(changes: Iterable[Tuple[str, str, Any]]) -> ResumePatch:
+    """
+    Translate patch operations into MongoDB update operators without loading the resume.
+
+    Each value is validated and sanitized against the model of the part it
+    replaces, never the whole resume. Paths use the same syntax as
+    ``apply_resume_change``; list items also accept ``-`` (append) and
+    ``add`` inserts at an index:
+
+    - ``add``/``replace`` of a section or attribute -> ``$set``
+    - ``add`` of a list item -> ``$push`` (``$position`` for an index)
+    - ``remove`` of a list item -> ``$pull`` (see ``ResumePatch.remove``)
+    - ``test`` -> an ``$eq`` condition on the stored value, checked before the patch applies
+
+    Indexes refer to the stored resume. Changes whose targets overlap (for
+    example an item and one of its attributes, or two inserts into one
+    list) cannot be combined into one update and are rejected.
+
+    Args:
+        changes: (op, path, value) tuples in request order
+
+    Returns:
+        The update operators and the conditions for the filter
+
+    Raises:
+        ValueError: If an operation or path is invalid, or changes conflict
+        pydantic.ValidationError: If a value fails validation
+    """
+    patch = ResumePatch(set={}, push={}, remove={}, conditions=[])
+    targets: Dict[str, str] = {}
+
+    for op, path, value in changes:
+        if op not in PATCH_OPS:
+            raise ValueError(f"Unsupported operation: {op}")
+        parts = parse_field_path(path)
+        section = parts[0]
+        dotted = '.'.join(str(part) for part in parts)
+
+        if op == 'test':
+            if '-' in parts:
+                raise ValueError(f"Invalid path for test: {path}")
+            _check_literal(value, path)
+            # $eq compares for equality even when the value is an object
+            patch.conditions.append({dotted: {'$eq': value}})
+            continue
+
+        if len(parts) == 1:
+            if op == 'remove':
+                raise ValueError(f"Cannot remove section '{section}'; set it to an empty value instead")
+            patch.set[dotted] = _validate_field(Resume, section, value)
+            _claim(targets, dotted, 'set')
+            continue
+
+        if section in OBJECT_SECTION_MODELS:
+            if len(parts) != 2 or not isinstance(parts[1], str) or op == 'remove':
+                raise ValueError(f"Invalid path for section '{section}': {path}")
+            model = OBJECT_SECTION_MODELS[section]
+            _check_attribute(model, parts[1], path)
+            patch.set[dotted] = _validate_field(model, parts[1], value)
+            _claim(targets, dotted, 'set')
+            continue
+
+        index = parts[1]
+        if section not in LIST_SECTION_MODELS or len(parts) > 3 or not (
+            isinstance(index, int) or (index == '-' and op == 'add' and len(parts) == 2)
+        ):
+            raise ValueError(f"Invalid path: {path}")
+        model = LIST_SECTION_MODELS[section]
+
+        if len(parts) == 2:
+            if op == 'remove':
+                patch.remove[section] = index
+                patch.conditions.append({dotted: {'$exists': True}})
+                _claim(targets, section, 'remove')
+            elif op == 'add':
+                item = sanitize_resume_data(model.model_validate(value).model_dump())
+                if index == '-':
+                    patch.push[section] = item
+                else:
+                    patch.push[section] = {'$each': [item], '$position': index}
+                    if index > 0:
+                        patch.conditions.append({f"{section}.{index - 1}": {'$exists': True}})
+                _claim(targets, section, 'push')
+            else:
+                patch.set[dotted] = sanitize_resume_data(model.model_validate(value).model_dump())
+                patch.conditions.append({dotted: {'$exists': True}})
+                _claim(targets, dotted, 'set')
+            continue
+
+        if op == 'remove':
+            raise ValueError(f"Cannot remove attribute; set it to null instead: {path}")
+        _check_attribute(model, parts[2], path)
+        patch.set[dotted] = _validate_field(model, parts[2], value)
+        patch.conditions.append({f"{section}.{index}": {'$exists': True}})
+        _claim(targets, dotted, 'set')
+
+    return patch
+
+
+def _validate_field(model, attribute: str, value: Any) -> Any:
+    """Validate and sanitize one field of a model on its own; return the value to store."""
+    instance = model.model_construct()
+    model.__pydantic_validator__.validate_assignment(instance, attribute, value)
+    return sanitize_resume_data(instance.model_dump(include={attribute}))[attribute]
+
+
+def _check_literal(value: Any, path: str) -> None:
+    """Raise ValueError if a test value contains keys MongoDB would read as operators."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str) or key.startswith('$'):
+                raise ValueError(f"Invalid key in test value for {path}: {key}")
+            _check_literal(item, path)
+    elif isinstance(value, list):
+        for item in value:
+            _check_literal(item, path)
+
+
+def _claim(targets: Dict[str, str], path: str, kind: str) -> None:
+    """
+    Record that a change writes to path.
+
+    Raises ValueError if another change already writes to the same path
+    (other than setting it again, where the later value wins), or to a
+    path inside or containing it.
+    """
+    for other, other_kind in targets.items():
+        if other == path:
+            if kind == 'set' and other_kind == 'set':
+                continue
+        elif not (other.startswith(path + '.') or path.startswith(other + '.')):
+            continue
+        raise ValueError(f"Conflicting changes to '{other}' and '{path}'; send them in separate requests")
+    targets[path] = kind
@@ -0,0 +1,80 @@
+"""Helpers for streaming responses: server-sent events and incremental JSON parsing."""
+import json
+from typing import Any, List, Optional
+from app.db import encode_json
+
+
+def format_sse(event: str, data: Any) -> bytes:
+    """Encode one server-sent event with a JSON payload."""
+    return b"event: " + event.encode('utf-8') + b"\ndata: " + encode_json(data) + b"\n\n"
+
+
+class JSONArrayStreamParser:
+    """
+    Incrementally decode the elements of a JSON array from text chunks.
+
+    Text before the opening ``[`` (such as a Markdown code fence) is ignored.
+    Each object or array element is decoded as soon as its closing bracket
+    arrives, so callers can act on elements before the array is complete.
+    Malformed elements are skipped.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.finished = False
+        self._element: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        """
+        Consume a chunk of text.
+
+        Returns:
+            Elements completed by this chunk, in order
+        """
+        elements = []
+        for char in chunk:
+            if self.finished:
+                break
+            if not self.started:
+                self.started = char == '['
+                continue
+
+            if self._depth == 0:
+                # Between elements: wait for the next object/array or the end
+                if char in '{[':
+                    self._depth = 1
+                    self._element = [char]
+                elif char == ']':
+                    self.finished = True
+                continue
+
+            self._element.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 0:
+                    element = self._decode(''.join(self._element))
+                    if element is not None:
+                        elements.append(element)
+                    self._element = []
+        return elements
+
+    @staticmethod
+    def _decode(text: str) -> Optional[Any]:
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,428 @@
+"""Single-pass text analyzer shared by the ATS scorers.
+
+Both ATS scorers need the same facts about resume text: keywords, action
+verb hits, quantitative metrics and section headings. Instead of running a
+separate ``re.findall`` for each of them, ``analyze_text`` walks the text once
+with a precompiled tokenizer and collects everything in a ``TextStats``.
+Stats are additive, so a resume can be analyzed field by field and the
+per-field results combined for whichever fields a scoring category needs.
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from app.cache import LRUCache, content_hash
+from app.config import settings
+
+# ============================================================================
+# Vocabulary
+# ============================================================================
+
+# Action verbs (common resume action verbs)
+ACTION_VERBS = frozenset({
+    'achieved', 'acted', 'adapted', 'administered', 'advanced', 'advised', 'allocated',
+    'analyzed', 'applied', 'appointed', 'approved', 'architected', 'assembled', 'assessed',
+    'assigned', 'attained', 'authored', 'automated', 'balanced', 'built', 'calculated',
+    'catalyzed', 'championed', 'changed', 'clarified', 'closed', 'coached', 'collaborated',
+    'collected', 'communicated', 'completed', 'composed', 'computed', 'conceived',
+    'conducted', 'configured', 'consolidated', 'constructed', 'consulted', 'contracted',
+    'contributed', 'controlled', 'converted', 'coordinated', 'created', 'critiqued',
+    'customized', 'decreased', 'delegated', 'delivered', 'demonstrated', 'designed',
+    'determined', 'developed', 'devised', 'directed', 'discovered', 'distributed',
+    'dramatized', 'drove', 'earned', 'edited', 'educated', 'elected', 'elicited',
+    'eliminated', 'emphasized', 'employed', 'enabled', 'enforced', 'engineered',
+    'enhanced', 'enlarged', 'enlisted', 'ensured', 'established', 'evaluated',
+    'examined', 'exceeded', 'executed', 'expanded', 'expedited', 'experimented',
+    'explained', 'explored', 'exported', 'extracted', 'facilitated', 'fashioned',
+    'focused', 'forecasted', 'formed', 'formulated', 'fostered', 'founded',
+    'generated', 'governed', 'grouped', 'guided', 'headed', 'helped', 'hired',
+    'honed', 'hosted', 'hypothesized', 'identified', 'illustrated', 'implemented',
+    'improved', 'increased', 'influenced', 'informed', 'initiated', 'innovated',
+    'inspected', 'inspired', 'installed', 'instituted', 'instructed', 'integrated',
+    'interpreted', 'interviewed', 'introduced', 'invented', 'investigated', 'invited',
+    'involved', 'joined', 'judged', 'justified', 'launched', 'led', 'lectured',
+    'lobbied', 'located', 'logged', 'maintained', 'managed', 'manipulated', 'mapped',
+    'marketed', 'mastered', 'matched', 'maximized', 'measured', 'mediated', 'merged',
+    'minimized', 'modeled', 'moderated', 'modernized', 'modified', 'monitored',
+    'motivated', 'moved', 'named', 'navigated', 'negotiated', 'nominated', 'operated',
+    'optimized', 'orchestrated', 'organized', 'originated', 'overhauled', 'oversaw',
+    'participated', 'partnered', 'performed', 'persuaded', 'pioneered', 'planned',
+    'positioned', 'prepared', 'presented', 'presided', 'prioritized', 'processed',
+    'produced', 'programmed', 'projected', 'promoted', 'proposed', 'proved', 'provided',
+    'publicized', 'published', 'purchased', 'pursued', 'qualified', 'quantified',
+    'questioned', 'raised', 'ran', 'ranked', 'rated', 'realized', 'received',
+    'recognized', 'recommended', 'reconciled', 'recorded', 'recruited', 'redesigned',
+    'reduced', 'referred', 'refined', 'regulated', 'reinforced', 'rejected', 'related',
+    'remedied', 'remodeled', 'reorganized', 'repaired', 'replaced', 'reported',
+    'represented', 'researched', 'resolved', 'responded', 'restored', 'restructured',
+    'retained', 'retrieved', 'revamped', 'reviewed', 'revised', 'revitalized',
+    'scheduled', 'secured', 'selected', 'separated', 'served', 'serviced', 'set',
+    'shaped', 'shared', 'showed', 'signaled', 'simplified', 'simulated', 'sold',
+    'solved', 'sorted', 'sought', 'sparked', 'sponsored', 'standardized', 'started',
+    'stimulated', 'stopped', 'strengthened', 'stressed', 'stretched', 'structured',
+    'studied', 'submitted', 'substituted', 'succeeded', 'suggested', 'summarized',
+    'supervised', 'supplied', 'supported', 'surpassed', 'surveyed', 'sustained',
+    'synthesized', 'systematized', 'tabulated', 'tailored', 'taught', 'teamed',
+    'terminated', 'tested', 'tightened', 'tolerated', 'touched', 'trained',
+    'transcended', 'transferred', 'transformed', 'translated', 'transmitted',
+    'traveled', 'treated', 'trimmed', 'tripled', 'troubleshot', 'trusted', 'turned',
+    'uncovered', 'understood', 'unified', 'united', 'unveiled', 'updated', 'upgraded',
+    'used', 'utilized', 'validated', 'valued', 'verified', 'viewed', 'visited',
+    'volunteered', 'waged', 'won', 'worked', 'wrote'
+})
+
+# Common stop words excluded from keyword extraction
+STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'from', 'as', 'is', 'was', 'are', 'were', 'been',
+    'be', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would',
+    'should', 'could', 'may', 'might', 'must', 'can', 'this', 'that',
+    'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they', 'what',
+    'which', 'who', 'when', 'where', 'why', 'how', 'all', 'each', 'every',
+    'both', 'few', 'more', 'most', 'other', 'some', 'such', 'no', 'nor',
+    'not', 'only', 'own', 'same', 'so', 'than', 'too', 'very', 'just',
+    'now'
+})
+
+# Single-word section headings recognized in free text
+SECTION_HEADINGS = frozenset({
+    'experience', 'education', 'skills', 'summary', 'projects',
+    'work', 'employment', 'degree', 'university', 'college',
+    'competencies', 'technologies', 'email', 'phone', 'contact',
+})
+
+# Job-description term categories
+TECHNICAL_TERMS = frozenset({
+    'python', 'javascript', 'java', 'react', 'node', 'sql', 'database',
+    'api', 'git', 'docker', 'aws', 'cloud', 'linux', 'machine', 'learning',
+    'algorithm', 'data', 'structure', 'backend', 'frontend', 'fullstack',
+    'framework', 'library', 'testing', 'deployment', 'cicd', 'kubernetes'
+})
+
+TOOL_TERMS = frozenset({
+    'git', 'github', 'gitlab', 'docker', 'kubernetes', 'jenkins', 'terraform',
+    'ansible', 'aws', 'azure', 'gcp', 'linux', 'jira', 'confluence', 'figma',
+    'react', 'angular', 'vue', 'django', 'flask', 'fastapi', 'spring', 'node',
+    'express', 'postgresql', 'mysql', 'mongodb', 'redis', 'kafka', 'spark',
+    'airflow', 'tableau', 'excel', 'pandas', 'numpy', 'tensorflow', 'pytorch',
+})
+
+SOFT_SKILL_TERMS = frozenset({
+    'communication', 'leadership', 'teamwork', 'collaboration', 'collaborative',
+    'problem', 'solving', 'adaptability', 'adaptable', 'creativity', 'creative',
+    'mentoring', 'mentorship', 'ownership', 'initiative', 'organized',
+    'organizational', 'presentation', 'negotiation', 'interpersonal',
+    'stakeholder', 'stakeholders', 'detail', 'motivated', 'independent',
+    'empathy', 'accountability', 'prioritization', 'curiosity',
+})
+
+# ============================================================================
+# Compiled patterns
+# ============================================================================
+
+# One tokenizer pass over lowercased text: letter-only words, digit runs,
+# bullet markers and line breaks.
+_TOKEN_RE = re.compile(
+    r'(?P<word>\b[a-z]+\b)'
+    r'|(?P<number>\d+)'
+    r'|(?P<bullet>[•\-\*](?=\s))'
+    r'|(?P<newline>[\n\r])'
+)
+
+# Quantitative metric patterns, anchored at the start of a digit run.
+# Each kind is counted like an independent ``re.findall`` over the text.
+METRIC_PATTERNS: Dict[str, "re.Pattern[str]"] = {
+    'percentage': re.compile(r'\d+%', re.I),
+    'multiplier': re.compile(r'\d+(?:\.\d+)?[x×]', re.I),
+    'large_number': re.compile(r'\d+(?:\.\d+)?\s*(?:million|billion|thousand|k|M|B)', re.I),
+    'time_period': re.compile(r'\d+(?:\.\d+)?\s*(?:years?|months?|weeks?|days?)', re.I),
+    'people_count': re.compile(r'\d+(?:\.\d+)?\s*(?:people|users|customers|clients|team|employees)', re.I),
+    'unit_count': re.compile(r'\d+(?:\.\d+)?\s*(?:points?|units?|items?|projects?|features?)', re.I),
+    'ratio': re.compile(r'\d+\/\d+', re.I),
+    'decimal_percentage': re.compile(r'\d+(?:\.\d+)?%', re.I),
+    'standalone_number': re.compile(r'\b\d{3,}\b|\b\d+\.\d+\b'),
+}
+
+# Currency is the only metric that starts before the digits
+_CURRENCY_RE = re.compile(r'\$\d+(?:,\d{3})*(?:\.\d+)?', re.I)
+
+# A space after a line's first word, followed by more content on that line
+_LINE_CONTINUES_RE = re.compile(r' [^\S\n\r]*\S')
+
+# Metric kinds used by the weighted scorer in ``app.routers.ats``
+ATS_METRIC_KINDS = (
+    'percentage', 'currency', 'multiplier', 'large_number', 'time_period',
+    'people_count', 'unit_count', 'ratio', 'decimal_percentage', 'standalone_number',
+)
+
+# Metric kinds used by the 100-point scorer in ``app.utils_ats``
+ATS_100_METRIC_KINDS = tuple(kind for kind in ATS_METRIC_KINDS if kind != 'decimal_percentage')
+
+
+# ============================================================================
+# Analysis results
+# ============================================================================
+
+class TextStats:
+    """Facts collected from one pass over a piece of text.
+
+    Everything is a count, so stats can be added and subtracted in place;
+    incremental scoring swaps one field's stats out of a running total.
+    """
+
+    __slots__ = ('words', 'metrics', 'verbs', 'verb_lines', 'bullets', 'years')
+
+    def __init__(self):
+        self.words: Counter = Counter()
+        self.metrics: Counter = Counter()
+        self.verbs = 0
+        self.verb_lines = 0
+        self.bullets = 0
+        self.years = 0
+
+    def __iadd__(self, other: "TextStats") -> "TextStats":
+        self.words.update(other.words)
+        self.metrics.update(other.metrics)
+        self.verbs += other.verbs
+        self.verb_lines += other.verb_lines
+        self.bullets += other.bullets
+        self.years += other.years
+        return self
+
+    def __isub__(self, other: "TextStats") -> "TextStats":
+        for counter, removed in ((self.words, other.words), (self.metrics, other.metrics)):
+            counter.subtract(removed)
+            for key in removed:
+                if counter[key] <= 0:
+                    del counter[key]
+        self.verbs -= other.verbs
+        self.verb_lines -= other.verb_lines
+        self.bullets -= other.bullets
+        self.years -= other.years
+        return self
+
+    def __add__(self, other: "TextStats") -> "TextStats":
+        combined = TextStats()
+        combined += self
+        combined += other
+        return combined
+
+    def keywords(self, min_length: int = 3, stop_words: Iterable[str] = STOP_WORDS) -> Set[str]:
+        """Distinct non-stop words of at least ``min_length`` letters."""
+        return {w for w in self.words if len(w) >= min_length and w not in stop_words}
+
+    @property
+    def verb_count(self) -> int:
+        """Number of action verb occurrences."""
+        return self.verbs
+
+    @property
+    def has_bullets(self) -> bool:
+        """Whether any bullet marker followed by whitespace was seen."""
+        return self.bullets > 0
+
+    @property
+    def has_year(self) -> bool:
+        """Whether any run of four or more digits was seen."""
+        return self.years > 0
+
+    def metric_count(self, kinds: Iterable[str] = ATS_METRIC_KINDS) -> int:
+        """Number of metric matches across the given metric kinds."""
+        return sum(self.metrics[kind] for kind in kinds)
+
+    def section_hits(self) -> Set[str]:
+        """Section heading words present in the text."""
+        return SECTION_HEADINGS.intersection(self.words)
+
+
+def combine_stats(stats: Iterable[TextStats]) -> TextStats:
+    """Sum several ``TextStats`` into one."""
+    total = TextStats()
+    for item in stats:
+        total += item
+    return total
+
+
+def analyze_text(text: Optional[str]) -> TextStats:
+    """
+    Analyze text in a single tokenizer pass.
+
+    Args:
+        text: Text to analyze
+
+    Returns:
+        TextStats with word counts, metric counts per kind, lines that start
+        with an action verb, and bullet/year flags
+    """
+    stats = TextStats()
+    if not text:
+        return stats
+
+    lowered = text.lower()
+    words = stats.words
+    metrics = stats.metrics
+    # Position each metric kind has consumed up to (findall is non-overlapping)
+    metric_ends: Dict[str, int] = {}
+    line_start = 0
+    line_has_token = False
+
+    for match in _TOKEN_RE.finditer(lowered):
+        kind = match.lastgroup
+        start = match.start()
+
+        if kind == 'word':
+            word = match.group()
+            words[word] += 1
+            if word in ACTION_VERBS:
+                stats.verbs += 1
+            if not line_has_token:
+                line_has_token = True
+                # Stripped line starts with "<verb> "
+                if (word in ACTION_VERBS and _LINE_CONTINUES_RE.match(lowered, match.end())
+                        and (start == line_start or lowered[line_start:start].isspace())):
+                    stats.verb_lines += 1
+        elif kind == 'number':
+            line_has_token = True
+            if len(match.group()) >= 4:
+                stats.years += 1
+            if start > 0 and lowered[start - 1] == '$' and metric_ends.get('currency', 0) <= start - 1:
+                found = _CURRENCY_RE.match(lowered, start - 1)
+                if found:
+                    metrics['currency'] += 1
+                    metric_ends['currency'] = found.end()
+            for name, pattern in METRIC_PATTERNS.items():
+                if metric_ends.get(name, 0) > start:
+                    continue
+                found = pattern.match(lowered, start)
+                if found:
+                    metrics[name] += 1
+                    metric_ends[name] = found.end()
+        elif kind == 'bullet':
+            line_has_token = True
+            stats.bullets += 1
+        else:
+            line_start = match.end()
+            line_has_token = False
+
+    return stats
+
+
+def analyze_fields(fields: Iterable[Tuple[str, Optional[str]]]) -> Dict[str, TextStats]:
+    """Analyze several named text fields, one pass per field."""
+    return {name: analyze_text(text) for name, text in fields}
+
+
+# Text attributes scored for each list section of a resume
+SCORED_ATTRIBUTES = {
+    'experience': ('position', 'description'),
+    'education': ('degree', 'field'),
+    'skills': ('name',),
+    'projects': ('name', 'description'),
+    'achievements': ('title', 'description'),
+}
+
+# Resume sections that contribute scored text, in resume order
+SCORED_SECTIONS = ('personal', 'summary', 'experience', 'education', 'skills', 'projects', 'achievements')
+
+# A selection of fields: (section, attributes) pairs; no attributes selects all
+FieldSpec = Tuple[Tuple[str, Tuple[str, ...]], ...]
+
+
+def item_fields(section: str, index: int, item) -> List[Tuple[str, Optional[str]]]:
+    """Named text fields for one item of a list section."""
+    return [(f'{section}.{index}.{attr}', getattr(item, attr)) for attr in SCORED_ATTRIBUTES[section]]
+
+
+def section_fields(resume, section: str) -> List[Tuple[str, Optional[str]]]:
+    """Named text fields for one resume section (empty for unscored sections)."""
+    if section == 'personal':
+        if not resume.personal:
+            return []
+        return [('personal.name', resume.personal.firstName + ' ' + resume.personal.lastName)]
+    if section == 'summary':
+        return [('summary', resume.summary)]
+    if section in SCORED_ATTRIBUTES:
+        fields: List[Tuple[str, Optional[str]]] = []
+        for i, item in enumerate(getattr(resume, section)):
+            fields.extend(item_fields(section, i, item))
+        return fields
+    return []
+
+
+def resume_fields(resume) -> List[Tuple[str, Optional[str]]]:
+    """
+    Flatten a ``Resume`` into named text fields used for ATS scoring.
+
+    Field names are dotted paths such as ``experience.2.description``.
+    """
+    fields: List[Tuple[str, Optional[str]]] = []
+    for section in SCORED_SECTIONS:
+        fields.extend(section_fields(resume, section))
+    return fields
+
+
+def field_selected(name: str, spec: FieldSpec) -> bool:
+    """Whether a field name is part of a field selection."""
+    parts = name.split('.')
+    return any(
+        parts[0] == section and (not attributes or parts[-1] in attributes)
+        for section, attributes in spec
+    )
+
+
+class ResumeAnalysis:
+    """Per-field ``TextStats`` for a resume, with helpers to combine them."""
+
+    def __init__(self, fields: Dict[str, TextStats]):
+        self.fields = fields
+
+    def select(self, section: str, *attributes: str) -> TextStats:
+        """
+        Combine stats for a section, optionally restricted to some attributes.
+
+        ``select('experience', 'description')`` combines every
+        ``experience.<i>.description`` field; ``select('summary')`` returns the
+        summary stats.
+        """
+        return self.select_fields(((section, attributes),))
+
+    def select_fields(self, spec: FieldSpec) -> TextStats:
+        """Combine stats for every field in a field selection."""
+        return combine_stats(stats for name, stats in self.fields.items() if field_selected(name, spec))
+
+    def all(self) -> TextStats:
+        """Combine stats for every field (the full resume text)."""
+        return combine_stats(self.fields.values())
+
+
+def analyze_resume_text(resume) -> ResumeAnalysis:
+    """Analyze every scored text field of a resume exactly once."""
+    return ResumeAnalysis(analyze_fields(resume_fields(resume)))
+
+
+# ============================================================================
+# Job description keyword index
+# ============================================================================
+
+class JobDescriptionIndex:
+    """Pre-tokenized keyword sets for a job description."""
+
+    __slots__ = ('keywords', 'technical', 'soft', 'tools')
+
+    def __init__(self, job_desc: str):
+        self.keywords = frozenset(analyze_text(job_desc).keywords(3, STOP_WORDS))
+        self.technical = self.keywords & TECHNICAL_TERMS
+        self.soft = self.keywords & SOFT_SKILL_TERMS
+        self.tools = self.keywords & TOOL_TERMS
+
+    def keywords_for(self, min_length: int = 3, stop_words: Iterable[str] = STOP_WORDS) -> Set[str]:
+        """Keywords restricted to a longer minimum length or a broader stop-word list."""
+        return {w for w in self.keywords if len(w) >= min_length and w not in stop_words}
+
+
+# Shared by every ATS endpoint; job descriptions are re-posted while the user types
+job_index_cache = LRUCache(max_entries=settings.ATS_JOB_CACHE_SIZE, name="ats_job_index")
+
+
+def get_job_index(job_desc: str) -> JobDescriptionIndex:
+    """Return the cached keyword index for a job description, building it on a miss."""
+    return job_index_cache.get_or_set(content_hash(job_desc or ''), lambda: JobDescriptionIndex(job_desc))
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Latency benchmark for resume create and update (autosave).
+
+Runs the create_resume and update_resume routes against an in-memory
+collection that waits a simulated network round-trip on every call, and
+compares them with the previous implementation (insert_one + find_one for
+create; find_one + update_one + find_one for update) and with
+patch_resume for a one-field edit. With the database on another host,
+round-trips dominate, so p50 and p99 scale with the number of calls per
+request. For the same edit, the request body and the update written by
+PUT and PATCH are compared too.
+
+Usage (from backend/):
+    python -m benchmarks.bench_resume_writes [--rtt-ms 2] [--requests 500]
+"""
+import argparse
+import asyncio
+import copy
+import json
+import random
+import time
+from datetime import datetime
+import bson
+from bson import ObjectId
+from pymongo import ReturnDocument
+from app.routers import resumes
+from app.schemas import ResumeCreate
+from app.utils import sanitize_resume_data
+
+RESUME = {
+    "personal": {"firstName": "Ada", "lastName": "Lovelace", "email": "ada@example.com"},
+    "summary": "Engineer working on analytical engines.",
+    "experience": [
+        {"id": f"e{i}", "company": "Analytical Engines", "position": "Engineer", "description": "Built things. " * 20}
+        for i in range(5)
+    ],
+    "skills": [{"id": f"s{i}", "name": f"Skill {i}"} for i in range(20)],
+}
+
+
+class LatencyCollection:
+    """In-memory collection that sleeps one simulated round-trip per call."""
+
+    def __init__(self, rtt_seconds: float):
+        self.rtt_seconds = rtt_seconds
+        self.docs = {}
+        self.last_update = None
+        self.round_trips = 0
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        # Jitter models a shared network and server; a few slow calls drive p99
+        await asyncio.sleep(self.rtt_seconds * random.lognormvariate(0, 0.3))
+
+    async def insert_one(self, doc):
+        await self._round_trip()
+        doc.setdefault("_id", ObjectId())
+        self.docs[doc["_id"]] = copy.deepcopy(doc)
+        return type("InsertOneResult", (), {"inserted_id": doc["_id"]})()
+
+    async def find_one(self, query):
+        await self._round_trip()
+        doc = self.docs.get(query["_id"])
+        return copy.deepcopy(doc) if doc else None
+
+    async def update_one(self, query, update):
+        await self._round_trip()
+        doc = self.docs.get(query["_id"])
+        if doc is not None:
+            doc.update(copy.deepcopy(update["$set"]))
+        return type("UpdateResult", (), {"matched_count": int(doc is not None)})()
+
+    async def find_one_and_update(self, query, update, return_document=ReturnDocument.BEFORE):
+        await self._round_trip()
+        doc = self.docs.get(query["_id"])
+        if doc is None:
+            return None
+        # Enough of $set for the benchmark: top-level fields only
+        doc.update(copy.deepcopy({k: v for k, v in update["$set"].items() if "." not in k}))
+        self.last_update = update
+        return copy.deepcopy(doc)
+
+
+async def previous_create(collection, resume: ResumeCreate):
+    """create_resume before this change: insert, then read the document back."""
+    resume_dict = sanitize_resume_data(resume.model_dump())
+    now = datetime.utcnow()
+    resume_dict["created_at"] = now
+    resume_dict["updated_at"] = now
+    result = await collection.insert_one(resume_dict)
+    return resumes.convert_doc_to_response(await collection.find_one({"_id": result.inserted_id}))
+
+
+async def previous_update(collection, resume_id: str, resume: ResumeCreate):
+    """update_resume before this change: read, update, read again."""
+    object_id = ObjectId(resume_id)
+    existing_doc = await collection.find_one({"_id": object_id})
+    resume_dict = sanitize_resume_data(resume.model_dump())
+    resume_dict["updated_at"] = datetime.utcnow()
+    resume_dict["created_at"] = existing_doc.get("created_at", datetime.utcnow())
+    await collection.update_one({"_id": object_id}, {"$set": resume_dict})
+    return resumes.convert_doc_to_response(await collection.find_one({"_id": object_id}))
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def measure(collection, call, requests: int):
+    """Return (latencies in ms, round-trips per request) for sequential calls."""
+    collection.round_trips = 0
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await call()
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies, collection.round_trips / requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rtt-ms", type=float, default=2.0, help="simulated database round-trip (default: 2)")
+    parser.add_argument("--requests", type=int, default=500, help="requests per case (default: 500)")
+    args = parser.parse_args()
+
+    collection = LatencyCollection(args.rtt_ms / 1000)
+
+    async def get_collection(name):
+        return collection
+
+    resumes.get_collection = get_collection
+    resume = ResumeCreate(**RESUME)
+    resume_id = (await resumes.create_resume(resume)).id
+    # One autosave after editing a single description
+    edit = {"experience.2.description": "Built analytical engines."}
+
+    cases = (
+        ("create (before)", lambda: previous_create(collection, resume)),
+        ("create", lambda: resumes.create_resume(resume)),
+        ("update (before)", lambda: previous_update(collection, resume_id, resume)),
+        ("update", lambda: resumes.update_resume(resume_id, resume)),
+        ("patch", lambda: resumes.patch_resume(resume_id, edit)),
+    )
+    print(f"simulated round-trip: {args.rtt_ms:g} ms, {args.requests} requests per case")
+    print(f"{'case':<16}  {'round-trips':>11}  {'p50 ms':>7}  {'p99 ms':>7}")
+    for name, call in cases:
+        latencies, round_trips = await measure(collection, call, args.requests)
+        print(f"{name:<16}  {round_trips:>11.0f}  {percentile(latencies, 0.5):>7.2f}  {percentile(latencies, 0.99):>7.2f}")
+
+    print()
+    print(f"{'one-field edit':<16}  {'request bytes':>13}  {'update bytes':>12}")
+    for name, body, call in (
+        ("PUT", resume.model_dump(mode="json"), lambda: resumes.update_resume(resume_id, resume)),
+        ("PATCH", edit, lambda: resumes.patch_resume(resume_id, edit)),
+    ):
+        await call()
+        print(f"{name:<16}  {len(json.dumps(body)):>13,}  {len(bson.encode(collection.last_update)):>12,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: time from launching the server to its first response.
+
+Starts uvicorn in a fresh process several times and polls GET / until it
+answers, which covers interpreter start, imports and the app lifespan.
+Import time of app.main alone is reported too (see ``python -m app
+importtime`` for a breakdown). Run it with MONGODB_URI reachable: if the
+startup connection attempt has to time out, that dominates the result.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup
+"""
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+from app.utils_importtime import BACKEND_DIR, measure_imports
+
+RUNS = 5
+# Give up on a run after this long
+TIMEOUT_SECONDS = 60.0
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_request() -> float:
+    """Launch the server and return seconds until GET / succeeds."""
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        with httpx.Client(timeout=1.0) as client:
+            while time.perf_counter() - started < TIMEOUT_SECONDS:
+                if server.poll() is not None:
+                    raise RuntimeError(f"Server exited with code {server.returncode}")
+                try:
+                    if client.get(f"http://127.0.0.1:{port}/").status_code == 200:
+                        return time.perf_counter() - started
+                except httpx.TransportError:
+                    pass
+                time.sleep(0.005)
+        raise RuntimeError(f"No response within {TIMEOUT_SECONDS:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    imports = [sum(record.self_us for record in measure_imports("app.main")) / 1000 for _ in range(RUNS)]
+    first_request = [time_to_first_request() * 1000 for _ in range(RUNS)]
+
+    print(f"{'metric':<24}  {'min ms':>8}  {'median ms':>9}  {'max ms':>8}")
+    for name, samples in (("import app.main", imports), ("time to first request", first_request)):
+        print(f"{name:<24}  {min(samples):>8.0f}  {statistics.median(samples):>9.0f}  {max(samples):>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
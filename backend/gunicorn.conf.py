@@ -0,0 +1,51 @@
+"""
+Gunicorn configuration for running the API with several uvicorn workers.
+
+Usage:
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Worker count and timeouts come from Settings (WEB_* variables). The app is
+imported in each worker after fork (preload_app is off), so module-level
+state (the Mongo client, HTTP clients, caches, parser pool) is created per
+worker, and the app lifespan runs startup and shutdown in every worker.
+"""
+import logging
+from app.config import settings
+
+logger = logging.getLogger("gunicorn.error")
+
+bind = f"0.0.0.0:{settings.PORT}"
+workers = settings.web_worker_count
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = False
+
+timeout = settings.WEB_TIMEOUT_SECONDS
+graceful_timeout = settings.WEB_GRACEFUL_TIMEOUT_SECONDS
+keepalive = settings.WEB_KEEPALIVE_SECONDS
+max_requests = settings.WEB_MAX_REQUESTS
+max_requests_jitter = settings.WEB_MAX_REQUESTS // 10
+
+accesslog = "-"
+errorlog = "-"
+loglevel = "info" if settings.ENV == "prod" else "debug"
+
+
+def when_ready(server):
+    """Log the serving mode once the master is listening."""
+    logger.info(f"Serving with {workers} worker(s) on {bind}")
+    if workers > 1 and settings.RATE_LIMIT_BACKEND == "memory":
+        logger.warning(
+            "RATE_LIMIT_BACKEND=memory keeps a separate budget per worker, so clients get "
+            f"{workers}x the configured limit; use 'shared' or 'redis'"
+        )
+    if workers > 1:
+        logger.warning(
+            "ATS scoring sessions (/api/ats/sessions) live in one worker's memory, so an edit "
+            "routed to another worker gets 404 and the client must start a new session; "
+            "run WEB_WORKERS=1 behind a load balancer with session affinity to keep them"
+        )
+
+
+def post_fork(server, worker):
+    """Log each worker as it starts."""
+    logger.info(f"Worker {worker.pid} started")
@@ -0,0 +1,16 @@
+"""Helper for checking process state in a forked child."""
+import os
+from typing import Callable
+
+
+def check_in_child(check: Callable[[], bool]) -> bool:
+    """Fork, run ``check`` in the child, and return its result to the parent."""
+    pid = os.fork()
+    if pid == 0:
+        try:
+            ok = check()
+        except BaseException:
+            ok = False
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    return os.waitstatus_to_exitcode(status) == 0
@@ -0,0 +1,149 @@
+"""In-process Redis-compatible server for tests.
+
+Implements the handful of RESP commands the API uses, with millisecond key
+expiry, so Redis-backed code paths run without a real server.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.redis_client import read_reply
+
+# A server-side script: (stub, keys, args) -> reply value
+Script = Callable[["RedisStub", List[bytes], List[bytes]], Any]
+
+
+def token_bucket(stub: "RedisStub", keys: List[bytes], args: List[bytes]) -> Any:
+    """Python port of app.rate_limiter.TOKEN_BUCKET_SCRIPT (state kept as "tokens:ts")."""
+    capacity, rate, cost = float(args[0]), float(args[1]), float(args[2])
+    ttl_ms = int(args[3])
+    now = time.time()
+    state = stub._live(keys[0])
+    if state is None:
+        tokens, ts = capacity, now
+    else:
+        tokens, ts = (float(part) for part in state.split(b':'))
+    tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+    allowed = 0
+    if tokens >= cost:
+        tokens -= cost
+        allowed = 1
+    stub.data[keys[0]] = (b'%r:%r' % (tokens, now), time.monotonic() + ttl_ms / 1000)
+    return [allowed, repr(tokens).encode()]
+
+
+class RedisStub:
+    """
+    Minimal Redis stand-in listening on localhost.
+
+    Lua scripts cannot run here, so each script the API sends is registered
+    with an equivalent Python function; EVAL of an unregistered script fails.
+    """
+
+    def __init__(self):
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands: List[bytes] = []
+        self.scripts: Dict[bytes, Script] = {}
+        self.cached_scripts: set = set()
+        from app.rate_limiter import TOKEN_BUCKET_SCRIPT
+        self.register_script(TOKEN_BUCKET_SCRIPT, token_bucket)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.port = 0
+
+    @property
+    def url(self) -> str:
+        return f"redis://127.0.0.1:{self.port}/0"
+
+    async def start(self) -> "RedisStub":
+        self._server = await asyncio.start_server(self._handle, '127.0.0.1', 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def register_script(self, source: str, script: Script) -> None:
+        """Make EVAL of ``source`` run ``script``."""
+        self.scripts[hashlib.sha1(source.encode('utf-8')).hexdigest().encode()] = script
+
+    def _eval(self, sha: bytes, args: List[bytes]) -> Any:
+        script = self.scripts.get(sha)
+        if script is None:
+            return RuntimeError("ERR script not supported by the stub")
+        self.cached_scripts.add(sha)
+        numkeys = int(args[0])
+        return script(self, args[1:1 + numkeys], args[1 + numkeys:])
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    def run(self, args: List[bytes]) -> Any:
+        """Execute one command and return its reply value."""
+        name = args[0].upper()
+        self.commands.append(name)
+        if name == b'PING':
+            return 'PONG'
+        if name == b'SELECT':
+            return 'OK'
+        if name == b'GET':
+            return self._live(args[1])
+        if name == b'SET':
+            expires_at = None
+            if len(args) >= 5 and args[3].upper() == b'PX':
+                expires_at = time.monotonic() + int(args[4]) / 1000
+            elif len(args) >= 5 and args[3].upper() == b'EX':
+                expires_at = time.monotonic() + int(args[4])
+            self.data[args[1]] = (args[2], expires_at)
+            return 'OK'
+        if name == b'DEL':
+            return sum(1 for key in args[1:] if self.data.pop(key, None) is not None)
+        if name == b'EVAL':
+            return self._eval(hashlib.sha1(args[1]).hexdigest().encode(), args[2:])
+        if name == b'EVALSHA':
+            sha = args[1].lower()
+            if sha not in self.cached_scripts:
+                return RuntimeError("NOSCRIPT No matching script. Please use EVAL.")
+            return self._eval(sha, args[2:])
+        if name == b'SCRIPT' and args[1].upper() == b'FLUSH':
+            self.cached_scripts.clear()
+            return 'OK'
+        if name == b'FLUSHDB':
+            self.data.clear()
+            return 'OK'
+        return RuntimeError(f"ERR unknown command '{name.decode()}'")
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if value is None:
+            return b'$-1\r\n'
+        if isinstance(value, RuntimeError):
+            return b'-%s\r\n' % str(value).encode()
+        if isinstance(value, str):
+            return b'+%s\r\n' % value.encode()
+        if isinstance(value, int):
+            return b':%d\r\n' % value
+        if isinstance(value, bytes):
+            return b'$%d\r\n%s\r\n' % (len(value), value)
+        if isinstance(value, list):
+            return b'*%d\r\n' % len(value) + b''.join(RedisStub._encode(item) for item in value)
+        raise TypeError(f"Cannot encode {type(value)}")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                args = await read_reply(reader)
+                writer.write(self._encode(self.run(args)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,118 @@
+"""Tests for batch ATS scoring."""
+import asyncio
+from functools import partial
+import orjson
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+from app.config import settings
+from app.routers import ats
+from app.routers.ats import score_batch, score_resume, score_resume_job, stream_batch
+from app.schemas import ATSBatchRequest, ATSResponse, Resume
+
+
+JOB_DESC = "Senior Python engineer with Docker experience and team leadership"
+
+
+def make_resume(description: str) -> dict:
+    """Build a minimal resume with one experience entry."""
+    return {
+        "personal": {"firstName": "Jane", "lastName": "Doe", "email": "jane@example.com"},
+        "experience": [
+            {"id": "1", "company": "Acme", "position": "Engineer", "description": description},
+        ],
+    }
+
+
+async def collect(lines) -> list:
+    """Decode every NDJSON line yielded by a stream."""
+    return [orjson.loads(line) async for line in lines]
+
+
+class TestBatchScoring:
+    """Tests for /api/ats/score-batch."""
+
+    @pytest.mark.asyncio
+    async def test_results_match_single_scoring_and_are_ranked(self):
+        """Each result equals /score for that resume; the summary ranks by score."""
+        resumes = [
+            make_resume("Wrote code"),
+            make_resume("Led team of 5 Python engineers\nReduced Docker build time by 40%"),
+            make_resume("Managed 3 projects"),
+        ]
+        request = ATSBatchRequest(resumes=resumes, jobDesc=JOB_DESC)
+        response = await score_batch(request)
+        assert response.media_type == "application/x-ndjson"
+        lines = await collect(response.body_iterator)
+
+        results = {line["index"]: line for line in lines if line["type"] == "result"}
+        assert sorted(results) == [0, 1, 2]
+        for index, resume in enumerate(request.resumes):
+            expected = score_resume(resume, JOB_DESC)
+            assert results[index]["score"] == expected.score
+            assert results[index]["breakdown"]["verbs"] == expected.breakdown["verbs"]
+
+        summary = lines[-1]
+        assert summary["type"] == "summary"
+        assert (summary["total"], summary["scored"], summary["failed"]) == (3, 3, 0)
+        scores = [item["score"] for item in summary["ranking"]]
+        assert scores == sorted(scores, reverse=True)
+        assert [item["rank"] for item in summary["ranking"]] == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_is_rejected(self):
+        """An empty batch is a client error."""
+        with pytest.raises(HTTPException) as exc_info:
+            await score_batch(ATSBatchRequest(resumes=[], jobDesc=JOB_DESC))
+        assert exc_info.value.status_code == 400
+
+    def test_oversized_batch_fails_validation(self):
+        """A batch over the limit is rejected by the schema, before it is scored."""
+        resumes = [make_resume("Wrote code")] * (settings.ATS_BATCH_MAX_RESUMES + 1)
+        with pytest.raises(ValidationError, match="too_long|at most"):
+            ATSBatchRequest(resumes=resumes, jobDesc=JOB_DESC)
+
+
+class TestStreamBatch:
+    """Tests for the NDJSON batch stream."""
+
+    @pytest.mark.asyncio
+    async def test_streams_in_completion_order_with_errors(self):
+        """Faster jobs are streamed first and failures become error lines."""
+        async def job(score: int, delay: float) -> ATSResponse:
+            await asyncio.sleep(delay)
+            return ATSResponse(score=score)
+
+        jobs = [
+            ({"index": 0}, lambda: job(50, 0.05)),
+            ({"index": 1}, lambda: job(90, 0.01)),
+            ({"index": 2}, HTTPException(status_code=400, detail="Unsupported file type")),
+        ]
+        lines = await collect(stream_batch(jobs))
+
+        assert [line["type"] for line in lines] == ["error", "result", "result", "summary"]
+        assert [line["index"] for line in lines[:3]] == [2, 1, 0]
+        assert lines[0]["status"] == 400
+        assert [item["index"] for item in lines[-1]["ranking"]] == [1, 0]
+        assert lines[-1]["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_first_line_streams_before_batch_is_scored(self, monkeypatch):
+        """Structured resumes are scored between streamed lines, not all up front."""
+        scored = []
+
+        def counting_score(resume, job_desc):
+            scored.append(resume)
+            return score_resume(resume, job_desc)
+
+        monkeypatch.setattr(ats, "score_resume", counting_score)
+        resume = Resume(**make_resume("Led team of 5 Python engineers"))
+        jobs = [({"index": index}, partial(score_resume_job, resume, JOB_DESC)) for index in range(20)]
+        stream = stream_batch(jobs)
+        try:
+            assert orjson.loads(await stream.__anext__())["type"] == "result"
+            assert len(scored) < len(jobs)
+            lines = [orjson.loads(line) async for line in stream]
+        finally:
+            await stream.aclose()
+        assert lines[-1]["scored"] == 20
@@ -0,0 +1,76 @@
+"""Tests for incremental ATS scoring sessions."""
+import pytest
+from app.routers.ats import ATSSession, get_ats_score
+from app.schemas import ATSRequest, ATSSessionUpdate, Resume
+
+
+RESUME = {
+    "personal": {"firstName": "Jane", "lastName": "Doe", "email": "jane@example.com"},
+    "summary": "Backend engineer working with Python",
+    "experience": [
+        {"id": "1", "company": "Acme", "position": "Engineer", "startDate": "2020-01",
+         "description": "Led team of 5 engineers\nReduced latency by 30%"},
+        {"id": "2", "company": "Beta", "position": "Developer", "description": "Wrote code"},
+    ],
+    "skills": [{"id": "s1", "name": "Python"}],
+    "projects": [{"id": "p1", "name": "Tool", "description": "Built a CLI used by 200 users"}],
+}
+JOB_DESC = "Senior Python engineer with Docker experience and team leadership"
+
+
+async def full_score(resume: Resume, job_desc: str) -> dict:
+    """Score a resume from scratch."""
+    response = await get_ats_score(ATSRequest(resume=resume.model_dump(), jobDesc=job_desc))
+    return response.model_dump()
+
+
+def assert_same_scores(session: ATSSession, expected: dict) -> None:
+    """Session results match a full rescore (ignoring keyword list order)."""
+    actual = session.response([]).model_dump()
+    assert actual["score"] == expected["score"]
+    for category in ("keywords", "verbs", "metrics", "sections", "experience"):
+        assert actual["breakdown"][category] == expected["breakdown"][category]
+    assert actual["breakdown"]["details"]["verbs"] == expected["breakdown"]["details"]["verbs"]
+    assert actual["breakdown"]["details"]["metrics"] == expected["breakdown"]["details"]["metrics"]
+
+
+class TestATSSession:
+    """Tests for ATSSession incremental rescoring."""
+
+    @pytest.mark.asyncio
+    async def test_leaf_edit_matches_full_rescore(self):
+        """Editing one description recomputes only dependent categories."""
+        session = ATSSession(Resume(**RESUME), JOB_DESC)
+        recomputed = session.apply(ATSSessionUpdate(changes=[
+            {"path": "experience.1.description", "value": "Developed 3 services\nManaged $10,000 budget with Docker"},
+        ]))
+        assert recomputed == ["experience", "keywords", "metrics", "sections", "verbs"]
+        assert_same_scores(session, await full_score(session.resume, JOB_DESC))
+
+    @pytest.mark.asyncio
+    async def test_skills_edit_skips_unrelated_categories(self):
+        """Skill edits do not touch verb, metric or experience categories."""
+        session = ATSSession(Resume(**RESUME), JOB_DESC)
+        recomputed = session.apply(ATSSessionUpdate(changes=[
+            {"path": "skills.1", "value": {"id": "s2", "name": "Docker"}},
+        ]))
+        assert recomputed == ["keywords", "sections"]
+        assert_same_scores(session, await full_score(session.resume, JOB_DESC))
+
+    @pytest.mark.asyncio
+    async def test_remove_and_job_desc_change(self):
+        """Removing items and changing the job description stay consistent."""
+        session = ATSSession(Resume(**RESUME), JOB_DESC)
+        session.apply(ATSSessionUpdate(
+            changes=[{"path": "experience.0", "op": "remove"}],
+            jobDesc="Developer writing code",
+        ))
+        assert len(session.resume.experience) == 1
+        assert_same_scores(session, await full_score(session.resume, "Developer writing code"))
+
+    def test_invalid_change_is_rejected(self):
+        """Invalid values fail validation without corrupting the session."""
+        session = ATSSession(Resume(**RESUME), JOB_DESC)
+        with pytest.raises(ValueError):
+            session.apply(ATSSessionUpdate(changes=[{"path": "experience.0.company", "value": ""}]))
+        assert session.resume.experience[0].company == "Acme"
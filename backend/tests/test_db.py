@@ -0,0 +1,168 @@
+"""Tests for the background MongoDB connection and readiness."""
+import asyncio
+import json
+import pytest
+from fastapi import HTTPException
+from pymongo.errors import OperationFailure, ServerSelectionTimeoutError
+from app import db
+from app.config import settings
+from app.main import liveness, readiness
+from app.routers.resumes import check_database_configured, database_error
+
+
+class FakeClient:
+    """Stand-in for a connected motor client."""
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def __getitem__(self, database):
+        return {"resumes": f"{database}.resumes"}
+
+
+@pytest.fixture
+async def mongo(monkeypatch):
+    """Fast retries and a scripted connection outcome per attempt."""
+    monkeypatch.setattr(settings, "MONGODB_URI", "mongodb://db.example:27017/resumegenie")
+    monkeypatch.setattr(settings, "MONGO_CONNECT_RETRIES", 2)
+    monkeypatch.setattr(settings, "MONGO_CONNECT_BACKOFF_BASE_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "MONGO_CONNECT_BACKOFF_MAX_SECONDS", 0.01)
+    for name, value in (
+        ("_connect_attempts", 0), ("_failed_rounds", 0), ("_retry_at", 0.0),
+        ("_negative_hits", 0), ("_last_error", None),
+    ):
+        monkeypatch.setattr(db, name, value)
+    outcomes = []
+
+    async def open_client():
+        await asyncio.sleep(0)
+        outcome = outcomes.pop(0) if outcomes else ConnectionError("timed out")
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(db, "_open_client", open_client)
+    await db.close_db()
+    yield outcomes
+    await db.close_db()
+
+
+class TestBackgroundConnect:
+    """Tests for connecting without blocking startup or requests."""
+
+    @pytest.mark.asyncio
+    async def test_requests_do_not_wait_for_connection(self, mongo):
+        """get_db returns at once while connecting, then the connected client."""
+        client = FakeClient()
+        mongo.extend([ConnectionError("refused"), ConnectionError("refused"), client])
+        await db.connect_to_mongo()
+        assert await db.get_db() is None
+        assert db.database_status()["state"] == "connecting"
+
+        await db._connect_task
+        assert await db.get_db() is client
+        status = db.database_status()
+        assert (status["state"], status["attempts"], status["last_error"]) == ("connected", 3, None)
+        assert await db.get_collection("resumes") == "resumegenie.resumes"
+
+    @pytest.mark.asyncio
+    async def test_failure_is_cached_until_next_round(self, mongo):
+        """After a failed round, requests fail fast without connecting until the scheduled retry."""
+        await db.connect_to_mongo()
+        await db._connect_task
+        status = db.database_status()
+        assert (status["state"], status["attempts"], status["last_error"]) == ("unavailable", 3, "timed out")
+        assert 0 < status["retry_in_seconds"] <= settings.MONGO_RECONNECT_BASE_SECONDS
+
+        for _ in range(10):
+            assert await db.get_collection("resumes") is None
+        assert db.database_status()["state"] == "unavailable"
+        assert db.database_status()["fast_failures"] == 10
+
+        db._retry_at = 0.0
+        assert await db.get_collection("resumes") is None
+        assert db.database_status()["state"] == "connecting"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_attempt(self, mongo):
+        """A burst of requests during an outage starts a single connection check."""
+        opened = []
+        client = FakeClient()
+
+        async def open_client():
+            opened.append(1)
+            await asyncio.sleep(0.01)
+            return client
+
+        db._open_client = open_client
+        results = await asyncio.gather(*(db.get_db() for _ in range(50)))
+        assert results == [None] * 50
+        await db._connect_task
+        assert len(opened) == 1
+        assert await db.get_db() is client
+
+    def test_reconnect_delay_doubles_and_caps(self, mongo):
+        """Pauses between failed rounds grow exponentially up to the maximum."""
+        base = settings.MONGO_RECONNECT_BASE_SECONDS
+        assert [db._reconnect_delay(n) for n in (1, 2, 3)] == [base, 2 * base, 4 * base]
+        assert db._reconnect_delay(50) == settings.MONGO_RECONNECT_MAX_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_lost_connection_fails_fast(self, mongo):
+        """A connection error from an operation marks the database down until a check succeeds."""
+        client = FakeClient()
+        mongo.extend([client, client])
+        await db.connect_to_mongo()
+        await db._connect_task
+
+        error = database_error(ServerSelectionTimeoutError("No servers found"), "retrieving resume")
+        assert error.status_code == 503
+        assert await db.get_db() is None
+        await db._connect_task
+        assert await db.get_db() is client
+
+        other = database_error(OperationFailure("bad query"), "retrieving resume")
+        assert other.status_code == 500
+        assert await db.get_db() is client
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_database_is_disabled(self, mongo, monkeypatch):
+        """Without MONGODB_URI nothing connects and routes report 501."""
+        monkeypatch.setattr(settings, "MONGODB_URI", "")
+        await db.connect_to_mongo()
+        assert await db.get_db() is None
+        assert db._connect_task is None
+        with pytest.raises(HTTPException) as exc:
+            check_database_configured(None)
+        assert exc.value.status_code == 501
+
+
+class TestHealthProbes:
+    """Tests for the liveness and readiness endpoints."""
+
+    @pytest.mark.asyncio
+    async def test_not_ready_until_connected(self, mongo):
+        """Readiness is 503 while connecting and database routes fail fast; liveness stays ok."""
+        await db.connect_to_mongo()
+        response = await readiness()
+        assert response.status_code == 503
+        assert json.loads(response.body)["db"]["state"] == "connecting"
+        assert await liveness() == {"status": "ok"}
+
+        with pytest.raises(HTTPException) as exc:
+            check_database_configured(await db.get_collection("resumes"))
+        assert exc.value.status_code == 503
+        assert "Retry-After" in exc.value.headers
+
+    @pytest.mark.asyncio
+    async def test_ready_when_connected(self, mongo):
+        """Readiness is 200 once the database is connected."""
+        mongo.append(FakeClient())
+        await db.connect_to_mongo()
+        await db._connect_task
+        response = await readiness()
+        assert response.status_code == 200
+        assert json.loads(response.body)["status"] == "ready"
@@ -0,0 +1,534 @@
+"""Tests for the Gemini API client."""
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+from app import gemini_client
+from app.gemini_client import (
+    GeminiRoutingPool,
+    ServiceAccountTokenProvider,
+    call_gemini_api,
+    close_http_client,
+    generate_suggestions,
+    get_http_client,
+    stream_gemini_api,
+    stream_suggestions,
+)
+from app.cache import SingleFlight
+from app.redis_client import RedisClient, RedisError
+from app.response_cache import MemoryResponseStore, RedisResponseStore, ResponseCache, response_cache
+from app.upstream import AdaptiveLimiter, CircuitBreaker, UpstreamGovernor
+from tests.forking import check_in_child
+from tests.redis_stub import RedisStub
+
+
+def gemini_reply(text: str) -> dict:
+    """Build a generateContent response body."""
+    return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+@pytest.fixture
+async def mock_gemini(monkeypatch):
+    """Route the shared Gemini client to an in-process handler recording requests."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=gemini_reply("Generated text"))
+
+    monkeypatch.setattr(
+        gemini_client,
+        "_create_http_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    gemini_client._http_client = None
+    await response_cache.clear()
+    yield requests
+    gemini_client._http_client = None
+    await response_cache.clear()
+
+
+class TestSharedHttpClient:
+    """Tests for the pooled, application-scoped HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_calls_reuse_one_client(self, mock_gemini):
+        """Consecutive calls share the same client instead of opening new ones."""
+        client = get_http_client()
+        assert await call_gemini_api("first prompt") == "Generated text"
+        assert await call_gemini_api("second prompt") == "Generated text"
+        assert get_http_client() is client
+        assert len(mock_gemini) == 2
+
+    @pytest.mark.asyncio
+    async def test_full_prompt_is_sent(self, mock_gemini):
+        """Log redaction does not truncate the prompt that is sent."""
+        prompt = "word " * 100
+        await call_gemini_api(prompt)
+        payload = json.loads(mock_gemini[0].content)
+        assert payload["contents"][0]["parts"][0]["text"] == prompt.strip()
+
+    @pytest.mark.asyncio
+    async def test_forked_worker_opens_own_client(self, mock_gemini):
+        """Pooled connections are not inherited across fork."""
+        client = get_http_client()
+        assert check_in_child(lambda: gemini_client._http_client is None and get_http_client() is not client)
+        assert get_http_client() is client
+
+    @pytest.mark.asyncio
+    async def test_close_and_reopen(self, mock_gemini):
+        """Closing releases the client; the next call opens a fresh one."""
+        client = get_http_client()
+        await close_http_client()
+        assert client.is_closed
+        assert get_http_client() is not client
+
+
+class TestResponseCache:
+    """Tests for the Gemini response cache."""
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_hit_cache(self, mock_gemini):
+        """Repeated prompts (ignoring whitespace) are served without a request."""
+        await call_gemini_api("Rewrite  this\nbullet", temperature=0.7, max_tokens=100)
+        await call_gemini_api("Rewrite this bullet", temperature=0.7, max_tokens=100)
+        assert len(mock_gemini) == 1
+        assert response_cache.stats()["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_settings_are_part_of_key(self, mock_gemini):
+        """A different temperature or token limit is a different entry."""
+        await call_gemini_api("Prompt", temperature=0.7, max_tokens=100)
+        await call_gemini_api("Prompt", temperature=0.2, max_tokens=100)
+        await call_gemini_api("Prompt", temperature=0.7, max_tokens=200)
+        assert len(mock_gemini) == 3
+
+    @pytest.mark.asyncio
+    async def test_opt_out_skips_lookup(self, mock_gemini):
+        """use_cache=False always calls the API."""
+        await call_gemini_api("Prompt")
+        await call_gemini_api("Prompt", use_cache=False)
+        assert len(mock_gemini) == 2
+
+    @pytest.mark.asyncio
+    async def test_memory_entries_expire(self):
+        """Entries older than the TTL are misses."""
+        cache = ResponseCache(MemoryResponseStore(10), ttl_seconds=0.05)
+        await cache.set("key", "value")
+        assert await cache.get("key") == "value"
+        await asyncio.sleep(0.06)
+        assert await cache.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_backend(self):
+        """The Redis backend stores responses with a server-side expiry."""
+        stub = await RedisStub().start()
+        client = RedisClient(stub.url)
+        try:
+            cache = ResponseCache(RedisResponseStore(client), ttl_seconds=60)
+            await cache.set("key", "cached text")
+            assert await cache.get("key") == "cached text"
+            _, expires_at = stub.data[b"resumegenie:gemini:key"]
+            assert expires_at is not None
+        finally:
+            await client.close()
+            await stub.stop()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_backend_is_a_miss(self):
+        """Backend errors never fail the call."""
+        cache = ResponseCache(RedisResponseStore(RedisClient("redis://127.0.0.1:1/0", timeout=0.2)), ttl_seconds=60)
+        await cache.set("key", "value")
+        assert await cache.get("key") is None
+        assert cache.stats()["errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unresponsive_backend_is_skipped(self):
+        """After one timeout, lookups miss at once instead of waiting on the server."""
+        accepted = []
+
+        async def blackhole(reader, writer):
+            accepted.append(writer)
+
+        server = await asyncio.start_server(blackhole, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RedisClient(f"redis://127.0.0.1:{port}/0", timeout=0.2, backoff_base=60)
+        cache = ResponseCache(RedisResponseStore(client), ttl_seconds=60)
+        try:
+            assert await cache.get("key") is None
+            assert not client.available
+
+            started = time.monotonic()
+            results = await asyncio.gather(*(cache.get(f"key{i}") for i in range(20)))
+            assert results == [None] * 20
+            assert time.monotonic() - started < 0.1
+            assert len(accepted) == 1
+            assert cache.stats()["errors"] == 21
+        finally:
+            for writer in accepted:
+                writer.close()
+            server.close()
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_stalled_write_times_out(self):
+        """A server that stops reading cannot hold a write past the timeout."""
+        accepted = []
+
+        async def blackhole(reader, writer):
+            accepted.append(writer)
+
+        server = await asyncio.start_server(blackhole, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RedisClient(f"redis://127.0.0.1:{port}/0", timeout=0.2, backoff_base=60)
+        try:
+            started = time.monotonic()
+            # Far more than the socket buffers hold, so drain() waits on the server
+            with pytest.raises(RedisError, match="TimeoutError"):
+                await client.set("key", b"x" * (64 * 1024 * 1024))
+            assert time.monotonic() - started < 1
+        finally:
+            for writer in accepted:
+                writer.close()
+            server.close()
+            await client.close()
+
+
+class TestStreamGeminiApi:
+    """Tests for streamGenerateContent over server-sent events."""
+
+    @pytest.fixture
+    async def sse_gemini(self, monkeypatch):
+        requests = []
+        body = "".join(f"data: {json.dumps(gemini_reply(text))}\r\n\r\n" for text in ("Hello ", "world"))
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, text=body, headers={"Content-Type": "text/event-stream"})
+
+        monkeypatch.setattr(
+            gemini_client,
+            "_create_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        gemini_client._http_client = None
+        await response_cache.clear()
+        yield requests
+        gemini_client._http_client = None
+        await response_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_yields_chunks_and_caches(self, sse_gemini):
+        """Chunks arrive in order; the joined text is cached for later calls."""
+        chunks = [chunk async for chunk in stream_gemini_api("Prompt")]
+        assert chunks == ["Hello ", "world"]
+        assert sse_gemini[0].url.path.endswith(":streamGenerateContent")
+        assert sse_gemini[0].url.params["alt"] == "sse"
+
+        assert [chunk async for chunk in stream_gemini_api("Prompt")] == ["Hello world"]
+        assert len(sse_gemini) == 1
+
+
+class TestStreamSuggestions:
+    """Tests for line-by-line suggestion streaming."""
+
+    @staticmethod
+    def fake_stream(*chunks: str):
+        calls = {"closed": False}
+
+        async def stream(prompt: str, **kwargs):
+            try:
+                for chunk in chunks:
+                    yield chunk
+            finally:
+                calls["closed"] = True
+        return stream, calls
+
+    @pytest.mark.asyncio
+    async def test_lines_cleaned_like_batch(self, monkeypatch):
+        """Lines split across chunks are cleaned exactly as generate_suggestions does."""
+        text = "# Suggestions\n1. Led a team of 5\n- Cut costs by 20%\n\n* Shipped v2"
+        stream, _ = self.fake_stream("# Sugg", "estions\n1. Led a te", "am of 5\n- Cut costs by 20%\n", "\n* Shipped v2")
+        monkeypatch.setattr(gemini_client, "stream_gemini_api", stream)
+        monkeypatch.setattr(gemini_client, "call_gemini_api", lambda prompt, **kwargs: asyncio.sleep(0, text))
+
+        streamed = [s async for s in stream_suggestions("bullet", "Managed team", count=5)]
+        assert streamed == ["Led a team of 5", "Cut costs by 20%", "Shipped v2"]
+        assert streamed == await generate_suggestions("bullet", "Managed team", count=5)
+
+    @pytest.mark.asyncio
+    async def test_stops_reading_at_count(self, monkeypatch):
+        """The upstream stream is closed once enough suggestions are sent."""
+        stream, calls = self.fake_stream("One\nTwo\n", "Three\n")
+        monkeypatch.setattr(gemini_client, "stream_gemini_api", stream)
+
+        assert [s async for s in stream_suggestions("rewrite", "text", count=2)] == ["One", "Two"]
+        assert calls["closed"]
+
+    @pytest.mark.asyncio
+    async def test_fallback_when_nothing_survives_cleaning(self, monkeypatch):
+        """A response with no usable lines yields the raw-text fallback."""
+        stream, _ = self.fake_stream("1.\n", "- ")
+        monkeypatch.setattr(gemini_client, "stream_gemini_api", stream)
+
+        assert [s async for s in stream_suggestions("rewrite", "text", count=2)] == ["1.\n-"]
+
+
+class TestSingleFlight:
+    """Tests for coalescing concurrent identical calls."""
+
+    @pytest.mark.asyncio
+    async def test_burst_costs_one_call(self, monkeypatch):
+        """Concurrent identical prompts share one upstream request."""
+        requests = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=gemini_reply("Shared"))
+
+        monkeypatch.setattr(
+            gemini_client,
+            "_create_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        monkeypatch.setattr(gemini_client, "gemini_single_flight", SingleFlight(name="gemini"))
+        gemini_client._http_client = None
+        await response_cache.clear()
+        try:
+            results = await asyncio.gather(*(call_gemini_api("Same  prompt") for _ in range(5)))
+            await call_gemini_api("Other prompt")
+        finally:
+            gemini_client._http_client = None
+            await response_cache.clear()
+
+        assert results == ["Shared"] * 5
+        assert len(requests) == 2
+        stats = gemini_client.gemini_single_flight.stats()
+        assert stats["calls"] == 2
+        assert stats["coalesced"] == 4
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.asyncio
+    async def test_errors_shared_and_not_retained(self):
+        """A failure reaches every waiter; the next call starts afresh."""
+        flight = SingleFlight()
+        attempts = []
+
+        async def fail():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+
+        results = await asyncio.gather(flight.do("key", fail), flight.do("key", fail), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await flight.do("key", fail)
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """One caller disconnecting leaves the shared call running."""
+        flight = SingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flight.do("key", slow))
+        second = asyncio.create_task(flight.do("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "done"
+
+
+class TestRoutingPool:
+    """Tests for spreading calls across keys and models."""
+
+    def test_weighted_least_loaded(self):
+        """A key with twice the weight takes twice the concurrent calls."""
+        pool = GeminiRoutingPool([("key-a", 1.0), ("key-b", 2.0)], [("gemini-pro", 8)], 60)
+        chosen = [pool.acquire().api_key for _ in range(6)]
+        assert chosen.count("key-a") == 2
+        assert chosen.count("key-b") == 4
+
+    def test_throttled_key_quarantined(self):
+        """A 429 takes the key out of rotation until its Retry-After passes."""
+        pool = GeminiRoutingPool([("key-a", 1.0), ("key-b", 1.0)], [("gemini-pro", 8)], 60)
+        route = pool.acquire()
+        pool.release(route, 429, retry_after=30)
+        assert all(pool.acquire().api_key != route.api_key for _ in range(3))
+        assert pool.stats()["keys"][route.key.index]["throttled"] == 1
+
+        # The last key in rotation is never quarantined; the governor backs off instead
+        other = pool.acquire()
+        pool.release(other, 429)
+        assert pool.acquire().api_key == other.api_key
+        assert pool.stats()["keys"][other.key.index]["quarantined_seconds"] == 0
+
+    def test_fallback_model_when_saturated(self):
+        """When the primary model is full on every key, the next model is used."""
+        pool = GeminiRoutingPool([("key-a", 1.0)], [("gemini-pro", 1), ("gemini-flash", 2)], 60)
+        first = pool.acquire()
+        second = pool.acquire()
+        assert (first.model, second.model) == ("gemini-pro", "gemini-flash")
+        assert pool.stats()["fallbacks"] == 1
+        pool.release(first, 200)
+        assert pool.acquire().model == "gemini-pro"
+
+    @pytest.mark.asyncio
+    async def test_retry_moves_to_another_key(self, monkeypatch):
+        """A 429 from one key is retried on the other key."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request.url.params["key"])
+            if request.url.params["key"] == "key-a":
+                return httpx.Response(429, json={"error": {"message": "quota"}})
+            return httpx.Response(200, json=gemini_reply("From key b"))
+
+        monkeypatch.setattr(
+            gemini_client,
+            "_create_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        monkeypatch.setattr(
+            gemini_client, "gemini_pool",
+            GeminiRoutingPool([("key-a", 1.0), ("key-b", 1.0)], [("gemini-pro", 8)], 60),
+        )
+        monkeypatch.setattr(gemini_client, "gemini_governor", UpstreamGovernor(
+            AdaptiveLimiter(initial=4), CircuitBreaker(5, 30), backoff_base=0.001, backoff_max=0.05,
+        ))
+        gemini_client._http_client = None
+        await response_cache.clear()
+        try:
+            assert await call_gemini_api("Prompt", use_cache=False) == "From key b"
+        finally:
+            gemini_client._http_client = None
+            await response_cache.clear()
+        assert requests == ["key-a", "key-b"]
+
+    @pytest.mark.asyncio
+    async def test_single_key_retried_after_429(self, monkeypatch):
+        """With one key, a 429 is retried on that key after backoff instead of failing for the quarantine."""
+        replies = [httpx.Response(429, json={"error": {"message": "quota"}}),
+                   httpx.Response(200, json=gemini_reply("Second try"))]
+
+        monkeypatch.setattr(
+            gemini_client,
+            "_create_http_client",
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(lambda request: replies.pop(0))),
+        )
+        monkeypatch.setattr(
+            gemini_client, "gemini_pool", GeminiRoutingPool([("key-a", 1.0)], [("gemini-pro", 8)], 60),
+        )
+        monkeypatch.setattr(gemini_client, "gemini_governor", UpstreamGovernor(
+            AdaptiveLimiter(initial=4), CircuitBreaker(5, 30), backoff_base=0.001, backoff_max=0.05,
+        ))
+        gemini_client._http_client = None
+        await response_cache.clear()
+        try:
+            assert await call_gemini_api("Prompt", use_cache=False) == "Second try"
+        finally:
+            gemini_client._http_client = None
+            await response_cache.clear()
+        assert replies == []
+
+
+class FakeCredentials:
+    """Stand-in for google-auth credentials whose refresh blocks."""
+
+    def __init__(self, lifetime: float = 3600, delay: float = 0.05):
+        self.token = None
+        self.expiry = None
+        self.lifetime = lifetime
+        self.delay = delay
+        self.refreshes = 0
+
+    def refresh(self) -> None:
+        time.sleep(self.delay)
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        self.expiry = datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=self.lifetime)
+
+
+def make_provider(credentials: FakeCredentials, refresh_margin: float = 300.0) -> ServiceAccountTokenProvider:
+    return ServiceAccountTokenProvider(
+        refresh_margin=refresh_margin,
+        retry_seconds=0.01,
+        load_credentials=lambda: credentials,
+        refresh_credentials=lambda creds: creds.refresh(),
+    )
+
+
+class TestServiceAccountTokenProvider:
+    """Tests for the cached, background-refreshed access token."""
+
+    @pytest.mark.asyncio
+    async def test_cold_start_shares_one_refresh(self):
+        """Concurrent first requests wait on a single refresh."""
+        credentials = FakeCredentials()
+        provider = make_provider(credentials)
+        tokens = await asyncio.gather(*(provider.get_token() for _ in range(5)))
+        assert tokens == ["token-1"] * 5
+        assert credentials.refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_token_reused(self):
+        """Valid tokens are served without refreshing."""
+        credentials = FakeCredentials()
+        provider = make_provider(credentials)
+        await provider.get_token()
+        assert await provider.get_token() == "token-1"
+        assert credentials.refreshes == 1
+
+    @pytest.mark.asyncio
+    async def test_refresh_does_not_block_event_loop(self):
+        """The blocking refresh runs in a thread while other work proceeds."""
+        provider = make_provider(FakeCredentials(delay=0.2))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        await asyncio.gather(provider.get_token(), ticker())
+        assert ticks == 10
+
+    @pytest.mark.asyncio
+    async def test_expiring_token_served_while_renewing(self):
+        """A token inside the refresh margin is returned at once and renewed in the background."""
+        credentials = FakeCredentials(lifetime=60)
+        provider = make_provider(credentials, refresh_margin=300)
+        await provider.get_token()
+        assert await provider.get_token() == "token-1"
+        await provider.refresh()
+        assert provider._credentials.token == "token-2"
+
+    @pytest.mark.asyncio
+    async def test_background_task_refreshes_before_expiry(self):
+        """The background task renews tokens without any request."""
+        credentials = FakeCredentials(lifetime=0.3, delay=0)
+        provider = make_provider(credentials, refresh_margin=0.2)
+        provider.start()
+        try:
+            await asyncio.sleep(0.35)
+        finally:
+            await provider.stop()
+        assert credentials.refreshes >= 2
+        assert provider.stats()["has_token"]
+
+    @pytest.mark.asyncio
+    async def test_failure_reported(self):
+        """A failing refresh yields no token and is counted."""
+        def fail(creds):
+            raise RuntimeError("metadata server unreachable")
+
+        provider = ServiceAccountTokenProvider(load_credentials=lambda: FakeCredentials(), refresh_credentials=fail)
+        assert await provider.get_token() is None
+        assert provider.stats()["failures"] == 1
+        assert provider.stats()["last_error"] == "RuntimeError"
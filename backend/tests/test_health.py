@@ -1,13 +1,13 @@
 """Integration tests for /api/health endpoint."""
 import pytest
-from httpx import AsyncClient
+from httpx import ASGITransport, AsyncClient
 from app.main import app
 
 
 @pytest.mark.asyncio
 async def test_health_endpoint():
     """Test /api/health endpoint returns correct structure."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         response = await client.get("/api/health")
         
         assert response.status_code == 200
@@ -33,7 +33,7 @@ async def test_health_endpoint():
 @pytest.mark.asyncio
 async def test_health_endpoint_db_status():
     """Test /api/health endpoint database status."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         response = await client.get("/api/health")
         
         assert response.status_code == 200
@@ -49,16 +49,20 @@ async def test_health_endpoint_db_status():
 @pytest.mark.asyncio
 async def test_health_endpoint_response_format():
     """Test /api/health endpoint response format matches expected schema."""
-    async with AsyncClient(app=app, base_url="http://test") as client:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         response = await client.get("/api/health")
         
         assert response.status_code == 200
         data = response.json()
         
         # Verify exact structure
-        expected_keys = {"status", "env", "db"}
+        expected_keys = {"status", "env", "db", "gemini"}
         assert set(data.keys()) == expected_keys
         
         # Verify no extra fields
-        assert len(data) == 3
+        assert len(data) == 4
+        
+        # Upstream state is reported without secrets
+        assert set(data["gemini"].keys()) == {"circuit", "concurrency", "retries"}
+        assert data["gemini"]["circuit"]["state"] in ["closed", "open", "half_open"]
 
@@ -0,0 +1,232 @@
+"""Tests for interview question generation."""
+import asyncio
+import json
+import pytest
+from fastapi import HTTPException, Request
+from app import gemini_client
+from app.gemini_client import GeminiRoutingPool
+from app.routers import interview
+from app.rate_limiter import RateLimiter
+from app.routers.interview import (
+    check_interview_allowed,
+    generate_all_questions,
+    interview_cost,
+    redact_secrets,
+    stream_all_questions,
+    stream_category,
+)
+from app.schemas import InterviewQuestion
+
+
+def make_generator(category: str, delay: float, fail: bool = False):
+    """Build a stand-in for a question generator that sleeps, then returns or fails."""
+    async def generate(resume_summary: str, job_desc: str, count: int):
+        await asyncio.sleep(delay)
+        if fail:
+            raise Exception(f"Failed to generate {category} questions: quota exceeded")
+        return [
+            InterviewQuestion(question=f"{category} question {i}", suggested_answer="Answer", category=category)
+            for i in range(count)
+        ]
+    return generate
+
+
+class TestGenerateAllQuestions:
+    """Tests for concurrent technical and behavioral generation."""
+
+    @pytest.mark.asyncio
+    async def test_calls_run_concurrently(self, monkeypatch):
+        """Wall-clock time is close to the slower call, not the sum."""
+        monkeypatch.setattr(interview, "generate_technical_questions", make_generator("technical", 0.2))
+        monkeypatch.setattr(interview, "generate_behavioral_questions", make_generator("behavioral", 0.2))
+        response = await generate_all_questions("Resume", "", 2, 3)
+
+        assert len(response.technical_questions) == 2
+        assert len(response.behavioral_questions) == 3
+        assert response.metadata.technical.status == "ok"
+        assert response.metadata.behavioral.elapsed_ms >= 200
+        assert response.metadata.total_ms < 350
+
+    @pytest.mark.asyncio
+    async def test_partial_failure_returns_other_set(self, monkeypatch):
+        """A failed call is marked in metadata while the other set is returned."""
+        monkeypatch.setattr(interview, "generate_technical_questions", make_generator("technical", 0, fail=True))
+        monkeypatch.setattr(interview, "generate_behavioral_questions", make_generator("behavioral", 0))
+        response = await generate_all_questions("Resume", "", 2, 2)
+
+        assert response.technical_questions == []
+        assert len(response.behavioral_questions) == 2
+        assert response.metadata.technical.status == "failed"
+        assert "quota exceeded" in response.metadata.technical.error
+        assert response.metadata.behavioral.count == 2
+
+    @pytest.mark.asyncio
+    async def test_both_failing_raises(self, monkeypatch):
+        """When both calls fail, the error propagates to the endpoint."""
+        monkeypatch.setattr(interview, "generate_technical_questions", make_generator("technical", 0, fail=True))
+        monkeypatch.setattr(interview, "generate_behavioral_questions", make_generator("behavioral", 0, fail=True))
+        with pytest.raises(Exception, match="technical"):
+            await generate_all_questions("Resume", "", 2, 2)
+
+    @pytest.mark.asyncio
+    async def test_no_questions_is_an_error(self, monkeypatch):
+        """Two empty successful results are reported as a 500."""
+        monkeypatch.setattr(interview, "generate_technical_questions", make_generator("technical", 0))
+        monkeypatch.setattr(interview, "generate_behavioral_questions", make_generator("behavioral", 0))
+        with pytest.raises(HTTPException) as exc_info:
+            await generate_all_questions("Resume", "", 0, 0)
+        assert exc_info.value.status_code == 500
+
+
+def make_stream(*chunks: str, fail: bool = False, delay: float = 0.0):
+    """Build a stand-in for stream_gemini_api that yields the given chunks."""
+    async def stream(prompt: str, **kwargs):
+        for chunk in chunks:
+            await asyncio.sleep(delay)
+            yield chunk
+        if fail:
+            raise Exception("Gemini API error: quota exceeded")
+    return stream
+
+
+def parse_events(body: bytes):
+    """Split a server-sent event body into (event, data) pairs."""
+    events = []
+    for block in body.decode().strip().split("\n\n"):
+        name_line, data_line = block.split("\n")
+        events.append((name_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+class TestStreamQuestions:
+    """Tests for server-sent event question generation."""
+
+    async def collect(self, **kwargs):
+        body = b""
+        async for event in stream_all_questions("Resume", "", **kwargs):
+            body += event
+        return parse_events(body)
+
+    @pytest.mark.asyncio
+    async def test_questions_streamed_before_completion(self, monkeypatch):
+        """Each question is emitted once its object closes, then a done event."""
+        emitted = []
+
+        async def emit(event: bytes):
+            emitted.append(event)
+
+        chunks = ['[{"question": "Q1", "suggested_answer": "A1"},', ' {"question": "Q2", ', '"suggested_answer": "A2"}]']
+
+        async def stream(prompt: str, **kwargs):
+            for i, chunk in enumerate(chunks):
+                # By the time the second object starts, the first has been sent
+                assert len(emitted) == (0 if i == 0 else 1)
+                yield chunk
+
+        monkeypatch.setattr(interview, "stream_gemini_api", stream)
+        result = await stream_category("technical", "prompt", 5, "fallback", emit)
+
+        events = parse_events(b"".join(emitted))
+        assert [data["question"] for _, data in events] == ["Q1", "Q2"]
+        assert events[1][1]["index"] == 1
+        assert result.status == "ok"
+        assert result.count == 2
+        assert result.first_question_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_both_categories_and_done(self, monkeypatch):
+        """Both categories stream and the final event carries metadata."""
+        monkeypatch.setattr(interview, "stream_gemini_api", make_stream(
+            '[{"question": "Q1", "suggested_answer": "A1"}, {"question": "Q2", "suggested_answer": "A2"}]'
+        ))
+        events = await self.collect(num_tech=1, num_behavioral=2)
+
+        questions = [data for name, data in events if name == "question"]
+        assert sorted(q["category"] for q in questions) == ["behavioral", "behavioral", "technical"]
+        name, metadata = events[-1]
+        assert name == "done"
+        assert metadata["technical"]["count"] == 1
+        assert metadata["behavioral"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_plain_text_fallback(self, monkeypatch):
+        """Output that is not a JSON array is parsed when the stream ends."""
+        monkeypatch.setattr(interview, "stream_gemini_api", make_stream("Q: What is REST?\n", "A: An architectural style."))
+        events = await self.collect(num_tech=1, num_behavioral=1)
+
+        questions = [data for name, data in events if name == "question"]
+        assert questions[0]["question"] == "What is REST?"
+        assert questions[0]["suggested_answer"] == "An architectural style."
+
+    @pytest.mark.asyncio
+    async def test_failure_sends_error_event(self, monkeypatch):
+        """A failed stream keeps questions already sent and reports an error."""
+        monkeypatch.setattr(interview, "stream_gemini_api", make_stream(
+            '[{"question": "Q1", "suggested_answer": "A1"}, {"quest', fail=True
+        ))
+        events = await self.collect(num_tech=3, num_behavioral=3)
+
+        names = [name for name, _ in events]
+        assert names.count("question") == 2
+        assert names.count("error") == 2
+        metadata = events[-1][1]
+        assert metadata["technical"]["status"] == "failed"
+        assert metadata["technical"]["count"] == 1
+        assert "quota exceeded" in metadata["technical"]["error"]
+
+
+class TestInterviewRateLimit:
+    """Tests for charging interview generation by question count."""
+
+    def test_cost_scales_with_questions(self):
+        """One token per four questions, rounded up."""
+        assert interview_cost(1, 1) == 1
+        assert interview_cost(5, 5) == 3
+        assert interview_cost(20, 20) == 10
+
+    @pytest.mark.asyncio
+    async def test_expensive_request_rejected_with_headers(self, monkeypatch):
+        """A request that does not fit the remaining budget gets 429 and the limit headers."""
+        monkeypatch.setattr(interview, "rate_limiter", RateLimiter(max_requests=10, window_seconds=60))
+        http_request = Request({"type": "http", "headers": [], "client": ("10.0.0.1", 1234)})
+
+        assert (await check_interview_allowed(http_request, interview_cost(20, 12))).remaining == 2
+        with pytest.raises(HTTPException) as exc:
+            await check_interview_allowed(http_request, interview_cost(5, 5))
+        assert exc.value.status_code == 429
+        assert exc.value.headers["X-RateLimit-Remaining"] == "2"
+        assert exc.value.headers["X-RateLimit-Cost"] == "3"
+        assert "Retry-After" in exc.value.headers
+
+
+class TestGeminiConfiguration:
+    """Tests for accepting any configured Gemini credentials."""
+
+    @pytest.fixture
+    def pool_only(self, monkeypatch):
+        """Configure keys through GEMINI_API_KEYS alone, with no GEMINI_API_KEY."""
+        pool = GeminiRoutingPool([("key-a", 1.0), ("key-b", 1.0)], [("gemini-pro", 8)], 60)
+        monkeypatch.setattr(gemini_client.settings, "GEMINI_API_KEY", "")
+        monkeypatch.setattr(gemini_client, "gemini_pool", pool)
+        monkeypatch.setattr(interview, "gemini_pool", pool)
+        monkeypatch.setattr(interview, "rate_limiter", RateLimiter(max_requests=10, window_seconds=60))
+
+    @pytest.mark.asyncio
+    async def test_pool_keys_without_primary_key(self, pool_only):
+        """Keys from GEMINI_API_KEYS are enough to pass the configuration check."""
+        http_request = Request({"type": "http", "headers": [], "client": ("10.0.0.1", 1234)})
+        assert (await check_interview_allowed(http_request, 1)).allowed
+
+    @pytest.mark.asyncio
+    async def test_unconfigured_is_unavailable(self, monkeypatch):
+        """Without keys or a service account the service is a 503."""
+        monkeypatch.setattr(gemini_client, "gemini_pool", GeminiRoutingPool([], [("gemini-pro", 8)], 60))
+        monkeypatch.setattr(gemini_client, "service_account_configured", lambda: False)
+        http_request = Request({"type": "http", "headers": [], "client": ("10.0.0.1", 1234)})
+        with pytest.raises(HTTPException) as exc:
+            await check_interview_allowed(http_request, 1)
+        assert exc.value.status_code == 503
+
+    def test_every_pool_key_redacted(self, pool_only):
+        """Error messages are scrubbed of every key in the pool, not just the primary one."""
+        assert redact_secrets("bad key key-b (after key-a)") == "bad key [REDACTED] (after [REDACTED])"
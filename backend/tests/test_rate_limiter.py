@@ -0,0 +1,229 @@
+"""Tests for the token-bucket rate limiter and its storage backends."""
+import asyncio
+import os
+import time
+import pytest
+from app.rate_limiter import (
+    RateLimiter,
+    RedisRateLimitStore,
+    SharedMemoryRateLimitStore,
+)
+from app.redis_client import RedisClient
+from tests.redis_stub import RedisStub
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimiter:
+    """Tests for per-key token buckets."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_reject(self):
+        """Up to max_requests pass at once; the next is rejected."""
+        limiter = RateLimiter(max_requests=3, window_seconds=60, clock=FakeClock())
+        results = [await limiter.is_allowed("1.1.1.1") for _ in range(4)]
+        assert results == [(True, 2), (True, 1), (True, 0), (False, 0)]
+
+    @pytest.mark.asyncio
+    async def test_tokens_refill_over_window(self):
+        """Tokens return at max_requests per window."""
+        clock = FakeClock()
+        limiter = RateLimiter(max_requests=6, window_seconds=60, clock=clock)
+        for _ in range(6):
+            await limiter.is_allowed("ip")
+        clock.now += 10  # one token
+        assert await limiter.is_allowed("ip") == (True, 0)
+        assert (await limiter.is_allowed("ip"))[0] is False
+        clock.now += 600
+        assert await limiter.get_remaining("ip") == 6
+
+    @pytest.mark.asyncio
+    async def test_keys_are_independent(self):
+        """One client exhausting its bucket does not affect another."""
+        limiter = RateLimiter(max_requests=1, window_seconds=60, clock=FakeClock())
+        await limiter.is_allowed("a")
+        assert (await limiter.is_allowed("a"))[0] is False
+        assert (await limiter.is_allowed("b"))[0] is True
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_evicted(self):
+        """Keys idle for a full window are dropped as other traffic arrives."""
+        clock = FakeClock()
+        limiter = RateLimiter(max_requests=5, window_seconds=60, clock=clock)
+        for i in range(8):
+            await limiter.is_allowed(f"idle-{i}")
+        clock.now += 61
+        await limiter.is_allowed("active")
+        await limiter.is_allowed("active")
+        assert len(limiter.store) == 1
+        assert limiter.stats()["evicted_idle"] == 8
+
+    @pytest.mark.asyncio
+    async def test_recent_keys_not_evicted_as_idle(self):
+        """Keys seen within the window keep their state."""
+        clock = FakeClock()
+        limiter = RateLimiter(max_requests=1, window_seconds=60, clock=clock)
+        await limiter.is_allowed("a")
+        clock.now += 30
+        await limiter.is_allowed("b")
+        assert (await limiter.is_allowed("a"))[0] is False
+
+    @pytest.mark.asyncio
+    async def test_memory_bound(self):
+        """Tracked keys never exceed max_keys."""
+        limiter = RateLimiter(max_requests=5, window_seconds=60, max_keys=100, clock=FakeClock())
+        for i in range(1000):
+            await limiter.is_allowed(f"10.0.{i // 256}.{i % 256}")
+        assert len(limiter.store) == 100
+        assert limiter.stats()["evicted_overflow"] == 900
+
+
+class TestWeightedCost:
+    """Tests for requests that cost more than one token."""
+
+    @pytest.mark.asyncio
+    async def test_cost_is_charged(self):
+        """An expensive request uses its cost; a cheap one still fits afterwards."""
+        limiter = RateLimiter(max_requests=10, window_seconds=60, clock=FakeClock())
+        result = await limiter.check("ip", cost=8)
+        assert (result.allowed, result.remaining, result.cost) == (True, 2, 8)
+        assert (await limiter.check("ip", cost=3)).allowed is False
+        assert (await limiter.check("ip", cost=1)).allowed is True
+
+    @pytest.mark.asyncio
+    async def test_rejection_reports_wait_for_cost(self):
+        """Retry-After is the time until the request's cost has refilled."""
+        limiter = RateLimiter(max_requests=6, window_seconds=60, clock=FakeClock())
+        await limiter.check("ip", cost=6)
+        result = await limiter.check("ip", cost=3)
+        assert result.allowed is False
+        assert result.headers == {
+            "X-RateLimit-Limit": "6",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": "60",
+            "X-RateLimit-Cost": "3",
+            "Retry-After": "30",
+        }
+
+    @pytest.mark.asyncio
+    async def test_cost_capped_at_budget(self):
+        """A request costing more than the whole budget can still run when the budget is full."""
+        limiter = RateLimiter(max_requests=5, window_seconds=60, clock=FakeClock())
+        result = await limiter.check("ip", cost=50)
+        assert (result.allowed, result.cost, result.remaining) == (True, 5, 0)
+
+
+class TestSharedMemoryStore:
+    """Tests for buckets shared by workers on one host."""
+
+    @pytest.mark.asyncio
+    async def test_stores_on_same_file_share_limit(self, tmp_path):
+        """Two workers mapping the same table enforce one limit between them."""
+        path = str(tmp_path / "ratelimit")
+        clock = FakeClock()
+        first = RateLimiter(max_requests=4, window_seconds=60, store=SharedMemoryRateLimitStore(path, slots=64, clock=clock))
+        second = RateLimiter(max_requests=4, window_seconds=60, store=SharedMemoryRateLimitStore(path, slots=64, clock=clock))
+        results = [await limiter.is_allowed("ip") for limiter in (first, second, first, second, first)]
+        assert [allowed for allowed, _ in results] == [True, True, True, True, False]
+        clock.now += 15  # one token
+        assert await second.get_remaining("ip") == 1
+        first.store.close()
+        second.store.close()
+
+    @pytest.mark.asyncio
+    async def test_table_size_is_fixed(self, tmp_path):
+        """More keys than slots reuse the least recently seen slot."""
+        path = str(tmp_path / "ratelimit")
+        clock = FakeClock()
+        store = SharedMemoryRateLimitStore(path, slots=8, clock=clock)
+        limiter = RateLimiter(max_requests=1, window_seconds=60, store=store)
+        for i in range(100):
+            clock.now += 0.001
+            await limiter.is_allowed(f"client-{i}")
+        assert os.path.getsize(path) == 8 * 24
+        assert store.stats()["evicted"] > 0
+        store.close()
+
+
+class TestRedisStore:
+    """Tests for buckets on a Redis-compatible server."""
+
+    @pytest.fixture
+    async def stub(self):
+        stub = await RedisStub().start()
+        yield stub
+        await stub.stop()
+
+    @pytest.mark.asyncio
+    async def test_workers_share_limit(self, stub):
+        """Limiters with separate connections enforce one limit between them."""
+        clients = [RedisClient(stub.url), RedisClient(stub.url)]
+        try:
+            first, second = (
+                RateLimiter(max_requests=3, window_seconds=60, store=RedisRateLimitStore(client))
+                for client in clients
+            )
+            results = [await limiter.is_allowed("ip") for limiter in (first, second, first, second)]
+            assert [allowed for allowed, _ in results] == [True, True, True, False]
+            assert await first.get_remaining("ip") == 0
+            _, expires_at = stub.data[b"resumegenie:ratelimit:ip"]
+            assert expires_at is not None
+        finally:
+            for client in clients:
+                await client.close()
+
+    @pytest.mark.asyncio
+    async def test_uncached_script_falls_back_to_eval(self, stub):
+        """NOSCRIPT from EVALSHA is answered by sending the script once."""
+        client = RedisClient(stub.url)
+        try:
+            limiter = RateLimiter(max_requests=3, window_seconds=60, store=RedisRateLimitStore(client))
+            await limiter.is_allowed("ip")
+            await limiter.is_allowed("ip")
+            assert stub.commands == [b"EVALSHA", b"EVAL", b"EVALSHA"]
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_unreachable_server_allows_requests(self):
+        """A limiter outage never rejects traffic."""
+        store = RedisRateLimitStore(RedisClient("redis://127.0.0.1:1/0", timeout=0.2))
+        limiter = RateLimiter(max_requests=1, window_seconds=60, store=store)
+        assert (await limiter.is_allowed("ip"))[0] is True
+        assert (await limiter.is_allowed("ip"))[0] is True
+        assert (limiter.stats()["errors"], limiter.stats()["skipped"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_unresponsive_server_fails_open_at_once(self):
+        """After one timeout, requests are allowed without waiting on the server."""
+        accepted = []
+
+        async def blackhole(reader, writer):
+            accepted.append(writer)
+
+        server = await asyncio.start_server(blackhole, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RedisClient(f"redis://127.0.0.1:{port}/0", timeout=0.2, backoff_base=60)
+        limiter = RateLimiter(max_requests=1, window_seconds=60, store=RedisRateLimitStore(client))
+        try:
+            assert (await limiter.is_allowed("ip"))[0] is True
+
+            started = time.monotonic()
+            results = await asyncio.gather(*(limiter.is_allowed(f"ip{i}") for i in range(50)))
+            assert all(allowed for allowed, _ in results)
+            assert time.monotonic() - started < 0.1
+            assert len(accepted) == 1
+            assert limiter.stats()["skipped"] == 50
+        finally:
+            for writer in accepted:
+                writer.close()
+            server.close()
+            await client.close()
@@ -0,0 +1,294 @@
+"""Tests for the resume CRUD router."""
+import copy
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from app.routers import resumes
+from app.schemas import ResumeCreate, ResumePatchOperation
+from app.utils_resume import build_resume_patch
+
+RESUME = {
+    "personal": {"firstName": "Ada", "lastName": "Lovelace", "email": "ada@example.com"},
+    "summary": "Analyst",
+    "skills": [{"id": "s1", "name": "Python"}],
+}
+
+MISSING = object()
+
+
+def get_path(doc, path):
+    """Value at a dotted path (numeric parts index lists), or MISSING."""
+    for part in path.split("."):
+        if isinstance(doc, list) and part.isdigit() and int(part) < len(doc):
+            doc = doc[int(part)]
+        elif isinstance(doc, dict) and part in doc:
+            doc = doc[part]
+        else:
+            return MISSING
+    return doc
+
+
+def matches(doc, query):
+    """Evaluate the subset of MongoDB filters the router uses."""
+    for path, expected in query.items():
+        if path == "$and":
+            if not all(matches(doc, condition) for condition in expected):
+                return False
+        elif path == "$expr":
+            if not evaluate(doc, expected):
+                return False
+        elif isinstance(expected, dict) and "$exists" in expected:
+            if (get_path(doc, path) is not MISSING) != expected["$exists"]:
+                return False
+        elif isinstance(expected, dict) and "$eq" in expected:
+            if get_path(doc, path) != expected["$eq"]:
+                return False
+        elif get_path(doc, path) != expected:
+            return False
+    return True
+
+
+def evaluate(doc, expression, this=None):
+    """Evaluate the subset of aggregation expressions the router uses in $expr."""
+    if isinstance(expression, str) and expression.startswith("$$this."):
+        return this.get(expression[len("$$this."):])
+    if isinstance(expression, str) and expression.startswith("$"):
+        value = get_path(doc, expression[1:])
+        return None if value is MISSING else value
+    if isinstance(expression, dict):
+        (operator, argument), = expression.items()
+        if operator == "$literal":
+            return argument
+        if operator == "$eq":
+            return evaluate(doc, argument[0], this) == evaluate(doc, argument[1], this)
+        if operator == "$size":
+            return len(evaluate(doc, argument, this))
+        if operator == "$filter":
+            return [item for item in evaluate(doc, argument["input"], this) or []
+                    if evaluate(doc, argument["cond"], item)]
+    return expression
+
+
+def apply_update(doc, update):
+    """Apply $set / $push / $pull the way MongoDB does for the paths the router writes."""
+    for path, value in update.get("$set", {}).items():
+        *parents, last = path.split(".")
+        target = doc
+        for part in parents:
+            target = target[int(part)] if isinstance(target, list) else target[part]
+        if isinstance(target, list):
+            target[int(last)] = copy.deepcopy(value)
+        else:
+            target[last] = copy.deepcopy(value)
+    for field, value in update.get("$push", {}).items():
+        items = doc.setdefault(field, [])
+        if isinstance(value, dict) and "$each" in value:
+            position = value.get("$position", len(items))
+            items[position:position] = copy.deepcopy(value["$each"])
+        else:
+            items.append(copy.deepcopy(value))
+    for field, condition in update.get("$pull", {}).items():
+        doc[field] = [item for item in doc.get(field, []) if not matches(item, condition)]
+
+
+class RecordingCollection:
+    """In-memory stand-in for the resumes collection that records each round-trip."""
+
+    def __init__(self):
+        self.docs = {}
+        self.calls = []
+
+    async def insert_one(self, doc):
+        self.calls.append("insert_one")
+        doc.setdefault("_id", ObjectId())
+        self.docs[doc["_id"]] = copy.deepcopy(doc)
+        return type("InsertOneResult", (), {"inserted_id": doc["_id"]})()
+
+    async def find_one(self, query, projection=None):
+        self.calls.append("find_one")
+        doc = self.docs.get(query["_id"])
+        if not doc:
+            return None
+        if projection is None:
+            return copy.deepcopy(doc)
+        projected = {"_id": doc["_id"]}
+        for field, spec in projection.items():
+            if isinstance(spec, dict) and field in doc:
+                start, count = spec["$slice"]
+                projected[field] = copy.deepcopy(doc[field][start:start + count])
+        return projected
+
+    async def find_one_and_update(self, query, update, return_document=ReturnDocument.BEFORE):
+        self.calls.append("find_one_and_update")
+        doc = self.docs.get(query["_id"])
+        if doc is None or not matches(doc, query):
+            return None
+        before = copy.deepcopy(doc)
+        apply_update(doc, update)
+        return copy.deepcopy(doc if return_document == ReturnDocument.AFTER else before)
+
+
+@pytest.fixture
+def collection(monkeypatch):
+    collection = RecordingCollection()
+
+    async def get_collection(name):
+        return collection
+
+    monkeypatch.setattr(resumes, "get_collection", get_collection)
+    return collection
+
+
+class TestResumeWrites:
+    """Create and update each take a single database round-trip."""
+
+    @pytest.mark.asyncio
+    async def test_create_returns_inserted_document(self, collection):
+        """The response is built from the inserted document without reading it back."""
+        created = await resumes.create_resume(ResumeCreate(**RESUME))
+        assert collection.calls == ["insert_one"]
+        assert created.personal.firstName == "Ada"
+        assert created.created_at == created.updated_at
+        assert ObjectId(created.id) in collection.docs
+
+    @pytest.mark.asyncio
+    async def test_update_preserves_created_at(self, collection):
+        """Update is one find_one_and_update that returns the new document and keeps created_at."""
+        created = await resumes.create_resume(ResumeCreate(**RESUME))
+        collection.calls.clear()
+
+        updated = await resumes.update_resume(created.id, ResumeCreate(**{**RESUME, "summary": "Engineer"}))
+        assert collection.calls == ["find_one_and_update"]
+        assert updated.summary == "Engineer"
+        assert updated.created_at == created.created_at
+        assert updated.updated_at >= created.updated_at
+
+    @pytest.mark.asyncio
+    async def test_update_missing_resume(self, collection):
+        """Updating an unknown ID is a 404, not an upsert."""
+        with pytest.raises(HTTPException) as exc:
+            await resumes.update_resume(str(ObjectId()), ResumeCreate(**RESUME))
+        assert exc.value.status_code == 404
+        assert collection.docs == {}
+
+
+def ops(*operations):
+    return [ResumePatchOperation(op=op, path=path, value=value) for op, path, value in operations]
+
+
+class TestBuildResumePatch:
+    """Tests for translating patches into MongoDB updates."""
+
+    def test_targeted_operators(self):
+        """Each operation becomes one targeted operator; only the changed value is validated."""
+        patch = build_resume_patch([
+            ("replace", "/experience/2/description", "  Led the team  "),
+            ("replace", "personal.email", "ada@example.org"),
+            ("add", "/skills/-", {"id": "s9", "name": "Rust"}),
+            ("test", "/summary", "Analyst"),
+        ])
+        assert patch.set == {"experience.2.description": "Led the team", "personal.email": "ada@example.org"}
+        assert patch.push == {"skills": {"id": "s9", "name": "Rust", "category": None}}
+        assert {"summary": {"$eq": "Analyst"}} in patch.conditions
+        assert {"experience.2": {"$exists": True}} in patch.conditions
+
+    def test_invalid_value_is_rejected(self):
+        """Values are validated against the model of the part they replace."""
+        with pytest.raises(ValueError):
+            build_resume_patch([("replace", "personal.email", "not-an-email")])
+        with pytest.raises(ValueError):
+            build_resume_patch([("add", "/skills/-", {"id": "s9"})])
+
+    def test_test_values_are_literals(self):
+        """test compares with $eq and rejects values MongoDB would run as query operators."""
+        patch = build_resume_patch([("test", "/personal", {"firstName": "Ada"})])
+        assert patch.conditions == [{"personal": {"$eq": {"firstName": "Ada"}}}]
+        for value in ({"$ne": None}, {"$regex": ".*"}, [{"nested": {"$gt": 0}}]):
+            with pytest.raises(ValueError, match="Invalid key"):
+                build_resume_patch([("test", "/summary", value)])
+
+    def test_overlapping_changes_conflict(self):
+        """Changes that one MongoDB update cannot express together are rejected."""
+        with pytest.raises(ValueError, match="Conflicting"):
+            build_resume_patch([("replace", "experience.0", {"id": "e1", "company": "A", "position": "B"}),
+                                ("replace", "experience.0.company", "C")])
+        with pytest.raises(ValueError, match="Conflicting"):
+            build_resume_patch([("remove", "/skills/0", None), ("add", "/skills/-", {"id": "s2", "name": "Go"})])
+        assert build_resume_patch([("replace", "summary", "a"), ("replace", "summary", "b")]).set == {"summary": "b"}
+
+
+class TestPatchResume:
+    """Tests for PATCH /api/resumes/{id}."""
+
+    @pytest.mark.asyncio
+    async def test_merge_patch_writes_only_changed_fields(self, collection):
+        """A field-path merge patch is one update that sets just the given paths."""
+        created = await resumes.create_resume(ResumeCreate(**RESUME))
+        collection.calls.clear()
+
+        patched = await resumes.patch_resume(created.id, {"summary": "Engineer", "skills.0.name": "Python 3"})
+        assert collection.calls == ["find_one_and_update"]
+        assert patched.summary == "Engineer"
+        assert patched.skills[0].name == "Python 3"
+        assert patched.personal.firstName == "Ada"
+        assert patched.created_at == created.created_at
+
+    @pytest.mark.asyncio
+    async def test_json_patch_add_and_remove(self, collection):
+        """add inserts at a position or appends; remove pulls the item found at the index."""
+        created = await resumes.create_resume(ResumeCreate(**RESUME))
+        await resumes.patch_resume(created.id, ops(("add", "/skills/0", {"id": "s0", "name": "SQL"})))
+        patched = await resumes.patch_resume(created.id, ops(("add", "/skills/-", {"id": "s2", "name": "Go"})))
+        assert [skill.id for skill in patched.skills] == ["s0", "s1", "s2"]
+
+        collection.calls.clear()
+        patched = await resumes.patch_resume(created.id, ops(("remove", "/skills/1", None)))
+        assert collection.calls == ["find_one", "find_one_and_update"]
+        assert [skill.id for skill in patched.skills] == ["s0", "s2"]
+
+    @pytest.mark.asyncio
+    async def test_patch_that_does_not_apply(self, collection):
+        """A failed test or a missing index is a 409 and nothing is written."""
+        created = await resumes.create_resume(ResumeCreate(**RESUME))
+        for patch in (
+            ops(("test", "/summary", "Someone else"), ("replace", "/summary", "Engineer")),
+            {"experience.3.description": "Nothing here"},
+            ops(("remove", "/skills/5", None)),
+        ):
+            with pytest.raises(HTTPException) as exc:
+                await resumes.patch_resume(created.id, patch)
+            assert exc.value.status_code == 409
+        assert (await resumes.get_resume(created.id)).summary == "Analyst"
+
+    @pytest.mark.asyncio
+    async def test_invalid_patch_and_missing_resume(self, collection):
+        """Invalid paths or values are a 400; an unknown ID is a 404."""
+        created = await resumes.create_resume(ResumeCreate(**RESUME))
+        for patch in ({"personal.email": "not-an-email"}, {"unknown.field": 1}, ops(("remove", "/summary", None)), {}):
+            with pytest.raises(HTTPException) as exc:
+                await resumes.patch_resume(created.id, patch)
+            assert exc.value.status_code == 400
+        with pytest.raises(HTTPException) as exc:
+            await resumes.patch_resume(str(ObjectId()), {"summary": "Engineer"})
+        assert exc.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_operator_test_value_is_rejected(self, collection):
+        """A test value that would act as a query operator is a 400, not a match."""
+        created = await resumes.create_resume(ResumeCreate(**RESUME))
+        with pytest.raises(HTTPException) as exc:
+            await resumes.patch_resume(created.id, ops(("test", "/summary", {"$ne": None}),
+                                                       ("replace", "/summary", "Engineer")))
+        assert exc.value.status_code == 400
+        assert (await resumes.get_resume(created.id)).summary == "Analyst"
+
+    @pytest.mark.asyncio
+    async def test_remove_with_duplicate_ids(self, collection):
+        """Removing an item whose id is shared with another item removes nothing."""
+        duplicated = {**RESUME, "skills": [{"id": "s1", "name": "Python"}, {"id": "s1", "name": "SQL"}]}
+        created = await resumes.create_resume(ResumeCreate(**duplicated))
+        with pytest.raises(HTTPException) as exc:
+            await resumes.patch_resume(created.id, ops(("remove", "/skills/1", None)))
+        assert exc.value.status_code == 409
+        assert [skill.name for skill in (await resumes.get_resume(created.id)).skills] == ["Python", "SQL"]
@@ -0,0 +1,64 @@
+"""Tests for the suggestion router."""
+import json
+import pytest
+from fastapi import Request
+from app.rate_limiter import RateLimitResult
+from app.routers import suggest
+from app.routers.suggest import FALLBACK_SUGGESTION, _suggestion_events, stream_suggestions_endpoint
+from app.schemas import SuggestRequest
+
+
+async def stream_of(*suggestions: str, error: Exception = None):
+    for suggestion in suggestions:
+        yield suggestion
+    if error is not None:
+        raise error
+
+
+async def collect(events):
+    body = b"".join([event async for event in events]).decode()
+    return [
+        (block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+        for block in body.strip().split("\n\n")
+    ]
+
+
+class TestSuggestionEvents:
+    """Tests for encoding streamed suggestions as server-sent events."""
+
+    @pytest.mark.asyncio
+    async def test_suggestions_then_done(self):
+        """Each suggestion is an indexed event, followed by done."""
+        events = await collect(_suggestion_events("First", stream_of("Second")))
+        assert events == [
+            ("suggestion", {"index": 0, "text": "First"}),
+            ("suggestion", {"index": 1, "text": "Second"}),
+            ("done", {"count": 2}),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_mid_stream_error_is_sanitized(self):
+        """Errors after the first suggestion become an error event without internal details."""
+        events = await collect(_suggestion_events("First", stream_of(error=Exception("Gemini API error: secret detail"))))
+        assert events[1] == ("error", {"status": 503, "detail": "AI service is currently unavailable. Please try again later."})
+        assert events[-1] == ("done", {"count": 1})
+
+
+class TestStreamSuggestionsEndpoint:
+    """Tests for POST /api/suggest/stream."""
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_sends_fallback(self, monkeypatch):
+        """A response with no usable suggestions streams the fallback suggestion, then done."""
+        async def allowed(http_request):
+            return RateLimitResult(allowed=True, limit=10, remaining=9, cost=1, reset_seconds=6.0, retry_after=0.0)
+
+        monkeypatch.setattr(suggest, "check_suggest_allowed", allowed)
+        monkeypatch.setattr(suggest, "stream_suggestions", lambda **kwargs: stream_of())
+        http_request = Request({"type": "http", "headers": [], "client": ("10.0.0.1", 1234)})
+
+        response = await stream_suggestions_endpoint(SuggestRequest(task="summary", sourceText="Analyst"), http_request)
+        assert await collect(response.body_iterator) == [
+            ("suggestion", {"index": 0, "text": FALLBACK_SUGGESTION}),
+            ("done", {"count": 1}),
+        ]
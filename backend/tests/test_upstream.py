@@ -0,0 +1,198 @@
+"""Tests for the upstream concurrency limiter, retries and circuit breaker."""
+import asyncio
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+import httpx
+import pytest
+from app.upstream import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    UpstreamGovernor,
+    UpstreamUnavailableError,
+    backoff_delay,
+    parse_retry_after,
+)
+
+
+def make_governor(max_retries: int = 3, failure_threshold: int = 5, reset_timeout: float = 30.0) -> UpstreamGovernor:
+    return UpstreamGovernor(
+        limiter=AdaptiveLimiter(initial=4, min_limit=1, max_limit=8, decrease_cooldown=0),
+        breaker=CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=reset_timeout),
+        max_retries=max_retries,
+        backoff_base=0.001,
+        backoff_max=0.05,
+    )
+
+
+def responses(*statuses: int, headers: dict = None):
+    """Build a send() returning the given statuses in turn."""
+    sent = []
+
+    async def send() -> httpx.Response:
+        status = statuses[min(len(sent), len(statuses) - 1)]
+        sent.append(status)
+        return httpx.Response(status, headers=headers or {})
+    return send, sent
+
+
+class TestBackoff:
+    """Tests for retry delay calculation."""
+
+    def test_delay_is_jittered_and_capped(self):
+        """Delays stay within the exponential cap."""
+        delays = [backoff_delay(attempt=5, base=0.5, max_delay=2.0) for _ in range(100)]
+        assert all(0 <= d <= 2.0 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_retry_after_is_a_minimum(self):
+        """A server-provided delay is honored."""
+        assert backoff_delay(attempt=0, base=0.01, max_delay=5.0, retry_after=2.0) >= 2.0
+
+    def test_long_retry_after_is_not_retried(self):
+        """Waits longer than the maximum fail the call instead."""
+        assert backoff_delay(attempt=0, base=0.01, max_delay=5.0, retry_after=60) is None
+
+    def test_parse_retry_after(self):
+        """Both delay-seconds and HTTP-date forms are understood."""
+        assert parse_retry_after("3") == 3.0
+        later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+        assert 25 <= parse_retry_after(later) <= 30
+        assert parse_retry_after("soon") is None
+        assert parse_retry_after(None) is None
+
+
+class TestAdaptiveLimiter:
+    """Tests for the AIMD concurrency limit."""
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrency(self):
+        """No more than the limit run at once."""
+        limiter = AdaptiveLimiter(initial=2)
+        running = peak = 0
+
+        async def work():
+            nonlocal running, peak
+            async with limiter.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(work() for _ in range(6)))
+        assert peak == 2
+        assert limiter.in_flight == 0
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """Successes grow the limit slowly; throttling halves it."""
+        limiter = AdaptiveLimiter(initial=4, max_limit=10, decrease_cooldown=0)
+        for _ in range(4):
+            limiter.on_success()
+        # About +1 per round of `limit` successes
+        assert 4.9 < limiter.limit < 5
+        before = limiter.limit
+        limiter.on_throttle()
+        assert limiter.limit == pytest.approx(before / 2)
+
+    def test_throttle_burst_counts_once(self):
+        """Simultaneous 429s within the cooldown lower the limit once."""
+        limiter = AdaptiveLimiter(initial=8, decrease_cooldown=60)
+        for _ in range(5):
+            limiter.on_throttle()
+        assert limiter.max_in_flight == 4
+        assert limiter.throttled == 5
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_leak_slot(self):
+        """A caller cancelled while waiting leaves the count unchanged."""
+        limiter = AdaptiveLimiter(initial=1)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        limiter.release()
+        await asyncio.sleep(0)
+        assert limiter.in_flight == 0
+
+
+class TestCircuitBreaker:
+    """Tests for failing fast when the upstream is down."""
+
+    def test_opens_after_threshold_and_probes(self):
+        """Consecutive failures open the circuit; one probe is allowed after the timeout."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.stats()["times_opened"] == 1
+
+        breaker.before_call()  # half-open probe
+        with pytest.raises(UpstreamUnavailableError):
+            breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_open_circuit_rejects(self):
+        """Calls fail immediately while open."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        breaker.record_failure()
+        with pytest.raises(UpstreamUnavailableError) as exc:
+            breaker.before_call()
+        assert exc.value.retry_after > 0
+
+
+class TestUpstreamGovernor:
+    """Tests for retries and breaker accounting around requests."""
+
+    @pytest.mark.asyncio
+    async def test_retries_until_success(self):
+        """A 503 then 429 then 200 succeeds after two retries."""
+        governor = make_governor()
+        send, sent = responses(503, 429, 200)
+        response = await governor.request(send)
+        assert response.status_code == 200
+        assert sent == [503, 429, 200]
+        assert governor.retries == 2
+        assert governor.limiter.throttled == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_not_retried(self):
+        """A 400 is returned as-is and does not count against the circuit."""
+        governor = make_governor(failure_threshold=1)
+        send, sent = responses(400)
+        assert (await governor.request(send)).status_code == 400
+        assert sent == [400]
+        assert governor.breaker.state == "closed"
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_open_circuit(self):
+        """Persistent 5xx returns the last response, then the circuit fails fast."""
+        governor = make_governor(max_retries=1, failure_threshold=1)
+        send, sent = responses(500)
+        assert (await governor.request(send)).status_code == 500
+        assert sent == [500, 500]
+        with pytest.raises(UpstreamUnavailableError):
+            await governor.request(send)
+        assert len(sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_long_retry_after_fails_fast(self):
+        """A Retry-After beyond the backoff cap is surfaced without waiting."""
+        governor = make_governor()
+        send, sent = responses(429, headers={"Retry-After": "120"})
+        assert (await governor.request(send)).status_code == 429
+        assert sent == [429]
+
+    @pytest.mark.asyncio
+    async def test_connection_errors_retried(self):
+        """Connection failures are retried; the last error is raised."""
+        governor = make_governor(max_retries=2)
+        attempts = []
+
+        async def send():
+            attempts.append(1)
+            raise httpx.ConnectError("refused")
+
+        with pytest.raises(httpx.ConnectError):
+            await governor.request(send)
+        assert len(attempts) == 3
+        assert governor.limiter.in_flight == 0
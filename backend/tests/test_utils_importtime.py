@@ -0,0 +1,59 @@
+"""Tests for import-time profiling and lazy imports."""
+import subprocess
+import sys
+from app.cli import main
+from app.utils_importtime import BACKEND_DIR, parse_importtime, summarize
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |       docx.oxml
+import time:       300 |        420 |     docx
+import time:        50 |         50 |     app.utils
+import time:      1000 |       1470 |   app.routers.ats
+import time:        10 |       1480 | app.main
+"""
+
+
+class TestParseImporttime:
+    """Tests for reading -X importtime output."""
+
+    def test_records_and_depth(self):
+        """Each module line becomes a record; the header is skipped."""
+        records = parse_importtime(SAMPLE)
+        assert [(r.module, r.self_us, r.cumulative_us, r.depth) for r in records] == [
+            ("docx.oxml", 120, 120, 3),
+            ("docx", 300, 420, 2),
+            ("app.utils", 50, 50, 2),
+            ("app.routers.ats", 1000, 1470, 1),
+            ("app.main", 10, 1480, 0),
+        ]
+
+    def test_summary_by_package(self):
+        """Third-party modules are grouped by top-level package; app modules stay separate."""
+        rows = summarize(parse_importtime(SAMPLE))
+        assert rows[0] == {"name": "app.routers.ats", "self_us": 1000, "modules": 1}
+        assert {"name": "docx", "self_us": 420, "modules": 2} in rows
+        assert sum(row["self_us"] for row in rows) == 1480
+
+    def test_cli_report(self, capsys):
+        """The importtime subcommand prints a report for a real import."""
+        assert main(["importtime", "--module", "app.utils", "--top", "1000"]) == 0
+        output = capsys.readouterr().out
+        assert output.startswith("Import time of app.utils:")
+        assert any(line.endswith("  app.utils") for line in output.splitlines())
+
+
+class TestLazyImports:
+    """Heavy optional libraries are not imported at startup."""
+
+    def test_app_startup_skips_heavy_libraries(self):
+        """Importing the app does not load the file parsers, google-auth or the Mongo driver."""
+        heavy = ["PyPDF2", "docx", "google.auth", "motor"]
+        result = subprocess.run(
+            [sys.executable, "-c", f"import sys, app.main; print([m for m in {heavy!r} if m in sys.modules])"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+        )
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,241 @@
+"""Tests for resume file parsing in the parse pool."""
+import asyncio
+import io
+import time
+import pytest
+import PyPDF2
+from docx import Document
+from app.cache import SQLiteCache
+from app.utils_parse import (
+    ParsePool,
+    ParserBusyError,
+    ParseTimeoutError,
+    extract_docx_text,
+    extract_pdf_text,
+    iter_pdf_pages,
+    parse_pool,
+    parse_resume_file,
+    text_cache,
+)
+from tests.forking import check_in_child
+
+
+def make_docx(*paragraphs: str) -> bytes:
+    """Build a DOCX file in memory."""
+    doc = Document()
+    for paragraph in paragraphs:
+        doc.add_paragraph(paragraph)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+class TestParseResumeFile:
+    """Tests for parse_resume_file."""
+
+    @pytest.mark.asyncio
+    async def test_docx_is_parsed(self):
+        """DOCX text is extracted through the pool."""
+        content = make_docx("Jane Doe", "Led team of 5 engineers")
+        assert await parse_resume_file(content, "docx") == extract_docx_text(content)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_value_errors(self):
+        """Unsupported and corrupt files raise ValueError."""
+        with pytest.raises(ValueError):
+            await parse_resume_file(b"data", "text/plain")
+        with pytest.raises(ValueError):
+            await parse_resume_file(b"not a pdf", "pdf")
+
+
+class TestParsePool:
+    """Tests for ParsePool backpressure and timeouts."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self):
+        """Jobs beyond workers + queue depth are rejected."""
+        pool = ParsePool(workers=1, timeout=10, max_queue=0)
+        try:
+            running = asyncio.create_task(pool.run(time.sleep, 0.5))
+            await asyncio.sleep(0)
+            with pytest.raises(ParserBusyError):
+                await pool.run(time.sleep, 0)
+            await running
+            assert pool.stats()["rejected"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timeout_restarts_workers(self):
+        """A stuck job times out and the pool recovers for the next one."""
+        pool = ParsePool(workers=1, timeout=0.5, max_queue=1)
+        try:
+            with pytest.raises(ParseTimeoutError):
+                await pool.run(time.sleep, 30)
+            assert await pool.run(len, b"abc") == 3
+            assert pool.stats()["restarts"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queued_jobs_survive_restart(self):
+        """Jobs queued behind a stuck job are retried on the new workers, not cancelled."""
+        pool = ParsePool(workers=1, timeout=1, max_queue=3)
+        try:
+            stuck = asyncio.create_task(pool.run(time.sleep, 30))
+            await asyncio.sleep(0.3)
+            queued = [asyncio.create_task(pool.run(len, b"abc")) for _ in range(3)]
+            with pytest.raises(ParseTimeoutError):
+                await stuck
+            assert await asyncio.gather(*queued) == [3, 3, 3]
+            assert pool.stats()["restarts"] == 1
+        finally:
+            pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timed_out_thread_keeps_its_slot(self):
+        """Without worker processes, a timed-out thread counts against capacity until it finishes."""
+        pool = ParsePool(workers=0, timeout=0.1, max_queue=0)
+        with pytest.raises(ParseTimeoutError):
+            await pool.run(time.sleep, 0.5)
+        with pytest.raises(ParserBusyError):
+            await pool.run(len, b"abc")
+        await asyncio.sleep(0.6)
+        assert await pool.run(len, b"abc") == 3
+        assert pool.stats()["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_forked_worker_starts_its_own_processes(self):
+        """A forked server worker does not reuse the parent's parser processes."""
+        assert await parse_pool.run(len, b"abc") == 3
+        assert check_in_child(lambda: parse_pool.stats()["pending"] == 0 and parse_pool._executor is None)
+        assert parse_pool._executor is not None
+
+
+class TestParsedTextCache:
+    """Tests for the content-addressed extracted text cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeat_upload_skips_parsing(self, monkeypatch):
+        """The second parse of identical bytes is served from the cache."""
+        text_cache.clear()
+        content = make_docx("Repeat upload")
+        first = await parse_resume_file(content, "docx")
+
+        async def fail(*args):
+            raise AssertionError("file was parsed again")
+
+        monkeypatch.setattr(parse_pool, "run", fail)
+        assert await parse_resume_file(content, "docx") == first
+        assert text_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_is_applied_after_cache(self, monkeypatch):
+        """Callers with different character budgets share one cached extraction."""
+        text_cache.clear()
+        content = make_docx("Shared between ATS and interview uploads")
+        full = await parse_resume_file(content, "docx")
+
+        async def fail(*args):
+            raise AssertionError("file was parsed again")
+
+        monkeypatch.setattr(parse_pool, "run", fail)
+        assert await parse_resume_file(content, "docx", max_chars=6) == full[:6]
+        assert await parse_resume_file(content, "docx", max_chars=100_000) == full
+
+
+class TestSQLiteCache:
+    """Tests for the on-disk cache tier."""
+
+    def test_round_trip_and_size_eviction(self, tmp_path):
+        """Values persist across instances and old entries are evicted by size."""
+        path = str(tmp_path / "text.sqlite")
+        cache = SQLiteCache(path, max_bytes=10)
+        cache.set("a", "xxxx")
+        cache.set("b", "yyyy")
+        cache.get("a")
+        cache.set("c", "zzzz")
+        assert cache.get("b") is None
+        assert cache.stats()["evictions"] == 1
+        cache.close()
+
+        reopened = SQLiteCache(path, max_bytes=10)
+        assert reopened.get("a") == "xxxx"
+        assert reopened.get("c") == "zzzz"
+        reopened.close()
+
+    def test_reconnect_after_fork(self, tmp_path):
+        """A forked child uses its own connection to the same file."""
+        cache = SQLiteCache(str(tmp_path / "text.sqlite"), max_bytes=100)
+        cache.set("a", "parent")
+
+        def child() -> bool:
+            inherited = cache._conn
+            cache.reset_after_fork()
+            cache.set("b", "child")
+            return cache._conn is not inherited and cache.get("a") == "parent"
+
+        assert check_in_child(child)
+        assert cache.get("b") == "child"
+        cache.close()
+
+
+def make_pdf(*pages: str) -> bytes:
+    """Build a minimal PDF with one line of text per page."""
+    count = len(pages)
+    kids = " ".join(f"{4 + 2 * i} 0 R" for i in range(count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+class TestPdfExtraction:
+    """Tests for page-bounded PDF extraction."""
+
+    def test_pages_are_read_lazily(self):
+        """Only the pages the caller consumes are extracted."""
+        pages = iter_pdf_pages(make_pdf("First page", "Second page", "Third page"))
+        assert next(pages).strip() == "First page"
+
+    def test_page_and_character_budgets(self):
+        """Extraction stops at the page budget or the character budget."""
+        content = make_pdf("Page one text", "Page two text", "Page three text")
+        assert "Page three" in extract_pdf_text(content)
+        assert "Page three" not in extract_pdf_text(content, max_pages=2)
+        assert extract_pdf_text(content, max_chars=8) == "Page one"
+
+    def test_slow_page_is_skipped(self, monkeypatch):
+        """A page exceeding its time budget is skipped, not fatal."""
+        original = PyPDF2.PageObject.extract_text
+
+        def slow_second_page(page, *args, **kwargs):
+            text = original(page, *args, **kwargs)
+            if "two" in text:
+                time.sleep(1)
+            return text
+
+        monkeypatch.setattr(PyPDF2.PageObject, "extract_text", slow_second_page)
+        text = extract_pdf_text(make_pdf("Page one", "Page two", "Page three"), page_timeout=0.1)
+        assert "Page one" in text and "Page three" in text
+        assert "Page two" not in text
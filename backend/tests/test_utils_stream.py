@@ -0,0 +1,48 @@
+"""Tests for streaming helpers."""
+import json
+from app.utils_stream import JSONArrayStreamParser, format_sse
+
+
+class TestJSONArrayStreamParser:
+    """Tests for incremental JSON array decoding."""
+
+    def test_elements_emitted_as_they_complete(self):
+        """Each object is returned by the chunk that closes it."""
+        parser = JSONArrayStreamParser()
+        assert parser.feed('[{"question": "One", ') == []
+        assert parser.feed('"answer": "A"}, {"question"') == [{"question": "One", "answer": "A"}]
+        assert parser.feed(': "Two"}]') == [{"question": "Two"}]
+        assert parser.finished
+
+    def test_brackets_and_escapes_inside_strings(self):
+        """Braces, brackets and escaped quotes inside strings do not end an element."""
+        text = '[{"q": "Use {braces} and [lists] \\"quoted\\" \\\\"}]'
+        parser = JSONArrayStreamParser()
+        elements = []
+        for char in text:
+            elements.extend(parser.feed(char))
+        assert elements == json.loads(text)
+
+    def test_code_fence_prefix_ignored(self):
+        """Text before the array, such as a Markdown fence, is skipped."""
+        parser = JSONArrayStreamParser()
+        assert parser.feed('```json\n[{"a": 1}]\n```') == [{"a": 1}]
+
+    def test_malformed_element_skipped(self):
+        """An element that is not valid JSON does not stop later ones."""
+        parser = JSONArrayStreamParser()
+        assert parser.feed('[{"a": 1,}, {"b": 2}]') == [{"b": 2}]
+
+    def test_no_array(self):
+        """Plain text never starts the parser."""
+        parser = JSONArrayStreamParser()
+        assert parser.feed('Q: What is REST?') == []
+        assert not parser.started
+
+
+class TestFormatSSE:
+    """Tests for server-sent event encoding."""
+
+    def test_event_and_json_data(self):
+        """Events carry a name and one line of JSON."""
+        assert format_sse('done', {'ok': True}) == b'event: done\ndata: {"ok":true}\n\n'
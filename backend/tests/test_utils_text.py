@@ -0,0 +1,135 @@
+"""Tests for the single-pass ATS text analyzer."""
+import re
+import pytest
+from app.utils_text import (
+    ATS_METRIC_KINDS,
+    ATS_100_METRIC_KINDS,
+    analyze_text,
+    analyze_resume_text,
+    get_job_index,
+    job_index_cache,
+)
+from app.cache import LRUCache
+from app.schemas import Resume
+
+
+# Legacy per-pattern metric regexes the analyzer must stay equivalent to
+LEGACY_METRIC_PATTERNS = [
+    r'\d+%',
+    r'\$\d+(?:,\d{3})*(?:\.\d+)?',
+    r'\d+(?:\.\d+)?[x×]',
+    r'\d+(?:\.\d+)?\s*(?:million|billion|thousand|k|M|B)',
+    r'\d+(?:\.\d+)?\s*(?:years?|months?|weeks?|days?)',
+    r'\d+(?:\.\d+)?\s*(?:people|users|customers|clients|team|employees)',
+    r'\d+(?:\.\d+)?\s*(?:points?|units?|items?|projects?|features?)',
+    r'\d+\/\d+',
+]
+
+
+def legacy_metric_count(text: str, decimal_percentages: bool) -> int:
+    """Count metrics the way the scorers did before the analyzer existed."""
+    patterns = LEGACY_METRIC_PATTERNS + ([r'\d+(?:\.\d+)?%'] if decimal_percentages else [])
+    count = sum(len(re.findall(p, text, re.IGNORECASE)) for p in patterns)
+    return count + len(re.findall(r'\b\d{3,}\b|\b\d+\.\d+\b', text))
+
+
+SAMPLE_TEXTS = [
+    "",
+    "Increased revenue by 30% and managed $50,000 budget",
+    "Led a team of 5 engineers over 2.5 years\nReduced costs 3x",
+    "Served 1,000,000 users; shipped 12 features in 6 months (99.9% uptime)",
+    "Ratio 3/4, 10k rows, 1.5M requests, abc123%, $1,2345",
+]
+
+
+class TestAnalyzeText:
+    """Tests for analyze_text."""
+
+    @pytest.mark.parametrize("text", SAMPLE_TEXTS)
+    def test_metric_counts_match_legacy_patterns(self, text):
+        """Metric counts match the per-pattern findall implementation."""
+        stats = analyze_text(text)
+        assert stats.metric_count(ATS_METRIC_KINDS) == legacy_metric_count(text, True)
+        assert stats.metric_count(ATS_100_METRIC_KINDS) == legacy_metric_count(text, False)
+
+    def test_keywords_and_verbs(self):
+        """Keywords drop stop words and short words; verbs are counted per occurrence."""
+        stats = analyze_text("Developed and developed the API in Python3 with Docker")
+        assert stats.keywords() == {"developed", "api", "docker"}
+        assert stats.verb_count == 2
+
+    def test_lines_starting_with_verbs(self):
+        """Only lines whose first word is an action verb are counted."""
+        stats = analyze_text("Led the team\n  Built the API\n• Managed budget\nLed")
+        assert stats.verb_lines == 2
+
+    def test_flags_and_sections(self):
+        """Bullets, years and section headings are detected in the same pass."""
+        stats = analyze_text("EXPERIENCE\n- Engineer, 2021\nSkills: Python")
+        assert stats.has_bullets
+        assert stats.has_year
+        assert {"experience", "skills"} <= stats.section_hits()
+
+
+class TestAnalyzeResume:
+    """Tests for per-field resume analysis."""
+
+    def test_select_combines_fields(self):
+        """Section selections combine the stats of matching fields only."""
+        resume = Resume(
+            personal={"firstName": "Jane", "lastName": "Doe", "email": "jane@example.com"},
+            summary="Engineer",
+            experience=[
+                {"id": "1", "company": "A", "position": "Engineer", "description": "Led 5 people"},
+                {"id": "2", "company": "B", "position": "Developer", "description": "Built 3 features"},
+            ],
+        )
+        analysis = analyze_resume_text(resume)
+        descriptions = analysis.select("experience", "description")
+        assert descriptions.verb_count == 2
+        assert descriptions.metric_count() == 2
+        assert "developer" not in descriptions.words
+        assert "jane" in analysis.all().words
+
+
+class TestJobDescriptionIndex:
+    """Tests for the cached job-description keyword index."""
+
+    def test_index_is_cached_by_content(self):
+        """Identical job descriptions reuse the same index."""
+        job_index_cache.clear()
+        first = get_job_index("Python backend engineer with Docker and strong communication")
+        second = get_job_index("Python backend engineer with Docker and strong communication")
+        assert first is second
+        assert job_index_cache.stats()["hits"] == 1
+        assert job_index_cache.stats()["misses"] == 1
+
+    def test_index_categories(self):
+        """Keywords are split into technical, soft-skill and tool terms."""
+        index = get_job_index("Python backend engineer with Docker and strong communication")
+        assert {"python", "backend", "docker"} <= index.technical
+        assert "docker" in index.tools
+        assert "communication" in index.soft
+        assert index.keywords_for(min_length=7) == {"backend", "engineer", "communication"}
+
+
+class TestLRUCache:
+    """Tests for the LRU cache used by the analyzers."""
+
+    def test_evicts_least_recently_used(self):
+        """Entries past the bound are evicted oldest-first."""
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "a" in cache and "c" in cache and "b" not in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_weight_bound(self):
+        """Total weight stays within max_weight."""
+        cache = LRUCache(max_entries=10, max_weight=10, weigh=len)
+        cache.set("a", "x" * 6)
+        cache.set("b", "x" * 6)
+        cache.set("c", "x" * 20)
+        assert len(cache) == 1 and "b" in cache